@@ -1,5 +1,7 @@
 from crewai import Agent, Task
 from common import openrouter_llm # Import the LLM from common
+from src.utils.direct_agent import task_prompt # Crew's persona + task framing, without the Crew
+from src.utils.email_compact import EXAMPLES_RULES # How to read the compacted recent-campaign e-mails
 
 draft_writer_agent = Agent(
     role='Specialized writing assistant focused exclusively on creating formal, warm, and highly personalized call-for-papers email drafts for academic journals.',
@@ -10,7 +12,7 @@ draft_writer_agent = Agent(
     Your expertise lies in understanding the academic mindset, creating urgency without being pushy, and highlighting the prestige and benefits of publishing in quality journals.""",
     verbose=False, # Set to False to hide system instructions in output
     allow_delegation=False,
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("writer"),
     # tools=[FileTools.read_file] # Re-enable FileTools
 )
 
@@ -66,3 +68,45 @@ draft_task = Task(
     expected_output="A well-formatted, professional call-for-papers email draft for an academic journal, adhering to all specified content, tone, and formatting rules, including 10 unique subject lines at the beginning, clear subheadings, absolutely no conversational or explanatory text, and no HTML/XML-like characters.", # Updated expected_output
     output_file='cfp_draft.txt'
 )
+
+# Static halves of the writer / creative-rewrite prompts. They open every task
+# description, byte-identical from draft to draft, so the provider can serve them
+# from its prompt-prefix cache; the journal fields, recent-campaign JSON and the
+# draft itself follow as the variable suffix.
+WRITER_RULES = (
+    EXAMPLES_RULES + "\n"
+    "\n\n"
+    "### Layout requirement – side-headings - HARD RULE.\n"
+    "Structure the email with clear **side-headings** so the reader can scan quickly. "
+    "Use bold formatting for each heading and keep each section concise.\n"
+    "\n\n### Additional hard rules\n"
+    "- Use bold **creative side-headings**.\n"
+    "- Final draft must exceed **320 words**.\n"
+    "- Never output the placeholder text "
+    "\"[mention recipient's specific research area if known, otherwise keep general]\".\n"
+    "- Mention the full journal name only once in the intro and once in the signature.\n"
+    "- If waiver_available is No, do NOT add a sentence about fee waivers.\n"
+)
+
+REWRITE_RULES = (
+    "Rewrite the email draft given below to be more stylistically compelling, "
+    "maintaining the original tone and data, with the creative enhancement given below.\n\n"
+    "Adhere strictly to the following rules:\n"
+    "- Signature at the end of the draft must always follow this exact structure, ensuring each "
+    "line is separated by a double newline (`\\n\\n`) for proper formatting:\n"
+    "    Warm Regards,\n\n"
+    "    <sender name>\n\n"
+    "    Editorial Office\n\n"
+    "    <journal name>\n\n"
+    "    616 Corporate Way, Suite 2-6158\n\n"
+    "    Valley Cottage, NY 10989\n\n"
+    "    United States\n\n"
+    "    Email: <sender email>\n\n"
+    "Ensure all other paragraphs in the draft are also separated by double newlines (`\\n\\n`) "
+    "for clear readability.\n\n"
+)
+
+def writer_prompt(description: str, expected_output: str) -> str:
+    # Single prompt for token streaming / variants: the writer persona + the task,
+    # exactly as run_task() sends it
+    return task_prompt(draft_writer_agent, description, expected_output)
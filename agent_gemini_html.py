@@ -46,7 +46,7 @@ gemini_html_agent = Agent(
     role="HTML Formatter",
     goal="Return pure, production-ready HTML e-mail bodies.",
     backstory=HTML_SYSTEM_PROMPT,
-    llm=openrouter_llm,              # Gemini 2.5 flash via OpenRouter
+    llm=openrouter_llm.for_step("html"),              # Gemini 2.5 flash via OpenRouter
     verbose=False,
     allow_delegation=False,
 )
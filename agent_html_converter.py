@@ -11,7 +11,7 @@ html_converter_agent = Agent(
     You ensure the output HTML is ready for web display.""",
     verbose=False,
     allow_delegation=False,
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("html"),
     # If your framework supports, add:
     # generation_config={"stop_sequences": ["Explanation:", "Thought:", "Plan:"], "temperature": 0.0}
 )
@@ -5,7 +5,7 @@ qc_analysis_agent = Agent(
     role="Draft Compliance Analyst",
     goal="Return a pass/fail checklist for each rule—no extra commentary.",
     backstory="You enforce fixed rules but never reveal ‘Thoughts’.",
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("qc"),
     verbose=False,          # ← suppress internal “thoughts”
 )
 
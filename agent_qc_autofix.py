@@ -8,7 +8,7 @@ qc_autofix_agent = Agent(
         "You correct compliance issues in CFP drafts without rewriting from scratch. "
         "The footer block must stay exactly as provided."
     ),
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("autofix"),
     verbose=False,   # suppress chain-of-thought
 )
 
@@ -8,7 +8,7 @@ spam_removal_agent = Agent(
     backstory="""You are an expert in text sanitization and lexical substitution. Your primary function is to enhance written drafts by eliminating spam words through precise synonym replacement while maintaining absolute fidelity to original formatting and identifiers.""",
     verbose=False,
     allow_delegation=False,
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("spam"),
     max_iter=2,  # Preserved from original
     generation_config={  # New critical addition
         "stop_sequences": ["\nThought:", "\nPlan:", "\nReasoning:"],
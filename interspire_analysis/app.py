@@ -5,12 +5,18 @@ from dotenv import load_dotenv
 import pandas as pd
 from bs4 import BeautifulSoup
 import re
+import uuid
 import json # Added this import
-from crewai import Agent, Task, Crew, Process
+from crewai import Agent, Task
 import litellm
 from sklearn.linear_model import LogisticRegression
 import numpy as np
 from common import openrouter_llm # Import the custom LLM
+analysis_llm = openrouter_llm.for_step("analysis") # Retries / fallbacks under the analysis route policy
+from src.utils import spam_lexicon # Shared spam lexicon (subject keywords)
+from src.utils.llm_telemetry import get_telemetry, set_run_id # Per-call LLM tokens / cost / cache hits
+from src.utils.direct_agent import run_task # One agent + task straight through analysis_llm (no Crew)
+from src.utils.email_compact import UNSUBSCRIBE_SUFFIX, WEBVERSION_PREFIX # Interspire template boilerplate
 # Turn on per-call token / cost accounting
 os.environ["LITELLM_COLLECT_USAGE"] = "true"
 from pprint import pprint # Added for nicer debug print
@@ -94,47 +100,13 @@ def save_token_usage(conn, analysis_id, campaign_id,
                         in_tok, out_tok, cache_hits, charge))
     conn.commit()
 
-def _collect_usage(crew: Crew) -> dict:
-    """
-    Aggregate token / cost data from all tasks in a CrewAI run.
-
-    Returns a dict:
-      {'prompt_tokens': int,
-       'completion_tokens': int,
-       'cached': int,
-       'cost': float}
-    Works with recent CrewAI + litellm/openrouter_llm.
-    """
-    totals = {"prompt_tokens": 0,
-              "completion_tokens": 0,
-              "cached": 0,
-              "cost": 0.0}
-    for t in crew.tasks:
-        # 1. CrewAI ≥0.28: task.usage
-        usage = getattr(t, "usage", None) or getattr(t, "result_usage", None)
-
-        # 2. litellm fallback – usage inside last_call.response
-        if not usage and hasattr(t, "last_call"):
-            usage = getattr(t.last_call, "usage", None) or \
-                    getattr(t.last_call, "response", {}).get("usage")
-
-        if not usage:
-            continue
-
-        totals["prompt_tokens"]     += usage.get("prompt_tokens", 0)
-        totals["completion_tokens"] += usage.get("completion_tokens", 0)
-        totals["cached"]            += int(usage.get("cached", 0))
-        totals["cost"]              += usage.get("cost", 0)
-
-    return totals
-
 # Function to clean email content
 def clean_email_content(email_html):
     if not isinstance(email_html, str):
         return ""
     # Remove specific prefixes and suffixes
-    prefix = "Your email client cannot read this email. To view it online, please go here: %%webversion%% Dear Dr. %%First Name%%,"
-    suffix = "To stop receiving these emails:%%unsubscribelink%%"
+    prefix = WEBVERSION_PREFIX
+    suffix = UNSUBSCRIBE_SUFFIX
 
     cleaned_html = email_html.replace(prefix, "", 1) # Replace only the first occurrence
     cleaned_html = cleaned_html.replace(suffix, "", 1) # Replace only the first occurrence
@@ -257,10 +229,10 @@ def calculate_content_score(intro_word_count, cta_count, bullets_position):
     scaled_score = (total_score / 55) * 100
     return round(scaled_score)
 
-# Define common spam keywords (can be expanded)
-SPAM_KEYWORDS = [
-    "100%","100 more please","100% effective","100% off","22mag","40oz","50% off","A better you","abduct","aboard","abuse","Acceptance","Access","Access attachment","Access file","Access for free","Access here","Access now","Access right away","accommodation","Accordingly","Accounts","accumulator","Achieve goals","acid","acquisition","Act","Act fast","Act immediately","Act now","Act now!","Act right now","Action","Action required","Activate link","Acts","Ad","addict","Additional income","Addresses","Addresses on CD","adult","Advanced health","Advanced solution","adventure","aerobic","Affordable","Affordable deal","Age gracefully","Age-defying","agency","aintree","airfare","airhead","airline","airplane","airport","ak47","album","alcohol","ale","algorithm","alkaloid","All","All natural","All natural/new","All new","All-natural","All-new","allergies","allergy","allodynia","Allowance","allowed","alter","Amazed","Amazing","Amazing benefits","Amazing deal","Amazing health offer","Amazing improvement","Amazing offer","Amazing savings","Amazing stuff","ammo","amphetamine","amuse","anaesthesia","anal","analgesia","analgesic","anarchy","anesthesia","angeldust","anonymous","ante","Antioxidant","antique","antiviral","antivirus","anul","anus","anxiety","apartment","applicant","Apply here","Apply now","Apply now!","Apply Online","appointment","apprenticeship","appz","aquarium","Aquarius","archery","archive","archivecrack","arena","Aries","armed","aroused","arrival","arse","arseface","arsehole","arthritis","arthrodesis","arthroplasty","arthroscopy","artillery","Aryan","As","As seen on","As seen on Oprah","ass","asshole","assmaster","assreamer","asswipe","asthma","Astounding","astrology","astronomy","At no cost","athlete","athletics","Attached document","Attachment","attack","Attention","ATV","Auto email removal","Avoid","Avoid bankruptcy","Avoiding","Avoids","Award","Awarding","Awards","b1g","babe","babes","Bacardi","baccarat","backdoor","backpack","baggage","ballet","band","barbecue","barbeque","Barbie","barbiturate","barf","Bargain","baseball","basketball","bastard","battery","BBQ","bdsm","Be amazed","Be healthy","Be slimmer","Be surprised","Be your own boss","beach","beacon","beaner","beastiality","beat","Become a member","beer","Before it's too late","Being a member","Believe me","Beneficial","Beneficial offer","Beneficiary","Benefit","Benefits","Benefitted","Benefitting","Best","Best bargain","Best choice","Best deal","Best deal in town","Best health","Best health advice","Best health deal","Best health discovery","Best health offer","Best health practices","Best health results","Best health solution","Best health strategies","Best health tips","Best mortgage rates","Best offer","Best offer ever","Best price","Best prices","Best quality","Best rates","Best results","Best solution","Best value","Best-kept health secret","Best-kept secret","Best-selling","bestiality","bet","Better health","Better health solutions","Better health today","Better than","Better than ever","betting","Beverage","bicycle","Big bucks","Big savings","Biggest savings","bigot","bike","Billion","bingo","bitch","bitchslap","blackbox","blackjack","blacks","blade","blockbuster","blonde","blood","bloody","blow","blowout","blunt","Body","Body fat","Body transformation","bomb","bondage","boner","bong","bonghit","Bonus","Bonus gift","boobs","booked","bookies","bookmaker","Boost","Boost health fast","Boost metabolism","Boost your","Boost your immunity","Boost your life","booty","booze","bosom","Boss","Boundaries","boundary","bourbon","boutique","bowl","bowling","boxing","Brand new pager","brawl","Breakthrough","breakthroughs","Breathtaking","brewsky","Broadway","brothel","brotherhood","browse","bsdm","Budweiser","bug","bugger","build","Build muscle","Building","builds","bukkake","Bulk","Bulk purchase","bullshit","bureau","Burn calories","Burn fat","bust","busty","but not limited to","butt","butts","Buy","Buy direct","Buy now","Buy today","Buying judgements","Buying judgments","buyout","buzzed","bypass","cabaret","cabin","Cable converter","calcar","Call","Call free","Call free/now","Call me","Call now","Call now!","Call toll-free","Calling creditors","Calls","camp","campground","camping","cams","Can we have a minute of your time?","Can you help us?","Can't live without","Cancel","Cancel at any time","Cancel now","cancellation","Cancellation required","cancer","candidate","cannabis","Cannot be combined","Cannot be combined with any other offer","canoe","Capricorn","captain","caravan","Card accepted","Cards accepted","careerbuilder","careercity","careerweb","Cash","Cash bonus","Cash Cash Cash","Cash out","Cash-out","Cashback","catch","causalgia","cavity","celeb","celebration","Certified","Certified experts","Certifies","Certify","Certifying","chalet","challenge","challenged","challenges","challenging","Chance","Chances","chapter","charter","ChatGPT","ChatGPT said:","Cheap","Cheap meds","Check","Check or money order","checkout","chick","chicks","chinaman","chink","chiva","choke","cholesterol","chronic","Cialis","cinema","circulatory","Claim","Claim now","Claim your discount","Claim your discount NOW!","Claim your prize","Claims","Claims to be legal","classic","classical","Clearance","cleavage","Click","Click below","Click here","Click me to download","Click now","Click this link","Click to get","Click to open","Click to remove","Click to view","Clinic","Clinical trial","clit","clits","Closing soon","clown","club","coach","coast","cocaine","cock","cocks","cocksucker","code","codeine","codez","coding","collaborating","collaboration","Collect","Collect child support","collection","colt","comedy","comminuted","Compare","Compare now","Compare online","Compare rates","Compete for your business","competition","complimentary","concert","condom","Confidential","Confidential deal","Confidential proposal","Confidentiality","Confidentiality on all orders","Confidentially on all orders","Congratulations","console","consolidate","Consolidate debt","Consolidate debt and credit","Consolidate your debt","constipation","Contact us immediately","Content marketing","Coors","copayment","Copy accurately","Copy DVDs","cornerstone","cornerstones","corona","Cost","Costs","cottaging","Countdown","Coupon","COVID","CPM","crack","crack","cracker","crackz","craft","craps","crash","creampie","Credit","Credit bureaus","Credit card","Credit card offers","Credit or Debit","crotch","cruise","cum","cunnilingus","cunt","cunts","Cure","Cures","currency","customs","Cutting-edge","cyberattack","cybercrime","cybersecurity","cycle","dagger","dago","dance","darkie","darky","darts","DCI","dea1","dea1s","dea1z","Deadline","Deal","Deal breaker","Deal ending soon","Dear [email address]","Dear [email/friend/somebody]","Dear [first name]","Dear [Name]","Dear beneficiary","Dear friend","Dear Sir/Madam","Dear valued customer","Debt","debug","decode","decrypt","deductible","defeat","defense","dego","denervation","denied","dental","depression","descrambler","detect","Detox","devil","diabetic","diagnosis","Diagnostic","Diagnostics","diarrhea","dick","dickhead","dicks","Diet","Diet pill","Dig up dirt on friends","digestive","digital","Digital marketing","dike","dildo","dimebag","Direct email","Direct marketing","disable","disco","discotheque","Discount","Discount offer","Discover","Discover ","discovered","discoveries","discovering","Discovers","Discovery","discus","disorder","DJ","Do it now","Do it today","dock","doctor","Doctor-approved","Doctor-recommended","Doctor's advice","Doctor’s secret","Document","doggystyle","dogmatist","Dollars","domination","Don’t delay","Don't delete","Don't hesitate","Don’t hesitate!","Don't Miss","Don’t miss","Don’t miss out","Don’t miss your chance","Don’t wait","Don't waste time","dong","dope","Dormant","Double your","Double your cash","Double your income","Double your leads","Double your wealth","downers","downline","Download attachment","Download now","Downloadable content","downloadz","Drastically reduced","Dreamcast","Drug","Drugs","drunk","dss","dssware","dumb","dumbass","dyke","dynamite","dysaesthesia","dysfunction","Earn","Easy health","Easy money","Easy solution","Easy steps","ecstacy","ecstasy","education","Effective","Effective treatment","eightball","Eligible","Eliminate","Email extractor","Email harvest","Email marketing","embark","Empower","Empowered","Empowering","Empowers","emulator","enable","encode","encrypt","End pain","endocrine","Ends tonight","Energize","Enhance","Enhance performance","Enhance your life","Enhancement","enlargo","enrollee","enthusiast","eob","epidural","equestrian","Erase","Erase wrinkles","erectile","erection","erotic","erotik","euphoria","euphoric","Evite","examination","excite","excites","exciting","Exciting opportunity","Exclusive","Exclusive access","Exclusive benefit","Exclusive benefits","Exclusive bonus","Exclusive deal","Exclusive discounts","Exclusive health access","Exclusive health discovery","Exclusive health guide","Exclusive health insights","Exclusive health offer","Exclusive health report","Exclusive health secrets","Exclusive health tips","Exclusive info","Exclusive insight","Exclusive insights","Exclusive invitation","Exclusive offer","Exclusive opportunity","Exclusive promotion","Exclusive rate","Exclusive rewards","Exclusive sale","Exclusive savings","Exclusive solution","Exclusive trial","excrete","excretion","excursion","exhibition","Expedia","Expert advice","Expert recommendation","Expert-approved","Expire","Expired","Expires","Expires today","Expiring","Expiring soon","explode","Explode your business","Explore","Explored","Explores","Exploring","explosion","exterminate","Extra","Extra cash","Extra income","Extra savings","Extract email","Extraordinary","extremist","F r e e","facesit","fag","faggot","famous","fanfics","fans","fantasies","Fantastic","Fantastic deal","Fantastic offer","fantasy","FAST","Fast acting","Fast acting cure","Fast acting remedy","Fast acting solution","Fast and easy","Fast and natural","Fast approval","Fast cash","Fast health boost","Fast health tips","Fast relief","Fast results","Fast results guaranteed","Fast results now","Fast solution","Fast viagra delivery","Fat burner","Fat burning","Fat loss","Fat loss solution","Fat melting","Feel","Feel amazing","Feel amazing fast","Feel amazing instantly","Feel amazing now","Feel better","Feel better fast","Feel better immediately","Feel better now","Feel better today","Feel confident","Feel confident now","Feel energized","Feel energized instantly","Feel energized now","Feel fantastic","Feel fantastic now","Feel fantastic today","Feel great","Feel great instantly","Feel great now","Feel great today","Feel incredible","Feel more confident","Feel refreshed","Feel refreshed instantly","Feel rejuvenated","Feel renewed","Feel revitalized","Feel stronger","Feel the difference","Feel vibrant","Feel younger","Feel younger instantly","Feel younger now","Feel younger today","Feel your best","Feel your best now","Feel youthful","Feel youthful now","Feeling","Feels","felch","felching","fellatio","Felt","femdom","ferret","ferry","festival","fetische","fetish","fi2ee","Field","Fields","File attached","filez","film","filth","Final","Final call","Final hours","Final notice","Finance","Financial","Financial advice","Financial freedom","Financial independence","Financially independent","Find out how","firearm","firewall","fishing","fisting","Fitness","Fix","Flash sale","flasher","flask","flight","flightsim","flood","fluffer","football","For free","For instant access","For just $","For just $ (amount)","For just $(insert whatever amount)","For just","For just X$","For new customers only","For only","For only XXX amount","For you","Foreclosure","foreplay","Form","fornicate","Free","Free access","Free access/money/gift","Free bonus","Free cell phone","Free consultation","Free download","Free DVD","Free evaluation","Free gift","Free grant money","Free health guide","Free hosting","Free info","Free membership","Free sample","Free shipping","Free shipping offer","Free support","Free Trial","Free!","freebase","freepic","Friend","Friendly reminder","ftpz","fucked","fudgepacker","fukka","Full refund","fury","g4y","Gain","Gain an edge","Gain benefits","Gain confidence","Gain energy","Gain health","Gain muscle","Gain muscle fast","gallery","gamble","gambling","game","GameCube","gaming","ganga","gangbang","gangbangs","ganja","garden","gassing","gay","gayboy","gaylord","Gemini","Genius","genocide","Get","Get access now","Get better fast","Get better results","Get fit","Get fit fast","Get fit quickly","Get healthy","Get healthy fast","Get healthy quick","Get in shape","Get in shape fast","Get in shape instantly","Get in shape now","Get instant access","Get it away","Get it now","Get lean","Get Money","Get more","Get now","Get out of debt","Get out of debt NOW","Get paid","Get results","Get results now","get rich quick","Get rid of","Get ripped","Get slim fast","Get started","get started now","Get strong","Get strong fast","Get strong instantly","Get stronger","Get thin","Get well fast","Get your","Get your money","Get your results","Gift card","Gift certificate","Gift included","gimp","gin","Give it away","Giveaway","Giving away","Giving it away","gizz","gizzum","glider","Glock","goal","gobbler","Gold","golf","gollywog","Good day","Good news","goodwood","gook","gourmet","Grab","gram","Great","Great deal","Great offer","Greetings","Greetings of the day","grenade","gringo","Groundbreaking","growth hormone","Guarantee","Guaranteed","Guaranteed delivery","Guaranteed deposit","Guaranteed income","Guaranteed payment","Guaranteed results","Guaranteed safe","Guaranteed satisfaction","guest","guide","gymnasium","gymnastics","gyppo","h0t","hack","hacker","hackersoftware","hackertool","hackerz","hackology","hackz","hallucinogen","hammered","hammerskin","handicap","hangover","hardcore","hash","hashish","Hassle-free","hate","Have you been turned down?","headhunter","Healing","Health","Health advantage","Health and wellness","Health benefits","Health benefits unlocked","Health boost","Health breakthrough","Health breakthroughs","Health deal","Health discovery","Health enhancement","Health enhancer","Health essentials","Health expert","Health first","Health guarantee","Health hack","Health insider","Health made easy","Health makeover","Health optimizer","Health perks","Health power","Health remedy","Health revolution","Health savings","Health secret","Health secrets revealed","Health shortcut","Health success","Health tips","Health transformation","Health trend","Health upgrade","Healthcare","Healthier","Healthy and happy","heartburn","Hello (with no name included)","Hello!","hemp","hentai","Herbal","Here","hermaphrodite","heroin","heroine","hgh","Hi there","Hidden","Hidden assets","Hidden charges","Hidden costs","Hidden fees","High score","highscore","hike","HIPAA","hire","Hitler","hiv","HMO","hoax","hoaxz","hobby","hockey","hoe","holiday","holocaust","Home","Home based","Home Based business","Home employment","Home mortgage","Home-based","Home-based business","homo","horny","horoscope","horserace","Hot deal","Hot offer","hotel","hotjob","hottest","Huge discount","Human","Human growth hormone","humidor","humor","humour","hump","hurdles","Hurry","Hurry up","Hurry, while supplies last","hustler","hydroponic","hymie","hyperaesthesia","hyperalgesia","hyperpathia","hypnotic","hypoaesthesia","icewarez","If only it were that easy","illegal","Imagine","Immediate","Immediate access","Immediate action","Immediate benefits","Immediate delivery","Immediate health boost","Immediate health solution","Immediate health upgrade","Immediate improvement","Immediate relief","Immediate results","Immediate results guaranteed","Immediate savings","Immediately","immunization","Important information","Important information regarding","Important notice","Important notification","Improve","Improve fast","Improve health","Improved","Improves","Improving","In accordance with laws","Income","Income from home","Increase","Increase energy","Increase revenue","Increase sales","Increase sales/traffic","Increase stamina","Increase traffic","Increase your chances","Increase your sales","Increased","Increases","Increasing","Incredible","Incredible deal","indoor","infantilism","inflammation","Info you requested","Information you requested","inhalant","Initial investment","inject","injury","innings","innovating","Innovation","innovators","insecure","Insider","Insider tips","Install now","Instant","Instant access","Instant cure","Instant earnings","Instant health benefit","Instant health benefits","Instant health results","Instant health secret","Instant health tips","Instant improvement","Instant income","Instant offers","Instant relief","Instant results","Instant results guaranteed","Instant success","Instant weight loss","Instant wellness","Instantly better","Instantly feel better","Instantly feel great","Instantly healthier","Insurance","Insurance Lose weight","intercourse","Internet market","Internet marketing","interview","intricacies","intricate","Investment","Investment advice","Investment decision","Invoice","iPod","Ireie","island","It's effective","It’s effective","iTunes","jackoff","JACKPOT","javelin","Jaw-dropping","jazz","jerk","jerkoff","Jew","jewelry","Jews","jizz","jizzum","job","Job alert","jobdirect","jobseeker","jobsonline","jobtrak","jockey","Join","Join billions","Join for free","Join millions","Join millions of Americans","Join now","Join thousands","Join Us","joining","joke","journey","Journey ","joy","joypad","joystick","judo","jugs","juicy","jukebox","Junk","karaoke","karate","kayak","keg","ketamine","kidnap","kill","kinky","KKK","klan","kluge","knights","knob","kraut","labia","labor","lacrosse","lager","Lambo","land","landmark","landscape","landscapes","lardass","Laser printer","Last chance","Last Day","Last minute deal","latex","laugh","leader","Leading","league","Leave","Legal","Legal notice","leisure","lesbian","lesbo","lez","liability","Libra","lick","Life","Life insurance","Life-changing","Life-changing results","Life-enhancing","Life-improving","Lifetime","Lifetime access","Lifetime deal","Limited","Limited amount","Limited availability","Limited number","Limited offer","Limited opportunity","Limited supply","limited time","Limited time deal","limited time offer","Limited time only","Limited-time offer","Limited-time only","Limited-time savings","Link","linkz","liplocked","lips","liquor","Live healthier","Loan","Loan approved","Loans","lock","lodging","Long distance phone number","Long distance phone offer","Look amazing","Look and feel better","Look and feel great","Look better now","Look better today","Look fantastic","Look fantastic now","Look great fast","Look younger","Look younger instantly","Look younger now","Lose","Lose belly fat","Lose inches","Lose inches fast","Lose pounds","Lose weight","Lose weight fast","Lose weight instantly","Lose weight spam","Lottery","Low cost","Low costs","Lower interest rate","Lower interest rates","Lower monthly payment","Lower rates","Lower your mortgage rate","lowest","Lowest insurance rates","Lowest interest rate","Lowest price","Lowest price ever","Lowest rate","Lowest rates","LSD","lubricant","lubrication","luck","luggage","lust","Luxury","Luxury car","mace","machete","Magic","Magic pill","magnum","Mail in order form","Main in order form","Maintained","Majestic","Make $","Make money","make money fast","mall","manhood","marihuana","marijuana","Mark this as not junk","Marketing","Marketing solution","Marketing solutions","martini","Mass email","massacre","Mastercard","masterpiece","masturbation","match","Maximize","Medicaid","Medical","Medical breakthrough","Medicare","Medication","Medicine","Medicines","Medigap","Medium","meds","Mega sale","Melt away","Member","Member stuff","Members","Membership","memorabilia","merger","mescaline","Message contains","Message contains disclaimer","Message from","metatarsalgia","meth","methamphetamine","milestone","milestones","militia","Million","Million dollars","Millionaire","Millions","Mind-blowing","minge","Miracle","Miracle pill","Miracles","Miraculous","misuse","MLM","modifier","modify","Moment","Moments","Money","Money 💰","Money back","Money making","Money-back","Money-making","Money-saving","Money-saving tips","Month trial offer","Monthly payment","moped","More Internet Traffic","moron","morphine","Mortgage","Mortgage rates","motel","motherfukka","motorcross","motorsport","movie","mp3","mp5","mpeg","mpeg2vcr","mrn","Multi level marketing","Multi-level marketing","multimedia","multiplayer","murder","Muscle growth","museum","music","n64","NAAWP","naked","Name","Name brand","narcotic","narrates","narrating","narration","narrative","Nascar","nasty","nationjob","Natural","Natural boost","Natural formula","Natural relief","Natural remedy","Natural solution","naughty","nazi","NBA","Near you","necklacing","necrofil","needlework","negro","nekked","netwarez","neuritis","neuropathic","Never","Never again","Never before","New","New customers only","New domain extensions","NFL","NHL","nicotine","Nigerian","nigga","nigger","nightclub","Nintendo","nip","nips","niteclub","nitrous","No age restrictions","No catch","No claim forms","No commitment","No contract","No cost","No credit check","No disappointment","No experience","No extra cost","No fees","No gimmick","No hidden","No hidden charges","No hidden costs","No hidden fees","No hidden сosts","No interest","No interests","No inventory","No investment","No investment required","No medical exams","No middleman","No more","No obligation","No obligation trial","No obligations","No payment required","No prescription needed","No questions asked","No risk","No selling","No side effects","No strings attached","No waiting","No waiting required","No-obligation","No-risk guarantee","No-risk trial","nobwit","Nominated bank account","nookie","nooky","Not intended","Not junk","not just ..... but a ....","not only ... but also...","Not scam","Not shared","Not spam","Notspam","Now","Now only","Now or never","nudity","nuke","Number 1","Number one","nurse","Nutrition","Obligation","occupation","odds","oem","off","Off everything","Off shore","offense","Offer","Offer expires","Offer expires in X days","Offer extended","Offered","Offering","Offers","Offshore","Olympic","On a budget","On sale","Once in a lifetime","Once in a lifetime deal","Once in a lifetime opportunity","Once in lifetime","Once-in-a-lifetime","One hundred percent","One hundred percent free","One hundred percent guaranteed","One time","One time mailing","One-time","Online biz opportunity","Online degree","Online income","Online job","Online marketing","Online pharmacy","Only","Only $","Only a few left","Only for today","opel","Open","Open attachment","Open file","Open this","Open this email!","Opened","openhack","Opening","Opens","opera","opiate","opium","opponent","Opportunities","Opportunity","Opt in","Opt-in","opted","optedin","optedout","optin","optout","oral","Orbitz","orchestra","Order","Order here","Order immediately","Order now","Order shipped by","Order status","Order today","Order yours today","Ordered","Ordering","Orders","Orders shipped by","Orders shipped by shopper","Organic","orgy","ORIF","osteotomy","ounce","outdoors","Outstanding","Outstanding value","Outstanding values","Outstands","overdose","overseas","p1cs","paedophile","paganism","pain","painting","pantomime","panty","parasthesia","party","passport","Password","Passwords","patch","pave","paves","paving","Pay your bills","payout","PCP","pecker","peckerwood","pee","peenis","peepshow","penetrate","penetration","penis","Penis enlargement","Pennies a day","Penny stocks","Per day/per week/per year","Per month","Perfect","Perfect body","Performance","Permanent results","Personal","pervert","peyote","Pharmaceuticals","Pharmacy","Phenomenal","Phone","photograph","photography","phreak","phreaking","phuck","phuk","physical","physician","picpost","pictures","pill","Pills","pimp","pimps","pink","pint","pioneer","pioneering","pipe","Pisces","piss","pissed","pisser","pissing","pitcher","pivotal","plane","Platform","Platforms","playboy","player","playgirl","playmate","Playstation","Please","Please open","Please read","pleasure","poem","poker","polevault","polo","poof","popper","porn","porno","pot","Potent","Potential earnings","powerline","PPO","practitioner","Pre-approved","pregnancy","Prescription","Presently","Prevent","Prevent aging","Prevented","Preventing","Prevents","Preview file","Price","Price protection","Priced","Prices","Pricing","prick","Print form signature","Print from signature","Print out and fax","Priority access","Priority mail","privacy","Private","Privately owned funds","Privileged","Prize","Prizes","pro","Problem","Problem with shipping","Problem with your order","Produced and sent out","Profit","Profits","progz","Promise","Promise you","Promised","Promises","Promising","protect","Protection","Proven","Proven health tips","Proven results","Proven system","PS2","PSX","psychedelic","pub","pubes","pubic","publisher","puke","punk","Purchase","Purchase now","Pure profit","Pure Profits","Push","pushes","Pushing","pussy","puzzle","pyramid","qualifications","quarterback","queer","Quick","Quick action","Quick and easy","Quick and easy cure","Quick and easy health","Quick and easy results","Quick and easy tips","Quick and effective","Quick and safe","Quick and safe remedy","Quick and safe results","Quick and simple","Quick boost","Quick cure","Quick energy boost","Quick fix","Quick fix solution","Quick healing","Quick health boost","Quick health improvement","Quick health relief","Quick health tips","Quick health transformation","Quick improvement","Quick recovery","Quick recovery tips","Quick relief","Quick remedy","Quick results","Quick results guaranteed","Quick success","Quick transformation","Quick turnaround","Quick upgrade","Quote","Quotes","race","racist","racket","radiation","radiculogram","radio","raft","raghead","rahowa","rail","rally","rammed","ransom","rap","rape","Rapid results","rapids","Rare","Rare opportunity","Rate","Rated","Rates","Rating","Real thing","realaudio","realjukebox","realplayer","Rebate","record","Recover your debt","Recover your debt instantly","recreation","Reduce","Reduce debt","Reduce fat","Reduce stress","Reduced","Reduces","Reducing","reefer","refi","Refinance","Refinance home","Refinanced home","Refund","Regarding","reggae","Rejuvenate","Remarkable","Remarkably","Remarking","Remedy","remote","Removal","Removal instructions","Remove","Remove wrinkles","Removes","Removes wrinkles","Renew","Renew your body","Replica watches","Request","Request now","Request today","Requests","Requires initial investment","Requires investment","reservation","reserve","Reserves the right","resin","resort","respiratory","restaurant","Restore","Restore health","Restores","restricted","Restricted information","Result","Results","Results guaranteed","resume","Reverse","Reverses","Reverses aging","Revitalize","Revolutionary","Revolutionary breakthrough","Revolutionary health","Revolutionize","Revolutionized","Revolutionizes","Revolutionizing","rhyme","riddle","rifle","riot","Risk free","Risk-free","Risk-free trial","Risked","Risking","Risks","rislas","roach","rock","rohypol","roleplay","Rolex","romantic","room","roulette","Round the world","roundtrip","rowing","rugby","rum","runner","runway","Rush","Rushed","Rushes","Rushing","S 1618","Safe","Safe and effective","Safe and natural","Safe and natural remedy","Safe and secure","Safe formula","safeguard","Safeguard notice","Sagittarius","sail","sailing","sake","Sale","Sales","Sample","samurai","sangria","Satisfaction","Satisfaction guaranteed","Save","Save $","Save €, Save €","Save big","Save big money","Save big month","Save big on health","Save big today","Save instantly","Save money","Save money"
-]
+# Subject-line spam keywords come from the shared prebuilt lexicon
+# (src/utils/lexicon/subject_keywords.txt → spam_lexicon "subject" list).
+def _subject_spam_keywords() -> tuple:
+    return spam_lexicon.words("subject")
 
 # Placeholder Logistic Regression Model for Bounce Risk
 # In a real application, this model would be trained on historical data.
@@ -301,7 +273,7 @@ confidence_agent = Agent(
     role='Email Content and Subject Line Analyst',
     goal='Provide a comprehensive confidence score and justification for email effectiveness',
     backstory='An expert in email marketing analytics, skilled in evaluating subject lines and content for optimal engagement and deliverability. You consider factors like subject length, capitalization, spam words, intro hook, bullet point usage, and CTA presence.',
-    llm=openrouter_llm,
+    llm=analysis_llm,
     verbose=True,
     allow_delegation=False
 )
@@ -310,7 +282,7 @@ bounce_agent = Agent(
     role='Email Deliverability and Risk Assessor',
     goal='Assess the potential bounce risk of an email based on its characteristics',
     backstory='A specialist in email deliverability, with deep understanding of factors that lead to email bounces and how to mitigate them. You use predictive models to identify high-risk emails.',
-    llm=openrouter_llm,
+    llm=analysis_llm,
     verbose=True,
     allow_delegation=False,
     max_iter=10,            # ↑ allow more reasoning cycles
@@ -321,7 +293,7 @@ email_content_analyst_agent = Agent(
     role='Email Content Structure and Compliance Analyst',
     goal='Analyze email content for structure, waiver compliance, and overall quality, providing actionable recommendations.',
     backstory='An expert in email marketing best practices, legal compliance, and content optimization. You meticulously examine email structure, identify waivers, and assess content quality to ensure maximum effectiveness and adherence to regulations.',
-    llm=openrouter_llm,
+    llm=analysis_llm,
     verbose=True,
     allow_delegation=False
 )
@@ -331,7 +303,7 @@ waiver_extraction_agent = Agent(
     role="Waiver-Extraction Specialist",
     goal="Given one email body, output only the numeric APC-waiver/discount percentage, or 0 if none.",
     backstory="Expert at spotting fee waivers in scholarly-publishing emails.",
-    llm=openrouter_llm,
+    llm=analysis_llm,
     verbose=True,
     allow_delegation=False
 )
@@ -486,7 +458,7 @@ def calculate_subject_spam_risk_score(subject_line: str) -> int:
         return 0
     score = 0
     subject_lower = subject_line.lower()
-    for keyword in SPAM_KEYWORDS:
+    for keyword in _subject_spam_keywords():
         if keyword in subject_lower:
             score -= 10 # Penalize for each spam keyword found
     return score
@@ -509,7 +481,7 @@ def calculate_subject_overall_score(length_score_scaled: float, caps_score_scale
     )
     return max(0, min(100, final_score)) # Ensure score is between 0 and 100
 
-def parse_crew(out: Crew) -> dict:
+def parse_crew(out) -> dict:
     """
     Returns a dict if the agent produced JSON, otherwise a dict with the raw text
     under 'raw_output'. Never raises AttributeError.
@@ -549,7 +521,7 @@ def scale_caps_score(score: int) -> float:
     return (score + 20) / 20 * 100
 
 def scale_spam_score(score: int) -> float:
-    # Assuming max penalty for spam is -100 for scaling purposes (can be adjusted based on SPAM_KEYWORDS list size)
+    # Assuming max penalty for spam is -100 for scaling purposes (can be adjusted based on the subject keyword list size)
     # Min: -100, Max: 0. Range: 100.
     # Cap score at 0 for max, and -100 for min to fit scaling.
     score = max(-100, score) # Ensure score doesn't go below -100 for scaling
@@ -685,17 +657,13 @@ def get_interspire_data():
             email_content = row['email_content']
             subject_length = row['subject_length']
             subject_caps_percentage = row['subject_caps_percentage']
+            usage_run = f"interspire-{row['analysis_id']}-{uuid.uuid4().hex[:8]}"
+            set_run_id(usage_run)  # every LLM call for this email is logged under this id
 
             # --- CrewAI for Confidence Score ---
             confidence_task = create_confidence_task(subject_line, email_content)
-            confidence_crew = Crew(
-                agents=[confidence_agent],
-                tasks=[confidence_task],
-                verbose=False,
-                process=Process.sequential
-            )
             try:
-                confidence_output = confidence_crew.kickoff()
+                confidence_output = run_task(confidence_task)
                 
                 # Debug Confirmation
                 # print("RAW OUTPUT (Confidence):", getattr(confidence_output, "raw", confidence_output))
@@ -725,21 +693,8 @@ def get_interspire_data():
             bounce_risk_task = create_bounce_risk_task(
                 subject_line, email_content, subject_length, subject_caps_percentage
             )
-            bounce_crew = Crew(
-                agents=[bounce_agent],
-                tasks=[bounce_risk_task],
-                verbose=False,
-                process=Process.sequential
-            )
-            # ─── run with up to 2 retries ───
-            for attempt in range(3):   # 0,1,2  → 1 initial + 2 retries
-                try:
-                    bounce_output = bounce_crew.kickoff()
-                    break              # success → exit the loop
-                except Exception as e:
-                    if attempt == 2:   # third failure
-                        raise          # let outer try/except handle it
-                    continue           # retry
+            # transient LLM errors are retried (with backoff / fallback model) by the router
+            bounce_output = run_task(bounce_risk_task)
 
             # existing parsing / try-except block stays the same
             bounce_result = parse_crew(bounce_output)
@@ -756,14 +711,8 @@ def get_interspire_data():
 
             # --- CrewAI for Email Structure Analysis ---
             structure_task = create_email_structure_task(email_content)
-            structure_crew = Crew(
-                agents=[email_content_analyst_agent],
-                tasks=[structure_task],
-                verbose=False,
-                process=Process.sequential
-            )
             try:
-                structure_output = structure_crew.kickoff()
+                structure_output = run_task(structure_task)
 
                 # Debug Confirmation
                 # print("RAW OUTPUT (Structure):", getattr(structure_output, "raw", structure_output))
@@ -784,15 +733,9 @@ def get_interspire_data():
 
             # --- NEW CrewAI for Waiver Extraction ---
             waiver_task = create_waiver_extraction_task(email_content)
-            waiver_crew = Crew(
-                agents=[waiver_extraction_agent],
-                tasks=[waiver_task],
-                verbose=False,
-                process=Process.sequential
-            )
 
             try:
-                waiver_out  = waiver_crew.kickoff()
+                waiver_out  = run_task(waiver_task)
                 waiver_pct  = parse_crew(waiver_out).get("waiver_percentage", 0)
             except Exception:
                 waiver_pct  = extract_waiver_percentage(email_content)  # regex fallback
@@ -801,15 +744,9 @@ def get_interspire_data():
 
             # --- Waiver-compliance analysis ------------------------------------
             waiver_comp_task = create_waiver_compliance_task(email_content)
-            waiver_comp_crew = Crew(
-                agents=[email_content_analyst_agent],
-                tasks=[waiver_comp_task],
-                verbose=False,
-                process=Process.sequential
-            )
 
             try:
-                comp_out  = waiver_comp_crew.kickoff()
+                comp_out  = run_task(waiver_comp_task)
                 comp_json = parse_crew(comp_out)
 
                 df.at[index, 'waiver_compliance']      = comp_json.get('waiver_compliance', False)
@@ -823,14 +760,8 @@ def get_interspire_data():
 
             # --- CrewAI for Content Quality Assessment ---
             content_quality_task = create_content_quality_task(email_content)
-            content_quality_crew = Crew(
-                agents=[email_content_analyst_agent],
-                tasks=[content_quality_task],
-                verbose=False,
-                process=Process.sequential
-            )
             try:
-                content_quality_output = content_quality_crew.kickoff()
+                content_quality_output = run_task(content_quality_task)
 
                 # Debug Confirmation
                 # print("RAW OUTPUT (Content Quality):", getattr(content_quality_output, "raw", content_quality_output))
@@ -852,17 +783,10 @@ def get_interspire_data():
             # After all other scores are filled, but still inside the main loop:
             df.at[index, 'overall_score'] = calculate_overall_score(df.loc[index])
             
-            # ── token accounting ───────────────────────────────────────────
-            toks_in  = toks_out = cached = 0
-            cost_usd = 0.0
-
-            for crew in (confidence_crew, bounce_crew, structure_crew,
-                         waiver_crew, waiver_comp_crew, content_quality_crew):
-                u = _collect_usage(crew)
-                toks_in  += u["prompt_tokens"]
-                toks_out += u["completion_tokens"]
-                cached   += u["cached"]
-                cost_usd += u["cost"]
+            # ── token accounting (LLM telemetry of this row's calls) ──────
+            u = get_telemetry().totals(usage_run)
+            toks_in,  toks_out = u["prompt_tokens"], u["completion_tokens"]
+            cached,   cost_usd = u["cache_hits"], u["cost"]
 
             # write / up-sert into ledger
             if conn:
@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+# Add the parent directory (analysis_interspire) and the repo root (qc_script)
+# to the Python path
+script_dir = os.path.dirname(__file__)
+package_root = os.path.abspath(os.path.join(script_dir, '..', '..'))
+repo_root = os.path.abspath(os.path.join(package_root, '..'))
+sys.path.insert(0, package_root)
+if repo_root not in sys.path:
+    sys.path.append(repo_root)
+
+from analysis_interspire.data_loader import iter_history
+from qc_script import validate_many
+
+def summarize_rules(df_qc: pd.DataFrame, open_rate: pd.Series) -> pd.DataFrame:
+    """
+    Open rate of bodies passing vs failing each QC rule.
+
+    Args:
+        df_qc (pd.DataFrame): Boolean rule columns (validate_many output), indexed by id.
+        open_rate (pd.Series): Open rate indexed by the same ids.
+
+    Returns:
+        pd.DataFrame: One row per rule: pass_share, open_rate_pass, open_rate_fail,
+                      lift (pass - fail) and correlation (point-biserial).
+    """
+    rate = open_rate.reindex(df_qc.index)
+    rows = []
+    for rule in df_qc.columns:
+        passed = df_qc[rule]
+        rows.append({
+            'rule': rule,
+            'pass_share': passed.mean(),
+            'open_rate_pass': rate[passed].mean(),
+            'open_rate_fail': rate[~passed].mean(),
+            'correlation': passed.astype(float).corr(rate) if passed.nunique() > 1 else float('nan'),
+        })
+    df_summary = pd.DataFrame(rows)
+    df_summary['lift'] = df_summary['open_rate_pass'] - df_summary['open_rate_fail']
+    return df_summary.sort_values('lift', ascending=False, ignore_index=True)
+
+def backtest_qc(chunksize: int = 5000, workers: int | None = None,
+                output_dir: str = "analysis_interspire/outputs"):
+    """
+    Runs the deterministic QC rules (qc_script.validate) over every historical
+    body, streamed from the database in chunks, and relates each rule to opens.
+    """
+    print("Backtesting QC rules against Interspire history...")
+    open_rates = []
+
+    def bodies():
+        for chunk in iter_history(chunksize=chunksize,
+                                  columns=['id', 'email', 'opens', 'sent_count']):
+            open_rates.append(chunk.set_index('id')['open_rate'])
+            print(f"  streamed {sum(len(r) for r in open_rates):,} bodies", end="\r")
+            yield chunk.set_index('id')['email']
+
+    df_qc = validate_many(bodies(), workers=workers)
+    print(f"\nChecked {len(df_qc):,} bodies against {len(df_qc.columns)} rules.")
+    if df_qc.empty:
+        print("No data loaded. Exiting.")
+        return
+
+    df_summary = summarize_rules(df_qc, pd.concat(open_rates))
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, "qc_rule_backtest.csv")
+    df_summary.to_csv(path, index=False)
+    print(df_summary.to_string(index=False))
+    print(f"\nQC backtest completed; output in {path}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backtest the deterministic QC rules against historical Interspire opens."
+    )
+    parser.add_argument("--chunksize", type=int, default=5000,
+                        help="Rows streamed from the database per chunk.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for validation (default: CPU count).")
+    args = parser.parse_args()
+
+    backtest_qc(chunksize=args.chunksize, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -39,7 +39,8 @@ def extract_insights(limit: int | None = None):
 
     # 3. Compute correlations
     print("Computing correlations between features and metrics...")
-    df_correlations = compute_correlations(df_features, df_metrics)
+    df_correlations = compute_correlations(df_features, df_metrics,
+                                           spam_batch=df_features.attrs.get("spam_batch"))
     print("Correlations computed.")
 
     # 4. Save CSV
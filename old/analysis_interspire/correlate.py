@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import spearmanr
+from scipy.stats import spearmanr, rankdata, t as t_dist
 import os
 
-def compute_correlations(df_features: pd.DataFrame, df_metrics: pd.DataFrame) -> pd.DataFrame:
+def compute_correlations(df_features: pd.DataFrame, df_metrics: pd.DataFrame,
+                         spam_batch=None, min_docs: int = 30) -> pd.DataFrame:
     """
     Computes Spearman correlation and p-value for each numeric feature vs each target metric.
 
@@ -11,6 +12,10 @@ def compute_correlations(df_features: pd.DataFrame, df_metrics: pd.DataFrame) ->
         df_features (pd.DataFrame): DataFrame containing feature columns.
         df_metrics (pd.DataFrame): DataFrame containing target metrics (open_rate, click_rate, bounce_rate).
                                    Must contain 'id' column for merging.
+        spam_batch (SpamBatch, optional): Sparse per-term spam hits (rows labelled by 'id'),
+                                          e.g. df_features.attrs["spam_batch"]. Adds one
+                                          'spam_term:<term>' feature per lexicon term.
+        min_docs (int): Minimum number of documents containing a term for it to be correlated.
 
     Returns:
         pd.DataFrame: A tidy DataFrame with columns: feature, metric, correlation, p_value.
@@ -51,7 +56,75 @@ def compute_correlations(df_features: pd.DataFrame, df_metrics: pd.DataFrame) ->
                     'p_value': np.nan
                 })
 
-    return pd.DataFrame(correlations_data)
+    df_corr = pd.DataFrame(correlations_data)
+    if spam_batch is not None:
+        df_corr = pd.concat([df_corr, compute_spam_term_correlations(spam_batch, df_metrics, min_docs)],
+                            ignore_index=True)
+    return df_corr
+
+def _sparse_spearman(col_rows: np.ndarray, col_vals: np.ndarray, y_rank: np.ndarray) -> float:
+    """
+    Spearman rho between a sparse column (zeros elsewhere) and pre-ranked y,
+    in O(nnz): all zero rows share one average rank.
+    """
+    n = len(y_rank)
+    n1 = len(col_rows)
+    n0 = n - n1
+    mid = (n + 1) / 2
+    x_zero = (n0 + 1) / 2 - mid
+    x_nz = n0 + rankdata(col_vals) - mid
+    y_nz = y_rank[col_rows] - mid
+    cov = np.dot(x_nz, y_nz) - x_zero * y_nz.sum()
+    var_x = n0 * x_zero ** 2 + np.dot(x_nz, x_nz)
+    var_y = np.dot(y_rank - mid, y_rank - mid)
+    if var_x == 0 or var_y == 0:
+        return np.nan
+    return cov / np.sqrt(var_x * var_y)
+
+def compute_spam_term_correlations(spam_batch, df_metrics: pd.DataFrame, min_docs: int = 30) -> pd.DataFrame:
+    """
+    Spearman correlation of every spam-lexicon term count (sparse, see
+    src/utils/spam_batch.py) vs each target metric, without densifying the
+    document x term matrix. Terms found in fewer than `min_docs` documents
+    are skipped.
+
+    Returns:
+        pd.DataFrame: Tidy DataFrame with columns: feature, metric, correlation, p_value.
+    """
+    target_metrics = ['open_rate', 'click_rate', 'bounce_rate']
+    metrics = df_metrics.set_index('id')[target_metrics].reindex(spam_batch.index)
+    matrix = spam_batch.matrix.tocsc()
+    support = spam_batch.doc_frequency()
+    candidates = np.flatnonzero(support >= min_docs)
+
+    correlations_data = []
+    for metric in target_metrics:
+        y = metrics[metric].to_numpy(dtype=float)
+        valid = ~np.isnan(y)
+        n = int(valid.sum())
+        if n < 3:
+            continue
+        y_rank = rankdata(y[valid])
+        position = np.cumsum(valid) - 1          # original row -> row within valid
+        for j in candidates:
+            start, end = matrix.indptr[j], matrix.indptr[j + 1]
+            rows = matrix.indices[start:end]
+            keep = valid[rows]
+            rows, vals = position[rows[keep]], matrix.data[start:end][keep]
+            if len(rows) < min_docs:
+                continue
+            rho = _sparse_spearman(rows, vals, y_rank)
+            if np.isnan(rho):
+                continue
+            t_stat = rho * np.sqrt((n - 2) / max(1e-12, 1 - rho ** 2))
+            correlations_data.append({
+                'feature': f"spam_term:{spam_batch.terms[j]}",
+                'metric': metric,
+                'correlation': rho,
+                'p_value': 2 * t_dist.sf(abs(t_stat), n - 2)
+            })
+
+    return pd.DataFrame(correlations_data, columns=['feature', 'metric', 'correlation', 'p_value'])
 
 def save_correlations_to_csv(df_correlations: pd.DataFrame, output_dir: str = "analysis_interspire/outputs"):
     """
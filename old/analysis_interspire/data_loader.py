@@ -15,6 +15,42 @@ def load_history(limit: int | None = None) -> pd.DataFrame:
     Returns:
         pandas.DataFrame: DataFrame containing Interspire data with rate columns.
     """
+    engine = _engine()
+
+    query = "SELECT * FROM interspire_data"
+    if limit is not None:
+        query += f" LIMIT {limit}"
+
+    try:
+        df = pd.read_sql(query, engine)
+    except Exception as e:
+        raise RuntimeError(f"Error loading data from database: {e}")
+
+    return _prepare(df)
+
+def iter_history(chunksize: int = 5000, columns: list[str] | None = None):
+    """
+    Streams historical Interspire rows in chunks (server-side cursor), so
+    full-history jobs such as the QC backtest run in bounded memory.
+
+    Args:
+        chunksize (int): Rows per yielded DataFrame.
+        columns (list[str], optional): Columns to select (default: all). Rate
+            columns are added whenever their source counts are selected.
+
+    Yields:
+        pandas.DataFrame: Successive chunks, prepared like load_history().
+    """
+    cols = ", ".join(columns) if columns else "*"
+    query = f"SELECT {cols} FROM interspire_data ORDER BY id"
+    with _engine().connect().execution_options(stream_results=True) as conn:
+        try:
+            for chunk in pd.read_sql(query, conn, chunksize=chunksize):
+                yield _prepare(chunk)
+        except Exception as e:
+            raise RuntimeError(f"Error streaming data from database: {e}")
+
+def _engine():
     # Database connection details - using environment variables prefixed with "DRAFTS_"
     db_user = os.getenv("DRAFTS_DB_USER")
     db_password = os.getenv("DRAFTS_DB_PASS")
@@ -25,24 +61,19 @@ def load_history(limit: int | None = None) -> pd.DataFrame:
         raise ValueError("Database credentials (DRAFTS_DB_USER, DRAFTS_DB_PASSWORD, DRAFTS_DB_HOST, DRAFTS_DB_NAME) must be set as environment variables.")
 
     db_connection_str = f"mysql+mysqlconnector://{db_user}:{db_password}@{db_host}/{db_name}"
-    engine = sqlalchemy.create_engine(db_connection_str)
-
-    query = "SELECT * FROM interspire_data"
-    if limit is not None:
-        query += f" LIMIT {limit}"
-
-    try:
-        df = pd.read_sql(query, engine)
-    except Exception as e:
-        raise RuntimeError(f"Error loading data from database: {e}")
+    return sqlalchemy.create_engine(db_connection_str)
 
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
     # Ensure 'email' and 'subject' columns have no NaN values
-    df['email'] = df['email'].fillna('')
-    df['subject'] = df['subject'].fillna('')
+    for col in ('email', 'subject'):
+        if col in df.columns:
+            df[col] = df[col].fillna('')
 
     # Compute additional rate columns, handling division by zero
-    df["open_rate"] = df["opens"] / df["sent_count"].replace(0, np.nan)
-    df["click_rate"] = df["clicks"] / df["sent_count"].replace(0, np.nan)
-    df["bounce_rate"] = df["bounces"] / df["sent_count"].replace(0, np.nan)
+    if "sent_count" in df.columns:
+        sent = df["sent_count"].replace(0, np.nan)
+        for count, rate in (("opens", "open_rate"), ("clicks", "click_rate"), ("bounces", "bounce_rate")):
+            if count in df.columns:
+                df[rate] = df[count] / sent
 
     return df
@@ -1,17 +1,53 @@
+import os
+import sys
 import pandas as pd
 from . import features_subject as fs
 from . import features_content as fc
 
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
+# The batch spam scanner lives in <repo>/src/utils (shared spam lexicon)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+from src.utils.spam_batch import SpamBatch, find_spam_many
+
+def build_spam_features(df: pd.DataFrame, workers: int | None = None) -> tuple[pd.DataFrame, SpamBatch]:
+    """
+    Scans every subject and body against the spam lexicon in one batch each
+    (multi-process, see src/utils/spam_batch.py).
+
+    Args:
+        df (pd.DataFrame): DataFrame with 'id', 'subject' and 'email' columns.
+        workers (int, optional): Worker processes. Defaults to the CPU count.
+
+    Returns:
+        tuple: (DataFrame with 'id' and aggregate spam columns,
+                SpamBatch of the bodies whose rows follow df and are labelled by 'id').
+    """
+    body = find_spam_many(pd.Series(df['email'].values, index=df['id'].values),
+                          strip_html=True, workers=workers)
+    subject = find_spam_many(df['subject'], lists=("subject",), workers=workers)
+    df_spam = pd.DataFrame({
+        'id': df['id'].values,
+        'subject_spam_keyword_count': subject.counts,
+        'content_spam_count': body.counts,
+        'content_spam_density': body.densities,
+        'content_spam_unique_terms': body.indptr[1:] - body.indptr[:-1],
+    }, index=df.index)
+    return df_spam, body
+
+def build_features(df: pd.DataFrame, spam_workers: int | None = None) -> pd.DataFrame:
     """
     Applies all feature extraction functions from features_subject and features_content
-    to the input DataFrame.
+    to the input DataFrame, plus the batch spam features.
 
     Args:
         df (pd.DataFrame): The input DataFrame containing 'subject' and 'email' columns.
+        spam_workers (int, optional): Worker processes for the spam scan.
 
     Returns:
         pd.DataFrame: A new DataFrame with original 'id' and all computed feature columns.
+                      The sparse per-term hit matrix is kept in
+                      `df_features.attrs["spam_batch"]` for compute_correlations.
     """
     if 'subject' not in df.columns or 'email' not in df.columns or 'id' not in df.columns:
         raise ValueError("Input DataFrame must contain 'id', 'subject', and 'email' columns.")
@@ -32,6 +68,12 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     df_features['content_external_domain_count'] = fc.external_domain_count(df['email'])
     df_features['content_single_cta'] = fc.single_cta(df['email'])
 
+    # Spam features (one batch scan over the whole frame)
+    df_spam, spam_batch = build_spam_features(df, workers=spam_workers)
+    for col in df_spam.columns.drop('id'):
+        df_features[col] = df_spam[col]
+    df_features.attrs["spam_batch"] = spam_batch
+
     return df_features
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+from analysis_interspire.correlate import compute_spam_term_correlations
+from src.utils.spam_batch import find_spam_many
+
+def test_spam_term_correlation_matches_dense_spearman():
+    rng = np.random.default_rng(0)
+    bodies = rng.choice(["amazing results", "amazing amazing offer", "plain text", ""], size=200)
+    batch = find_spam_many(pd.Series(bodies, index=np.arange(200)))
+    metrics = pd.DataFrame({
+        'id': np.arange(200),
+        'open_rate': rng.random(200),
+        'click_rate': rng.random(200),
+        'bounce_rate': np.nan,
+    })
+    df_corr = compute_spam_term_correlations(batch, metrics, min_docs=5)
+    row = df_corr[(df_corr.feature == "spam_term:amazing") & (df_corr.metric == "open_rate")].iloc[0]
+    dense = batch.matrix[:, batch.terms.index("amazing")].toarray().ravel()
+    rho, p = spearmanr(dense, metrics['open_rate'])
+    assert np.isclose(row.correlation, rho) and np.isclose(row.p_value, p)
+    assert "bounce_rate" not in set(df_corr.metric)
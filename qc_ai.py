@@ -16,6 +16,8 @@ score(text) → dict{
     tone_ok:       bool,
     __PASS__:      bool          # convenience flag (all True)
 }
+score_cached(text) → same, served from the QC verdict cache
+score_many(drafts) → [same, …] – several drafts per request, input order
 
 Setup
 -----
@@ -25,17 +27,23 @@ Setup
 """
 
 from __future__ import annotations
-import os, re, json
-from typing import Dict
+import os, re, json, threading
+from concurrent.futures import CancelledError
+from typing import Dict, Iterable, List, Optional
 
-import openai
+from src.utils.http_clients import openai_client   # shared keep-alive pool
+from src.utils.llm_replay import chat_client       # record / replay stand-in (LLM_REPLAY)
+from src.utils.qc_cache import CachedCheck, get_cache
+from src.utils.spam_scan import scan   # hard-sell list shared with qc_script
 
 # ── Configuration ───────────────────────────────────────────────────────────
 MODEL   = os.getenv("QC_AI_MODEL", "o3")       # default to OpenAI o3
 TIMEOUT = 30                                   # seconds
 
-# Hard-sell verbs reused from qc_script for consistency
-HARD_SELL = {"seize", "grab", "don't miss out", "act now", "hurry"}
+# score_many(): drafts packed per request
+BATCH_TOKEN_BUDGET = int(os.getenv("QC_AI_BATCH_TOKENS", 12000))   # prompt tokens
+BATCH_MAX_DRAFTS   = int(os.getenv("QC_AI_BATCH_DRAFTS", 12))
+CHARS_PER_TOKEN    = 4                         # rough estimate for packing
 
 # Author-centric perk keywords
 AUTHOR_PERKS = {
@@ -73,6 +81,21 @@ DRAFT:
 JSON:
 """
 
+BATCH_PROMPT_TEMPLATE = """
+You are an academic email auditor. For EACH numbered draft below:
+1. Does the first **≤40 words** clearly state the research field, the journal name, AND one tangible benefit (e.g., waiver %, visibility)?  → "hook_ok"
+2. Does the entire body mention **exactly one** author-centric perk AND **exactly one** concrete metric (IF, waiver %, review days)?  → "balanced_ok"
+3. Is the overall tone collegial (avoid commands like "seize", "grab", "act now"; no ALL-CAPS, no exclamation marks)?  → "tone_ok"
+Judge every draft independently.
+Return ONLY a JSON array with one object per draft, in any order:
+[{{"i": <draft number>, "hook_ok": true/false, "balanced_ok": true/false, "tone_ok": true/false}}, ...]
+
+{drafts}
+JSON:
+"""
+
+_KEYS = ("hook_ok", "balanced_ok", "tone_ok")
+
 ##############################################################################
 #  🔍  Local pre-checks to reduce LLM calls (optional but cheap)
 ##############################################################################
@@ -84,8 +107,21 @@ def _precheck_balanced(text: str) -> bool:
     return perks == 1 and metrics == 1
 
 def _precheck_tone(text: str) -> bool:
-    low = text.lower()
-    return not any(v in low for v in HARD_SELL) and "!" not in text and text.upper() != text
+    return not scan(text).count("hard_sell") and "!" not in text and text.upper() != text
+
+def _as_bool(v) -> bool:
+    """JSON true/false, or a stray "yes"/"no"/"true" string."""
+    if isinstance(v, str):
+        return v.strip().lower() in ("yes", "true", "y", "1")
+    return bool(v)
+
+def _fast_fail(text: str) -> Optional[Dict[str, bool]]:
+    """Local knockout used by score(); None when the LLM is needed."""
+    checks = {"balanced_ok": _precheck_balanced(text), "tone_ok": _precheck_tone(text)}
+    if all(checks.values()):
+        return None
+    return {**checks, "hook_ok": False,     # unknown without LLM, mark fail
+            "__PASS__": False}
 
 ##############################################################################
 #  🎯  Public scoring function
@@ -93,23 +129,24 @@ def _precheck_tone(text: str) -> bool:
 
 def score(text: str,
           model: str = MODEL,
-          timeout: int = TIMEOUT) -> Dict[str, bool]:
+          timeout: int = TIMEOUT,
+          cancel: Optional[threading.Event] = None) -> Dict[str, bool]:
     """
     Heuristic LLM validation.  Falls back to deterministic rejects
     if blatant violations are found locally to save tokens.
+
+    *cancel* (set by a concurrent QC runner once the deterministic checks
+    fail) aborts with `CancelledError` before the request is sent.
     """
     # Cheap heuristic knockout
-    fast_fail = {}
-    fast_fail["balanced_ok"] = _precheck_balanced(text)
-    fast_fail["tone_ok"]     = _precheck_tone(text)
-
-    if not all(fast_fail.values()):
-        fast_fail["hook_ok"] = False     # unknown without LLM, mark fail
-        fast_fail["__PASS__"] = False
+    fast_fail = _fast_fail(text)
+    if fast_fail is not None:
         return fast_fail
 
     # ------------------- LLM call (only if cheap tests pass) --------------
-    client = openai.OpenAI()
+    client = chat_client(openai_client)
+    if cancel is not None and cancel.is_set():
+        raise CancelledError("AI QC cancelled – deterministic checks failed")
     chat = client.chat.completions.create(
         model=model,
         messages=[{"role": "user",
@@ -128,13 +165,114 @@ def score(text: str,
 
     # Ensure booleans
     final = {
-        "hook_ok":     bool(data.get("hook_ok", False)),
-        "balanced_ok": bool(data.get("balanced_ok", False)),
-        "tone_ok":     bool(data.get("tone_ok", False))
+        "hook_ok":     _as_bool(data.get("hook_ok", False)),
+        "balanced_ok": _as_bool(data.get("balanced_ok", False)),
+        "tone_ok":     _as_bool(data.get("tone_ok", False))
     }
     final["__PASS__"] = all(final.values())
     return final
 
+##############################################################################
+#  📦  Batched scoring  – several drafts per chat completion
+##############################################################################
+
+def _pack(items: List[tuple], budget: int, max_drafts: int) -> List[List[tuple]]:
+    """Greedy batches of (index, text) under the prompt-token budget."""
+    overhead = len(BATCH_PROMPT_TEMPLATE) // CHARS_PER_TOKEN
+    batches, cur, used = [], [], overhead
+    for item in items:
+        cost = len(item[1]) // CHARS_PER_TOKEN + 10
+        if cur and (used + cost > budget or len(cur) >= max_drafts):
+            batches.append(cur)
+            cur, used = [], overhead
+        cur.append(item)
+        used += cost
+    if cur:
+        batches.append(cur)
+    return batches
+
+def _parse_batch(raw: str, n: int) -> Dict[int, Dict[str, bool]]:
+    """
+    Defensive parse of the indexed array → {position: verdict}.  Code
+    fences, prose around the array, an object wrapper ({"results": […]})
+    and 0- or 1-based numbering are tolerated; malformed items are dropped.
+    """
+    raw = re.sub(r"```(?:json)?", "", raw or "")
+    start, end = raw.find("["), raw.rfind("]")
+    try:
+        data = json.loads(raw[start:end + 1]) if -1 < start < end else json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if isinstance(v, list)), [])
+    items = [d for d in data if isinstance(d, dict)] if isinstance(data, list) else []
+    nums: List[Optional[int]] = []
+    for d in items:                                  # "0" and 0 are the same index
+        try:
+            nums.append(int(d.get("i", d.get("index", d.get("id")))))
+        except (TypeError, ValueError):
+            nums.append(None)
+    zero_based = 0 in nums and n not in nums
+    out: Dict[int, Dict[str, bool]] = {}
+    for d, num in zip(items, nums):
+        if num is None:
+            continue
+        pos = num - (0 if zero_based else 1)
+        if 0 <= pos < n and pos not in out and all(k in d for k in _KEYS):
+            verdict = {k: _as_bool(d[k]) for k in _KEYS}
+            verdict["__PASS__"] = all(verdict.values())
+            out[pos] = verdict
+    return out
+
+def score_many(drafts: Iterable[str],
+               model: str = MODEL,
+               timeout: int = TIMEOUT,
+               token_budget: int = BATCH_TOKEN_BUDGET,
+               max_drafts: int = BATCH_MAX_DRAFTS,
+               cache: bool = True) -> List[Dict[str, bool]]:
+    """
+    `score` for many drafts, in input order.
+
+    Local knockouts and cached verdicts never reach the LLM; the rest are
+    packed into as few chat completions as *token_budget* / *max_drafts*
+    allow, each answering an indexed JSON array.  Items the reply does
+    not cover (or garbles) are re-scored with single-draft `score()`.
+    """
+    drafts = list(drafts)
+    results: List[Optional[Dict[str, bool]]] = [None] * len(drafts)
+    store = get_cache() if cache else None
+    pending = []
+    for pos, text in enumerate(drafts):
+        results[pos] = _fast_fail(text)
+        if results[pos] is None and store is not None:
+            results[pos] = store.get(score_cached.key(text, model=model))
+        if results[pos] is None:
+            pending.append((pos, text))
+
+    client = chat_client(openai_client) if pending else None
+    for batch in _pack(pending, token_budget, max_drafts):
+        body = "\n\n".join(f"### DRAFT {n}\n{text}\n### END DRAFT {n}"
+                            for n, (_, text) in enumerate(batch, 1))
+        chat = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user",
+                       "content": BATCH_PROMPT_TEMPLATE.format(drafts=body)}],
+            timeout=timeout * len(batch),
+        )
+        parsed = _parse_batch(chat.choices[0].message.content, len(batch))
+        for n, (pos, text) in enumerate(batch):
+            verdict = parsed.get(n)
+            if verdict is None:                       # fall back: this item only
+                verdict = (score_cached if cache else score)(text, model=model, timeout=timeout)
+            elif store is not None:
+                store.put(score_cached.key(text, model=model), score_cached.checker, verdict)
+            results[pos] = verdict
+    return results
+
+# Same verdicts, keyed by (draft, prompt/rules version, model) – identical
+# drafts are never re-billed across reruns or sessions (src/utils/qc_cache.py)
+score_cached = CachedCheck("qc_ai.score", score, key_args=("model",))
+
 ##############################################################################
 #  🏃  CLI helper  – run: python qc_ai.py draft.txt
 ##############################################################################
@@ -29,32 +29,33 @@ Article-type rule
 -------------------------------------------------------------------------------
 Return value
     validate(text)  → dict(rule_name -> True / False / detail str)
+    validate_cached(text) → same dict, served from the QC verdict cache
+    validate_many(texts) → bool DataFrame (rows × rules), multi-process
 -------------------------------------------------------------------------------
 """
 
 from __future__ import annotations
 import re, html, datetime as dt
-from collections import Counter
 from urllib.parse import urlparse
 
+from src.utils import qc_engine
+from src.utils.qc_cache import CachedCheck
+from src.utils.qc_engine import Draft, Rule, evaluate, facts
+from src.utils.spam_scan import ALLOWED_SPAM_EXCEPTIONS
+
 ##############################################################################
 #  🔧  Configuration – tweak as needed
 ##############################################################################
 
-# Minimal spam word sample.  Replace / extend with your master list.
-SPAM_WORDS = {
-    "100%", "miracle", "guarantee", "unlock", "exclusive", "winner"
-}
+# Spam, hype & hard-sell vocabulary live in the shared lexicon
+# (src/utils/lexicon/*.txt); one `scan()` per draft feeds all three checks.
 
-# Hype & hard-sell vocabulary
-HYPE_WORDS  = {
-    "groundbreaking", "revolutionary", "spectacular", "incredible",
-    "unbeatable", "seize", "amazing", "once-in-a-lifetime", "bargain",
-    "massive", "discount", "unrivalled"
-}
-HARD_SELL   = {"seize", "grab", "don't miss out", "act now", "hurry"}
+# The 2 % density cap counts only these high-signal terms.  The master
+# "spam" list (~2,600 terms) also holds everyday words – "all", "call",
+# "please", "new", "deadline" – and stays for highlighting / rewriting.
+DENSITY_SPAM_WORDS = frozenset({"100%", "miracle", "guarantee", "unlock", "exclusive", "winner"})
 
-# Forbidden phrase patterns (case-insensitive)
+# Forbidden phrase patterns – lower-case, matched case-insensitively
 FORBIDDEN_PATTERNS = {
     "waiver":      r"\b(full waiver|zero\s+apc|free of charge)\b",
     "fast_review": r"\b(fast[- ]?track|rapid review|quick (?:turnaround|review))\b",
@@ -69,68 +70,82 @@ ARTICLE_TYPES = {"review", "case study", "case report", "original article",
 
 
 ##############################################################################
-#  🧩  Helper functions
+#  🧩  Helper functions  (all read the shared `Draft` facts)
 ##############################################################################
 
 WORD_RE  = re.compile(r"\b[\w'-]+\b", re.I)
 DATE_RE  = re.compile(r"\b(\d{1,2}\s+[A-Za-z]+\s+\d{4})\b")  # e.g. 31 July 2025
-
-def _wordcount(text: str) -> int:
-    return len(WORD_RE.findall(text))
-
-def _spam_density(text: str) -> float:
-    words = [w.lower() for w in WORD_RE.findall(text)]
-    spam_hits = sum(w in SPAM_WORDS for w in words)
-    return spam_hits / max(1, len(words))
-
-def _first_journal_issn_once(text: str) -> bool:
+URL_RE   = re.compile(r"https?://[^\s)>\]]+", re.I)
+EMAIL_RE = re.compile(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", re.I)
+ISSN_RE  = re.compile(r"journal[^.\n]{0,120}?issn")         # on folded text
+SIG_P_RE = re.compile(r"<p>.*?<br>.*?</p>", re.S | re.I)
+_FORBIDDEN = {tag: re.compile(pat) for tag, pat in FORBIDDEN_PATTERNS.items()}
+
+# Block-order markers (on folded text); the waiver line is located by
+# `_waiver_line` – a percentage followed, anywhere later, by a full date.
+_PERCENT_RE = re.compile(r"\b\d{1,2}(\s?)(%|percent)")
+_LOOSE_DATE_RE = re.compile(r"\d{1,2}\s+[a-z]+\s+\d{4}")
+_MARKERS = [
+    re.compile(r"dear\b"),                     # Hook starts after greeting
+    None,                                      # Waiver line → _waiver_line()
+    re.compile(r"about the journal"),
+    re.compile(r"(topics|scope)"),
+    re.compile(r"https?://"),                  # first CTA URL
+    re.compile(r"happy to assist|feel free to contact"),
+]                                              # … then the sign-off: Draft.signature
+
+def _wordcount(d: Draft) -> int:
+    return len(d.words(WORD_RE))
+
+def _spam_density(d: Draft) -> float:
+    hits = d.spam.without(ALLOWED_SPAM_EXCEPTIONS).hits
+    return sum(h.term in DENSITY_SPAM_WORDS for h in hits) / max(1, _wordcount(d))
+
+def _first_journal_issn_once(d: Draft) -> bool:
     """True if pattern 'Journal.*ISSN' appears exactly once."""
-    return len(re.findall(r"journal[^.\n]{0,120}?ISSN", text, flags=re.I)) == 1
+    return len(d.findall(ISSN_RE, folded=True)) == 1
 
-def _extract_urls(text: str) -> list[str]:
-    url_re = re.compile(r"https?://[^\s)>\]]+", re.I)
-    return url_re.findall(text)
+def _extract_urls(d: Draft) -> list[str]:
+    # every match lies inside one of the shared `https?://\S+` runs
+    return [u for run in d.urls for u in URL_RE.findall(run)]
 
 def _same_domain(u1: str, u2: str) -> bool:
     return urlparse(u1).netloc == urlparse(u2).netloc
 
-def _extract_emails(text: str) -> list[str]:
-    email_re = re.compile(r"\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b", re.I)
-    return email_re.findall(text)
-
-def _deadline_within_60(text: str, today: dt.date | None = None) -> bool:
+def _deadline_within_60(d: Draft, today: dt.date | None = None) -> bool:
     today = today or dt.date.today()
-    m = DATE_RE.search(text)
-    if not m:
+    if not d.dates:
         return False
     try:
-        d = dt.datetime.strptime(m.group(1), "%d %B %Y").date()
+        deadline = dt.datetime.strptime(d.dates[0], "%d %B %Y").date()
     except ValueError:
         return False
-    return (d - today).days <= 60
+    return (deadline - today).days <= 60
+
+def _waiver_line(d: Draft) -> int:
+    """Start of the first 'NN %' / 'NN percent' that a full date follows."""
+    for m in _PERCENT_RE.finditer(d.folded):
+        if (not m.group(1) and m.group(2) == "%") or \
+                _LOOSE_DATE_RE.search(d.folded, m.end()):
+            return m.start()
+    return -1
 
-def _block_order_ok(text: str) -> bool:
+def _block_order_ok(d: Draft) -> bool:
     """Quick heuristic: check that markers appear in the right order."""
-    markers = [
-        r"dear\b",                        # Hook starts after greeting
-        r"\b\d{1,2}%|\b(?:\d{1,2}\s?%|\d{1,2}\s?percent).*?(?:\d{1,2}\s+[A-Za-z]+\s+\d{4})", # Waiver line
-        r"about the journal",
-        r"(topics|scope)",
-        r"https?://",                     # first CTA URL
-        r"happy to assist|feel free to contact",
-        r"warm regards|sincerely|kind regards"
-    ]
     pos = []
-    for pat in markers:
-        m = re.search(pat, text, flags=re.I | re.S)
+    for pat in _MARKERS:
+        if pat is None:
+            pos.append(_waiver_line(d))
+            continue
+        m = d.search(pat, folded=True)
         pos.append(m.start() if m else -1)
+    pos.append(d.signature[0] if d.signature else -1)
     # all markers must be found (-1 absent) and strictly increasing
     return all(p > -1 for p in pos) and all(earlier < later for earlier, later in zip(pos, pos[1:]))
 
-def _bullet_checks(text: str) -> bool:
+def _bullet_checks(d: Draft) -> bool:
     """Ensure bullets start with '● ' and no nested bullets."""
-    lines = text.splitlines()
-    bullet_lines = [ln for ln in lines if ln.strip().startswith("●")]
+    bullet_lines = [ln for ln in d.lines if ln.strip().startswith("●")]
     if len(bullet_lines) > 6:
         return False
     # nested check: there must be no bullet line that is indented relative to previous bullet
@@ -140,63 +155,59 @@ def _bullet_checks(text: str) -> bool:
     # all bullet prefixes must be '● '
     return all(ln.lstrip().startswith("● ") for ln in bullet_lines)
 
-def _article_type_rule(text: str) -> bool:
-    lower = text.lower()
-    types_present = sum(kw in lower for kw in ARTICLE_TYPES)
+def _article_type_rule(d: Draft) -> bool:
+    types_present = sum(kw in d.lower for kw in ARTICLE_TYPES)
     if types_present >= 3:
-        return "all types welcome" in lower
+        return "all types welcome" in d.lower
     return True
 
+def _links_same_domain(d: Draft, _ctx) -> bool:
+    urls = d.memo(_extract_urls)
+    return len(urls) == 3 and _same_domain(urls[0], urls[1]) and _same_domain(urls[0], urls[2])
+
 ##############################################################################
-#  ✅  Master validator
+#  📋  Rules  (declared once, evaluated in order)
 ##############################################################################
 
-def validate(text: str) -> dict[str, bool | str]:
-    """
-    Return {"RULE_ID": bool, ...}.
-    A False value means the draft violates that rule.
-    """
-    results: dict[str, bool | str] = {}
-
-    # Strip HTML entities for regex clarity (emails often wrapped with &lt;)
-    text = html.unescape(text)
-
+RULES = [
     # ── Structure / formatting ──────────────────────────────────────────────
-    results["struct_block_order"]  = _block_order_ok(text)
-    results["struct_bullets"]      = _bullet_checks(text)
-    results["struct_journal_issn"] = _first_journal_issn_once(text)
-
-    urls  = _extract_urls(text)
-    emails = _extract_emails(text)
-    results["links_cta_count"]     = len(urls) == 3    # 1 CTA + 2 credibility
-    results["links_same_domain"]   = (
-        len(urls) == 3 and _same_domain(urls[0], urls[1]) and _same_domain(urls[0], urls[2])
-    )
-    results["emails_single"]       = len(emails) == 1
-
+    Rule("struct_block_order",  lambda d, _: _block_order_ok(d)),
+    Rule("struct_bullets",      lambda d, _: _bullet_checks(d)),
+    Rule("struct_journal_issn", lambda d, _: _first_journal_issn_once(d)),
+    Rule("links_cta_count",     lambda d, _: len(d.memo(_extract_urls)) == 3),  # 1 CTA + 2 credibility
+    Rule("links_same_domain",   _links_same_domain),
+    Rule("emails_single",       lambda d, _: len(d.findall(EMAIL_RE)) == 1),
     # Signature line check: one <p> containing <br>
-    sig_ok = bool(re.search(r"<p>.*?<br>.*?</p>", text, flags=re.S | re.I))
-    results["signature_block"] = sig_ok
+    Rule("signature_block",     lambda d, _: bool(d.search(SIG_P_RE))),
 
     # ── Guardrails ───────────────────────────────────────────────────────────
-    wc = _wordcount(text)
-    results["word_count"]          = 330 <= wc <= 450
-    results["spam_density"]        = _spam_density(text) <= 0.02
+    Rule("word_count",          lambda d, _: 330 <= _wordcount(d) <= 450),
+    Rule("spam_density",        lambda d, _: _spam_density(d) <= 0.02),
+    *(Rule(f"forbidden_{tag}", lambda d, _, pat=pat: not d.search(pat, folded=True))
+      for tag, pat in _FORBIDDEN.items()),
+    Rule("hype_cap",            lambda d, _: d.spam.count("hype") <= 3),
+    Rule("hard_sell_verbs",     lambda d, _: not d.spam.count("hard_sell")),
 
-    for tag, pat in FORBIDDEN_PATTERNS.items():
-        results[f"forbidden_{tag}"] = not re.search(pat, text, flags=re.I)
+    # ── Date maths ───────────────────────────────────────────────────────────
+    Rule("deadline_≤60d",       lambda d, _: _deadline_within_60(d)),
 
-    hype_hits = sum(w in HYPE_WORDS for w in WORD_RE.findall(text.lower()))
-    results["hype_cap"]            = hype_hits <= 3
+    # ── Article-type rule ────────────────────────────────────────────────────
+    Rule("article_type_clause", lambda d, _: _article_type_rule(d)),
+]
 
-    hs_hits  = any(hv in text.lower() for hv in HARD_SELL)
-    results["hard_sell_verbs"]     = not hs_hits
+##############################################################################
+#  ✅  Master validator
+##############################################################################
 
-    # ── Date maths ───────────────────────────────────────────────────────────
-    results["deadline_≤60d"]       = _deadline_within_60(text)
+def validate(text: str) -> dict[str, bool | str]:
+    """
+    Return {"RULE_ID": bool, ...}.
+    A False value means the draft violates that rule.
+    """
+    # Strip HTML entities for regex clarity (emails often wrapped with &lt;)
+    draft = facts(html.unescape(text))      # shared with the other checkers
 
-    # ── Article-type rule ────────────────────────────────────────────────────
-    results["article_type_clause"] = _article_type_rule(text)
+    results: dict[str, bool | str] = {key: ok for key, ok, _ in evaluate(RULES, draft)}
 
     # ── Overall verdict convenience key ─────────────────────────────────────
     results["__PASS__"] = all(v is True for k, v in results.items() if not k.startswith("__"))
@@ -204,6 +215,25 @@ def validate(text: str) -> dict[str, bool | str]:
     return results
 
 
+# Same verdicts, served from the QC cache (memory + SQLite) – see src/utils/qc_cache.py
+validate_cached = CachedCheck("qc_script.validate", validate,
+                              sources=[__file__, qc_engine.__file__],
+                              dated=True)                # deadline_≤60d is relative to today
+
+
+def validate_many(texts, *, workers: int | None = None, chunk_size: int = 500,
+                  strip_html: bool = False, cache: bool = True):
+    """
+    `validate` over many bodies (Series, list or streamed chunks) across
+    worker processes → bool DataFrame, one column per rule + "__PASS__".
+    With *cache*, bodies validated before (any session) are not re-run.
+    See src/utils/qc_batch.py.
+    """
+    from src.utils.qc_batch import check_many   # pandas – batch use only
+    return check_many(validate_cached if cache else validate, texts, workers=workers,
+                      chunk_size=chunk_size, strip_html=strip_html)
+
+
 ##############################################################################
 #  🏃  CLI usage
 ##############################################################################
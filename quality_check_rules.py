@@ -1,11 +1,10 @@
 import re
 from typing import Dict, List
 
-# Optional: try importing your global spam list if defined elsewhere
-try:
-    from common import SPAM_WORDS as BASE_SPAM
-except ImportError:
-    BASE_SPAM: List[str] = []
+# Master spam list + the two lists below are compiled into one prebuilt
+# artifact by src/utils/spam_lexicon.py (re-read automatically on edit).
+from src.utils import spam_lexicon
+from src.utils.qc_engine import Draft, Rule, evaluate, facts   # shared draft facts
 
 # Additional spam/buzz terms and unsafe phrasing
 EXTRA_SPAM_WORDS: List[str] = [
@@ -41,11 +40,13 @@ REPLACEMENTS: Dict[str, str] = {
     r"\benable\b": "",
 }
 
-ALL_SPAM_WORDS = (
-    {w.lower() for w in BASE_SPAM}
-    | {w.lower() for w in EXTRA_SPAM_WORDS}
-    | {re.sub(r"\b", "", k).lower() for k in REPLACEMENTS}
-)
+_SPAM_LISTS = ("spam", "extra", "replacements")
+
+def __getattr__(name: str):
+    # ALL_SPAM_WORDS = master list ∪ EXTRA_SPAM_WORDS ∪ REPLACEMENTS keys (lazy)
+    if name == "ALL_SPAM_WORDS":
+        return frozenset(spam_lexicon.words(*_SPAM_LISTS))
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Footer lines expected at the end of every draft
 FOOTER_LINES = [
@@ -77,76 +78,71 @@ CHECKS = {
 
 # Helper to extract just the draft body
 def _extract_body(draft: str) -> str:
-    lines = draft.splitlines()
-    start = next((i for i, ln in enumerate(lines) if ln.strip().lower().startswith("dear")), 0)
-    end = next((i for i in range(len(lines) - 1, -1, -1) if "@" in lines[i]), len(lines) - 1)
-    return " ".join(lines[start : end + 1]).strip()
+    # greeting line → last line with an e-mail, joined with spaces
+    return facts(draft).body
+
+_BODY_WORD_RE = re.compile(r"\b\w+\b")
+_ARTICLE_TYPES = ["original research", "review", "case study", "editorial", "commentary"]
+_ARTICLE_TYPE_RES = [re.compile(rf"\b{re.escape(t)}\b") for t in _ARTICLE_TYPES]
+_MONTHS = "january|february|march|april|may|june|july|august|september|october|november|december"
+_FULL_DATE_RE = re.compile(rf"\b(\d{{1,2}}\s+({_MONTHS})|({_MONTHS})\s+\d{{1,2}})\s+\d{{4}}\b")
+_OPEN_ACCESS_RE = re.compile(r"\bopen\s+access\b|\bopen-access\b")
+
+def _spam_clean(d: Draft, _ctx):
+    leftover = sorted(d.body_spam.terms(*_SPAM_LISTS))
+    return not leftover, f"Leftover: {', '.join(leftover)}" if leftover else ""
+
+def _article_types(d: Draft, _ctx) -> bool:
+    # Listed types must be all of them, or the draft must say “all types”
+    found_types = [t for t, rx in zip(_ARTICLE_TYPES, _ARTICLE_TYPE_RES) if rx.search(d.body_lower)]
+    return (
+        (not found_types)                              # no mention → pass
+        or (len(found_types) == len(_ARTICLE_TYPES))   # all mentioned → pass
+        or ("all types" in d.body_lower)               # or explicitly says so
+    )
+
+def _journal_twice(d: Draft, ctx):
+    jn = ctx["sidebar"].get("journal_title", "").lower()
+    return d.body_lower.count(jn) <= 2 if jn else None
+
+def _waiver_disclaimer(d: Draft, ctx) -> bool:
+    stance = ctx["sidebar"].get("waiver_stance", "")
+    if stance.lower().startswith("❌") or stance == "❌ Minimal":
+        return "does not offer fee waiver" not in d.body_lower
+    return True                                        # always pass when waiver available
+
+# Rules, in checklist order (all read the draft *body*)
+RULES = [
+    Rule("word_count", lambda d, _: len(_BODY_WORD_RE.findall(d.body)) > 320),
+    # Spam / buzzword residue
+    Rule("spam_clean", _spam_clean),
+    # Must NOT mention “full waiver”
+    Rule("no_full_waiver", lambda d, _: "full waiver" not in d.body_lower),
+    # Must NOT mention indexing (in any form)
+    Rule("no_indexing", lambda d, _: "index" not in d.body_lower),
+    # Must NOT mention fast-track peer review (use “rigorous”)
+    Rule("review_policy", lambda d, _: "fast-track" not in d.body_lower
+                                      and "fast track" not in d.body_lower),
+    # Must NOT mention double-blind review (only single-blind is valid)
+    Rule("blind_policy", lambda d, _: "double-blind" not in d.body_lower),
+    Rule("article_type", _article_types),
+    # Deadline must contain a full date in either “31 July 2025” or “July 31 2025” style
+    Rule("full_date", lambda d, _: bool(_FULL_DATE_RE.search(d.body_lower))),
+    # “open access”/“open-access” is forbidden—only “openaccess” or “oa”
+    Rule("openaccess_format", lambda d, _: not _OPEN_ACCESS_RE.search(d.body_lower)),
+    Rule("no_placeholder", lambda d, _: "[mention recipient" not in d.body_lower),
+    Rule("journal_twice", _journal_twice),
+    # Waiver disclaimer when waiver not offered
+    Rule("no_waiver_disclaimer", _waiver_disclaimer),
+]
 
 # Main quality check function
 def run_quality_check(draft: str, sidebar_info: Dict[str, str]) -> Dict[str, object]:
     report = {"passed": True, "checklist": []}
-    body = _extract_body(draft)
-    lower = body.lower()
-
-    def mark(cond: bool, key: str, note: str = ""):
-        if cond:
+    for key, ok, note in evaluate(RULES, facts(draft), {"sidebar": sidebar_info}):
+        if ok:
             report["checklist"].append(f"✔ {CHECKS[key]}")
         else:
             report["checklist"].append(f"❌ {CHECKS[key]}{f' — {note}' if note else ''}")
             report["passed"] = False
-
-    # 1. word-count ≥ 320
-    mark(len(re.findall(r"\b\w+\b", body)) > 320, "word_count")
-
-    # 2. Spam / buzzword residue
-    leftover = sorted(w for w in ALL_SPAM_WORDS if re.search(rf"\b{re.escape(w)}\b", lower))
-    mark(not leftover, "spam_clean", f"Leftover: {', '.join(leftover)}" if leftover else "")
-
-    # 3. Must NOT mention “full waiver”
-    mark("full waiver" not in lower, "no_full_waiver")
-
-    # 4. Must NOT mention indexing (in any form)
-    mark("index" not in lower, "no_indexing")
-
-    # 5. Must NOT mention fast-track peer review (use “rigorous”)
-    mark("fast-track" not in lower and "fast track" not in lower, "review_policy")
-
-    # 6. Must NOT mention double-blind review (only single-blind is valid)
-    mark("double-blind" not in lower, "blind_policy")
-
-    # 7. If article types (review, case study, etc.) are listed the draft must also say “all types welcome”
-    article_types = ["original research", "review", "case study", "editorial", "commentary"]
-    found_types = [t for t in article_types if re.search(rf"\b{re.escape(t)}\b", lower)]
-    mark(
-        (not found_types)                         # no mention → pass
-        or (len(found_types) == len(article_types))  # all mentioned → pass
-        or ("all types" in lower),                  # or explicitly says so
-        "article_type",
-    )
-
-    # 8. Deadline must contain a full date in either “31 July 2025” or “July 31 2025” style
-    date_regex = r"\b(\d{1,2}\s+(january|february|march|april|may|june|july|august|september|october|november|december)|" \
-                 r"(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2})\s+\d{4}\b"
-    mark(re.search(date_regex, lower), "full_date")
-
-    # 9. The phrase “open access”/“open-access” is forbidden—only “openaccess” or “oa”
-    mark(not re.search(r"\bopen\s+access\b|\bopen-access\b", lower), "openaccess_format")
-
-    # 10. Placeholder check
-    mark("[mention recipient" not in lower, "no_placeholder")
-
-    # 11. Journal name frequency
-    jn = sidebar_info.get("journal_title", "").lower()
-    if jn:
-        mark(lower.count(jn) <= 2, "journal_twice")
-
-    # 12. Waiver disclaimer when waiver not offered
-    if sidebar_info.get("waiver_stance", "").lower().startswith("❌") \
-       or sidebar_info.get("waiver_stance") == "❌ Minimal":
-        mark("does not offer fee waiver" not in lower, "no_waiver_disclaimer")
-    else:
-        mark(True, "no_waiver_disclaimer")   # always pass when waiver available
-
-    return report
-
     return report
@@ -2,7 +2,7 @@ import streamlit as st
 import random
 import streamlit.components.v1 as components  # Import components
 import logging, json, textwrap, pandas as pd # NEW
-from crewai import Crew, Process, Task
+from crewai import Task
 import uuid, mysql.connector, os # Added uuid, mysql.connector, os
 from contextlib import contextmanager # Added contextmanager
 
@@ -35,29 +35,24 @@ def save_run(run_id, **cols):
     with draft_db_cursor() as cur:
         cur.execute(sql, (run_id, *vals))
 
-# ── Token length helper ────────────────────────────────────────────
-try:
-    import tiktoken
-    enc = tiktoken.get_encoding("cl100k_base")
-    def n_tokens(txt: str) -> int:
-        return len(enc.encode(txt))
-except ImportError:                                  # coarse fallback
-    def n_tokens(txt: str) -> int: return max(1, len(txt) // 4)
-
 # ── Build metrics block without breaking context limit ────────────
 def make_metrics_block(rows: list[dict],
                        headline: dict[str, str],
                        waiver_md: str,
                        token_budget_left: int,
                        max_col_len: int = 500) -> tuple[str, list[dict]]:
-    """Return (markdown_block, maybe_trimmed_rows)."""
-    keep = rows.copy()               # start with all rows
+    """Return (markdown_block, maybe_trimmed_rows).
+
+    Each row's table line is tokenized once; `pack_rows` keeps the newest
+    rows that fit and truncates long text columns (from *max_col_len*
+    down) before giving up more rows.
+    """
+    columns = list(pd.DataFrame(rows).columns)
 
     def draft_block(rws: list[dict]) -> str:
         if not rws:
             return "*No recent analytics rows found.*"
-        df = pd.DataFrame(rws)
-        table = df.to_markdown(index=False)
+        table = "\n".join([table_header(columns), *(table_line(r, columns) for r in rws)])
         latest_json = json.dumps(rws[0], indent=2, default=str)
         return f"""
 📊 **Recent metrics** ({len(rws)} emails)
@@ -80,23 +75,12 @@ Edit
 {latest_json}
 ```"""
 
-    block = draft_block(keep)
-
-    # 1) Drop rows until fits
-    while keep and n_tokens(block) > token_budget_left:
-        keep = keep[:-1]
-        block = draft_block(keep)
-
-    # 2) If still too big, truncate verbose cols
-    if keep and n_tokens(block) > token_budget_left:
-        df = pd.DataFrame(keep)
-        for col in df.columns[df.dtypes == object]:
-            df[col] = df[col].astype(str).str.slice(0, max_col_len)
-        keep = df.to_dict("records")
-        block = draft_block(keep)
-
-    return block, keep
-from langchain_core.agents import AgentFinish # Added for AgentFinish handling
+    packed = pack_rows(rows,
+                       fragment=lambda r: table_line(r, columns),
+                       frame=draft_block,
+                       budget=token_budget_left,
+                       col_limits=(None, max_col_len, max_col_len // 2, max_col_len // 5))
+    return packed.text, packed.rows
 from statistics import fmean # Added
 from db import log_prompt_output
 import time
@@ -107,8 +91,6 @@ logger = logging.getLogger("cfp_debug")
 
 # Import common utilities and agents/tasks
 from common import (
-    get_highlighted_text,
-    get_leftover_spam_words,
     calculate_core_word_count,
     extract_core_content,
     filter_agent_output,
@@ -117,9 +99,19 @@ from common import (
     fetch_cfp_templates,
     fetch_open_templates,
     recommend_waiver,
-    SPAM_WORDS
+    openrouter_llm,
 )
-from agent_draft_writer import draft_writer_agent, draft_task
+from src.utils.spam_scan import scan as scan_spam, IncrementalScanner # One lexicon pass per draft (spam / hype / hard-sell)
+from src.utils.spam_rewrite import rewrite_spam, stats as spam_rewrite_stats # Local spam replacement, LLM only for residue
+from agent_draft_writer import draft_writer_agent, draft_task, writer_prompt, WRITER_RULES, REWRITE_RULES
+from src.utils.draft_stream import DraftStream # Subjects / body of a streaming writer answer
+from src.utils.direct_agent import run_task # Single-agent task straight through its LLM (no Crew)
+from src.utils.draft_variants import adopted_state, plan_variants, rank_variants, run_variants, variant_record # N drafts at once, best first
+from src.utils.metrics_packer import pack_rows, table_header, table_line # Token-budgeted metrics rows, tokenized once
+from src.utils.email_compact import columnar, compact_examples, examples_heading # Past e-mails as compact text for the prompt
+from src.utils.tokens import n_tokens # Shared lazy, memoised token counter
+from agent_ranking import AgentRanking
+from src.utils.llm_telemetry import get_telemetry, set_run_id # Per-call tokens / latency / cost
 from agent_spam_removal import spam_removal_agent, spam_removal_task, final_output_sanitizer
 from agent_gemini_html import (
     gemini_html_agent,
@@ -143,12 +135,146 @@ LLM.provider = 'openrouter' # NEW
 # ────────────────────────────────────────────────────────────────────
 # 📌  QUALITY CHECK 2  – deterministic + AI  (after Auto-Fix)
 # ────────────────────────────────────────────────────────────────────
-from qc_script import validate as qc_det
-from qc_ai     import score    as qc_ai
+# verdicts are cached by (draft hash, rule-set version, model) – reruns and
+# new sessions never re-validate or re-bill an identical draft
+from qc_script import validate_cached as qc_det
+from qc_ai     import score_cached    as qc_ai
+from src.utils.qc_runner import run_full_qc as _run_full_qc
+
+def run_full_qc(text: str) -> dict:
+    """Deterministic + AI QC side by side; the AI call is cancelled on a rigid fail."""
+    return _run_full_qc(text, det=qc_det, ai=qc_ai)
 
 # ────────────────────────────────────────────────────────────────
-def step_generate_and_spam():
-    """Runs draft-writer ➜ initial spam removal."""
+def stream_writer(task_description: str, expected_output: str, resume_text: str = "") -> str:
+    """
+    Stream the writer's answer onto the page as it is generated.
+    The partial answer is buffered in st.session_state.draft_stream so an
+    interrupted stream can be resumed (continued from the buffer) or discarded.
+    """
+    prompt = writer_prompt(task_description, expected_output)
+    if resume_text:
+        prompt += ("\n\nYour previous answer was cut off. It is repeated below; continue "
+                   "exactly where it stops, without repeating any of it:\n\n" + resume_text)
+    st.session_state.draft_stream = {"prompt": task_description, "text": resume_text, "done": False}
+
+    view = DraftStream(resume_text)
+    box = st.empty()
+    box.markdown(view.markdown())
+    painted = time.monotonic()
+    for piece in openrouter_llm.stream(prompt):
+        view.feed(piece)
+        st.session_state.draft_stream["text"] = view.text
+        if time.monotonic() - painted > 0.05:          # repaint at most ~20×/s
+            box.markdown(view.markdown())
+            painted = time.monotonic()
+    box.markdown(view.markdown(cursor=""))
+    st.session_state.draft_stream["done"] = True
+    return view.text
+
+# Creative enhancement prompts for the rewrite step (one per draft / variant)
+CREATIVE_PROMPTS = [
+    "use a creative structure to the email, eye catching",
+    "use an appealing and creative structure that will keep the interest of the reader till the end",
+    "Craft a compelling piece with a unique structure that holds the reader's attention from start to finish.",
+    "Compose content that is eye-catching, creatively structured, and maintains momentum throughout.",
+    "Write with an inventive layout that is both aesthetically appealing and deeply engaging.",
+    "Design promotional material with an eye-grabbing layout and a storyline that holds attention."
+]
+DRAFT_EXPECTED_OUTPUT = "A polished CFP draft with 10 subject lines, structured sections, clear tone, and full signature block."
+REWRITE_EXPECTED_OUTPUT = "A rewritten version of the provided email draft, adhering to the creative enhancement prompt, maintaining original tone and data, and including the specified signature structure."
+
+def rewrite_instructions_for(creative_prompt: str, original_draft_text: str) -> str:
+    # Static rules + signature spec first (provider prefix cache), then this draft's values
+    return (
+        REWRITE_RULES
+        + f"Creative enhancement: '{creative_prompt}'.\n\n"
+        f"Signature values:\n"
+        f"    <sender name>  = {sender_name}\n"
+        f"    <journal name> = {journal_name}\n"
+        f"    <sender email> = {sender_email}\n\n"
+        f"Original Draft:\n{original_draft_text}"
+    )
+
+def sidebar_info() -> dict:
+    # Sidebar details the QC steps need later
+    return {
+        "journal_title": journal_name,
+        "short_title": journal_short_name,
+        "issn": issn,
+        "impact_factor": impact_factor,
+        "acceptance_rate": selected_journal.get("acceptance_rate", "") if selected_journal else "",
+        "total_articles": selected_journal.get("total_articles", "")  if selected_journal else "",
+        "apc_usd": selected_journal.get("apc_usd", "")               if selected_journal else "",
+        "volume": selected_journal.get("volume", "")                 if selected_journal else "",
+        "issue": selected_journal.get("issue", "")                  if selected_journal else "",
+        "tier_classification": selected_journal.get("tier_classification", "") if selected_journal else "",
+        "waiver_stance": waiver_stance,
+        "journal_path": journal_path_suffix,
+        "sender_full_name": sender_name,
+    }
+
+@st.cache_resource
+def get_agent_ranker():
+    # Campaign history for AgentRanking.rank_drafts; variants are ranked on QC alone without it
+    try:
+        return AgentRanking()
+    except Exception as e:
+        logger.warning("AgentRanking unavailable (%s) - variants ranked by QC only", e)
+        return None
+
+def adopt_variant(index: int) -> None:
+    # Make one of the generated variants the current draft (button callback)
+    # (merged draft with its subject lines, like the single-draft path)
+    st.session_state.update(adopted_state(st.session_state.draft_variants[index]))
+    st.session_state.adopted_variant = index
+    for k in ("qc_prompt", "qc_output", "qc_passed", "fix_prompt", "fix_output",
+              "qc2_report", "qc2_failed", "qc2_passed", "re_qc_done"):
+        st.session_state.pop(k, None)
+
+def step_generate_variants(task_description: str, template_content: str, templates: list, n: int):
+    """
+    N writer → creative rewrite → local spam pipelines at once, each with its own
+    template / creative prompt; every variant gets the deterministic QC and the
+    list is ranked (AgentRanking + QC share). The best one becomes the draft.
+    """
+    writer_llm = openrouter_llm.for_step("writer")
+    keep = [journal_name, journal_short_name, issn]
+
+    def produce(v):
+        # No Streamlit calls in here - runs on a worker thread
+        prompt = task_description.replace(template_content, v.template, 1)
+        raw = writer_llm.invoke(writer_prompt(prompt, DRAFT_EXPECTED_OUTPUT))
+        subjects, body = filter_agent_output(raw, include_subjects=True)
+        enhanced = writer_llm.invoke(writer_prompt(rewrite_instructions_for(v.creative_prompt, body),
+                                                   REWRITE_EXPECTED_OUTPUT))
+        _, enhanced = filter_agent_output(enhanced)
+        return subjects, rewrite_spam(enhanced.strip(), keep=keep).text
+
+    t0 = time.time()
+    with st.spinner(f"Generating {n} draft variants in parallel..."):
+        variants = plan_variants(n, templates, CREATIVE_PROMPTS)
+        run_variants(variants, produce=produce, check=qc_det)
+        ranked = rank_variants(variants, ranker=get_agent_ranker())
+    logger.info("Draft variants: %d in %.1fs (slowest %.1fs)", len(ranked), time.time() - t0,
+                max(v.seconds for v in ranked))
+
+    good = [v for v in ranked if not v.error]
+    if not good:
+        st.error("Every draft variant failed: " + "; ".join(v.error for v in ranked))
+        return
+    st.session_state.draft_variants = [variant_record(v) for v in good]
+    st.session_state.draft_prompt = task_description
+    st.session_state.sidebar_info = sidebar_info()
+    adopt_variant(0)
+    save_run(
+        st.session_state.run_id,
+        draft_prompt=st.session_state.draft_prompt,
+        draft_output=st.session_state.draft_output,
+    )
+
+def step_generate_and_spam(resume: bool = False):
+    """Runs draft-writer ➜ initial spam removal (resume=True continues a buffered stream)."""
     # --- compute waiver numbers FIRST ---------------------------------
     waiver_level   = selected_journal["waiver_stance"] if selected_journal else "❌ Minimal"
     last_waiver    = get_last_waiver_percentage(f"%{journal_short_name}%")
@@ -210,28 +336,12 @@ def step_generate_and_spam():
         # _, waiver_text = recommend_waiver(waiver_level, last_waiver) # Moved up
 
         # ========== BEGIN PATCH (replace the current DataFrame / JSON block) ==========
-        # Keep only the 3 columns we care about
-        keep_cols = ["subject", "email", "sent_date"]
-
-        trimmed_rows = [
-            {k: r.get(k) for k in keep_cols} for r in records
-        ]
-
-        df_recent = pd.DataFrame(trimmed_rows)
-
-        if not df_recent.empty:
-            recent_table = df_recent.to_markdown(index=False)
-            recent_json  = df_recent.to_json(
-                orient="records",
-                indent=2,
-                date_format="iso"
-            )
-        else:
-            recent_table = "*No recent rows found for this journal.*"
-            recent_json  = "[]"
-
-        latest_json = json.dumps(trimmed_rows[0] if trimmed_rows else {},
-                                 indent=2, default=str)
+        # subject / email / sent_date only; e-mails as structured text without the
+        # Interspire boilerplate, shared signatures kept once, columnar JSON
+        examples = compact_examples(records, journal=journal_short_name)
+        recent_json = columnar(examples.rows, examples.shared)
+        latest_json = json.dumps(examples.rows[0] if examples.rows else {},
+                                 indent=2, ensure_ascii=False, default=str)
         # ========== END PATCH =========================================================
 
         metrics_block = f"""
@@ -241,7 +351,7 @@ Last waiver offered : {last_waiver or 'N/A'} %
 Journal stance      : {waiver_level}  
 Suggested now       : {recommended_pct}% ({waiver_msg})
 
-📈 **JSON export of the same 10 rows**  
+{examples_heading(len(examples.rows))}
 ```json
 {recent_json}
 ```
@@ -260,9 +370,14 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
             logger.info("[PROMPT] waiver=%s rec_pct=%s", last_waiver, recommended_pct)
             logger.info("[PROMPT] prompt length = %s chars",
                         len(metrics_block + instructions_content))
+            st.caption(f"🗜️ Example e-mails {examples.report()}")
 
         # ─── 6. splice it into full_instructions  ────────────────────────
+        # Static rules first (provider prefix cache), per-journal data after them
         full_instructions = (
+            WRITER_RULES
+
+            + "\n\n"
             f"Generate a CFP email for the {journal_name} ({journal_short_name}) "
             f"focusing on {domain}. Highlight the journal's Impact Factor of "
             f"{impact_factor} and mention the fee waiver details. "
@@ -272,25 +387,6 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
             + instructions_content           # key-value list
 
             + metrics_block                  # contains the JSON with 10 rows
-
-            + "\n\n"                         # <── NEW directive starts here
-            "### How to use the JSON above\n"
-            "1. Parse the `JSON export of the same 10 rows` section.\n"
-            "2. Notice the **subject**, **email** body, and **sent_date** for each entry.\n"
-            "3. Infer tone, length, and structure from those examples.\n"
-            "4. Write the new CFP draft in a **similar style**, but with fresh content.\n"
-            "5. Do **not** copy the old subjects verbatim—create new ones.\n"
-            + "\n\n"
-              "### Layout requirement – side-headings - HARD RULE.\n"
-              "Structure the email with clear **side-headings** so the reader can scan quickly. "
-              "Use bold formatting for each heading and keep each section concise.\n"
-            + "\n\n### Additional hard rules\n"
-              "- Use bold **creative side-headings**.\n"
-              "- Final draft must exceed **320 words**.\n"
-              "- Never output the placeholder text "
-              "\"[mention recipient's specific research area if known, otherwise keep general]\".\n"
-              "- Mention the full journal name only once in the intro and once in the signature.\n"
-              "- If waiver_available is No, do NOT add a sentence about fee waivers.\n"
         )
 
         # Build waiver popup
@@ -314,6 +410,7 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
         # ── OPTIONAL: inspect full prompt ──────────────────────────────
         if show_full_prompt:
             with st.expander("📝 Full prompt being sent to the LLM", expanded=False):
+                st.caption(f"≈ {n_tokens(task_description, estimate=True):,} tokens")
                 st.code(task_description, language="markdown")
 
             # Offer a download
@@ -334,34 +431,40 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
 
         # ─── DEBUG guard rail ────────────────────────────────────────────
         logger.info("[DEBUG] waiver_popup len=%s", len(waiver_popup))
-        logger.info("[DEBUG] full prompt tokens=%s", n_tokens(task_description))
+        logger.info("[DEBUG] full prompt tokens=%s", total_tokens)
 
         if debug_mode:
-            st.caption(f"⚙️ Prompt tokens: {n_tokens(task_description):,}")
+            st.caption(f"⚙️ Prompt tokens: {total_tokens:,}")
             st.code(task_description[:1000] + "\n...\n", language="markdown")
 
         # Bail early if prompt is clearly empty
         if not waiver_popup.strip():
             logger.warning("No waiver popup attached.")
 
+        if n_variants > 1 and not resume:
+            step_generate_variants(task_description, template_content, templates, n_variants)
+            st.session_state.generated = True
+            return
+
         try:
             dynamic_draft_task = Task(
                 description=task_description,
                 agent=draft_writer_agent,
-                expected_output="A polished CFP draft with 10 subject lines, structured sections, clear tone, and full signature block.",
+                expected_output=DRAFT_EXPECTED_OUTPUT,
                 llm_options={"transform": "middle-out"}
             )
 
-            crew = Crew(
-                agents=[draft_writer_agent],
-                tasks=[dynamic_draft_task],
-                verbose=False,
-                process=Process.sequential
-            )
-            result = crew.kickoff()
+            if stream_draft or resume:
+                # Tokens go to the page as they arrive; partial output is kept in session state
+                pending = st.session_state.get("draft_stream") if resume else None
+                if pending:
+                    task_description = pending["prompt"]
+                raw_output = stream_writer(task_description, dynamic_draft_task.expected_output,
+                                           resume_text=pending["text"] if pending else "")
+            else:
+                raw_output = run_task(dynamic_draft_task).raw
             
             # Process initial draft output
-            raw_output = result.raw if hasattr(result, 'raw') else str(result)
             subject_lines, email_body_text = filter_agent_output(raw_output, include_subjects=True)
 
             # ▸ Join the 10 subjects under a clear header
@@ -374,7 +477,7 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
             st.session_state.draft_output = merged_draft_text.strip()
 
             # Reset downstream state whenever a new draft is generated
-            for key in ("qc_prompt", "qc_output", "fix_prompt", "fix_output"):
+            for key in ("qc_prompt", "qc_output", "fix_prompt", "fix_output", "draft_variants"):
                 st.session_state.pop(key, None)
 
             save_run(
@@ -387,75 +490,25 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
             st.session_state.subject_lines = subject_lines
             st.session_state.generated_draft = merged_draft_text.strip()
 
-            # Creative enhancement prompts
-            creative_prompts = [
-                "use a creative structure to the email, eye catching",
-                "use an appealing and creative structure that will keep the interest of the reader till the end",
-                "Craft a compelling piece with a unique structure that holds the reader's attention from start to finish.",
-                "Compose content that is eye-catching, creatively structured, and maintains momentum throughout.",
-                "Write with an inventive layout that is both aesthetically appealing and deeply engaging.",
-                "Design promotional material with an eye-grabbing layout and a storyline that holds attention."
-            ]
-
             # Randomly select one creative prompt
-            selected_creative_prompt = random.choice(creative_prompts)
+            selected_creative_prompt = random.choice(CREATIVE_PROMPTS)
 
             # Extract core content for rewriting (excluding subjects and signature)
             # Use the newly parsed email_body_text as the original_draft_text for rewriting
             original_draft_text = email_body_text
             
-            rewrite_instructions = (
-                f"Rewrite the following email draft to be more stylistically compelling, "
-                f"maintaining the original tone and data. Focus on the following creative enhancement: "
-                f"'{selected_creative_prompt}'.\n\n"
-                f"Ensure the signature at the end of the draft follows this exact structure:\n"
-                f"    Warm Regards,\n"
-                f"    {sender_name}\n"
-                f"    Editorial Office\n"
-                f"    {journal_name}\n"
-                f"    616 Corporate Way, Suite 2-6158\n"
-                f"    Valley Cottage, NY 10989\n"
-                f"    United States\n"
-                f"    Email: {sender_email}\n\n"
-                f"Original Draft:\n{original_draft_text}"
-            )
+            rewrite_instructions = rewrite_instructions_for(selected_creative_prompt, original_draft_text)
             
             # Create a temporary task for rewriting
             rewrite_task = Task(
-                description=(
-                    f"Rewrite the following email draft to be more stylistically compelling, "
-                    f"maintaining the original tone and data. Focus on the following creative enhancement: "
-                    f"'{selected_creative_prompt}'.\n\n"
-                    f"Adhere strictly to the following rules:\n"
-                    f"- Signature at the end of the draft must always follow this exact structure, ensuring each line is separated by a double newline (`\n\n`) for proper formatting:\n"
-                    f"    Warm Regards,\n\n"
-                    f"    {sender_name}\n\n"
-                    f"    Editorial Office\n\n"
-                    f"    {journal_name}\n\n"
-                    f"    616 Corporate Way, Suite 2-6158\n\n"
-                    f"    Valley Cottage, NY 10989\n\n"
-                    f"    United States\n\n"
-                    f"    Email: {sender_email}\n\n"
-                    f"Ensure all other paragraphs in the draft are also separated by double newlines (`\n\n`) for clear readability.\n\n"
-                    f"Original Draft:\n{original_draft_text}"
-                ),
+                description=rewrite_instructions,
                 agent=draft_writer_agent,
-                expected_output="A rewritten version of the provided email draft, adhering to the creative enhancement prompt, maintaining original tone and data, and including the specified signature structure.",
+                expected_output=REWRITE_EXPECTED_OUTPUT,
                 llm_options={"transform": "middle-out"}
             )
             
-            # Create a temporary crew for rewriting
-            rewrite_crew = Crew(
-                agents=[draft_writer_agent],
-                tasks=[rewrite_task],
-                verbose=False,
-                process=Process.sequential
-            )
-            
             # Removed st.spinner("Enhancing draft...")
-            # Inputs are passed via task description, so no explicit inputs needed for kickoff here
-            enhanced_result = rewrite_crew.kickoff()
-            enhanced_draft_text = enhanced_result.raw if hasattr(enhanced_result, 'raw') else str(enhanced_result)
+            enhanced_draft_text = run_task(rewrite_task).raw
             # Filter enhanced draft output to remove thoughts
             _, enhanced_draft_text = filter_agent_output(enhanced_draft_text)
 
@@ -466,43 +519,43 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
             st.session_state.replaced_spam_words = [] # New: Clear previous replaced spam words
 
             # Perform initial spam check automatically
-            # First, identify spam words in the generated draft
-            # Call get_highlighted_text for highlighting (it returns only the text)
-            # The SPAM_WORDS list is now in common.py, so it needs to be imported or passed.
-            # For now, I'll assume it's imported.
-            from common import SPAM_WORDS
-            highlighted_text_for_initial_spam_check = get_highlighted_text(enhanced_draft_text.strip(), SPAM_WORDS)
-            
-            # Then, get the leftover spam words separately
-            found_spam_words_in_draft = get_leftover_spam_words(enhanced_draft_text.strip(), SPAM_WORDS)
+            # One scan of the generated draft yields the words for the remover
+            # (hype / hard-sell hits are tagged with their category)
+            draft_spam_scan = scan_spam(enhanced_draft_text.strip())
+            found_spam_words_in_draft = draft_spam_scan.remover_terms()
             st.session_state.replaced_spam_words = found_spam_words_in_draft # Store the words that will be replaced
 
-            # Create a dynamic spam removal task
-            dynamic_spam_removal_task = Task(
-                description=(
-                    f"Refine the following draft by removing or replacing spam words. "
-                    f"Draft to refine: {enhanced_draft_text.strip()}\n"
-                    f"Spam words to replace: {', '.join(found_spam_words_in_draft)}"
-                ),
-                agent=spam_removal_agent,
-                expected_output="A cleaned version of the email draft with all specified spam words removed or replaced.",
-                llm_options={"transform": "middle-out"}
+            # Replace what we can locally (REPLACEMENTS + synonym map); journal
+            # metadata, URLs and the signature block are never touched
+            spam_rewrite = rewrite_spam(
+                enhanced_draft_text.strip(),
+                keep=[journal_name, journal_short_name, issn],
             )
 
-            spam_crew = Crew(
-                agents=[spam_removal_agent],
-                tasks=[dynamic_spam_removal_task],
-                verbose=False,
-                process=Process.sequential
-            )
+            # Create a dynamic spam removal task for the residue sentences only
+            dynamic_spam_removal_task = None
+            if spam_rewrite.needs_llm:
+                dynamic_spam_removal_task = Task(
+                    description=spam_rewrite.llm_prompt(),
+                    agent=spam_removal_agent,
+                    expected_output="One `[n] rewritten sentence` line per numbered sentence, in order, and nothing else.",
+                    llm_options={"transform": "middle-out"}
+                )
             
             with st.spinner("Performing initial spam check and replacement..."):
                 try:
-                    spam_cleaned_result = spam_crew.kickoff()
-                    # Sanitize the agent's output to ensure only the refined draft is kept
-                    # Always convert the result to a string and then sanitize it
-                    raw_output = spam_cleaned_result.return_values['output'] if isinstance(spam_cleaned_result, AgentFinish) and 'output' in spam_cleaned_result.return_values else str(spam_cleaned_result)
-                    filtered_spam_output = final_output_sanitizer(raw_output)
+                    if dynamic_spam_removal_task is not None:
+                        # Splice the rewritten residue sentences back in
+                        raw_output = run_task(dynamic_spam_removal_task).raw
+                        filtered_spam_output = spam_rewrite.merge_llm(raw_output)
+                    else:
+                        filtered_spam_output = spam_rewrite.text # every hit resolved locally - no LLM call
+                    rewrite_stats = spam_rewrite_stats()
+                    logger.info(
+                        "Spam rewrite: %d local, %d residue; LLM skipped for %d/%d drafts",
+                        len(spam_rewrite.replaced), len(spam_rewrite.residue),
+                        rewrite_stats["llm_skipped"], rewrite_stats["drafts"],
+                    )
                     st.session_state.spam_checked_output = filtered_spam_output
                     
                     # Clear any QC leftovers
@@ -513,21 +566,7 @@ Suggested now       : {recommended_pct}% ({waiver_msg})
                         st.session_state.pop(k, None)
                     
                     # Store sidebar info for later QC use
-                    st.session_state.sidebar_info = {
-                        "journal_title": journal_name,
-                        "short_title": journal_short_name,
-                        "issn": issn,
-                        "impact_factor": impact_factor,
-                        "acceptance_rate": selected_journal.get("acceptance_rate", "") if selected_journal else "",
-                        "total_articles": selected_journal.get("total_articles", "")  if selected_journal else "",
-                        "apc_usd": selected_journal.get("apc_usd", "")               if selected_journal else "",
-                        "volume": selected_journal.get("volume", "")                 if selected_journal else "",
-                        "issue": selected_journal.get("issue", "")                  if selected_journal else "",
-                        "tier_classification": selected_journal.get("tier_classification", "") if selected_journal else "",
-                        "waiver_stance": waiver_stance,
-                        "journal_path": journal_path_suffix,
-                        "sender_full_name": sender_name,
-                    }
+                    st.session_state.sidebar_info = sidebar_info()
                     
                     # NEW ↓↓↓
                     try:
@@ -585,13 +624,7 @@ def step_qc_only():
     draft_text = st.session_state.draft_output          # original draft
     sidebar    = st.session_state.sidebar_info          # built in Generate step
 
-    # unified QC routine -------------------------------------------------
-    def run_full_qc(text: str) -> dict:
-        det = qc_det(text)
-        ai  = qc_ai(text) if det["__PASS__"] else {"__PASS__": False}
-        combo = {**det, **ai}
-        combo["__PASS__"] = det["__PASS__"] and ai["__PASS__"]
-        return combo
+    # unified QC routine (det + AI concurrently) ---------------------------
     qc = run_full_qc(draft_text)
     # -------------------------------------------------------------------
 
@@ -619,17 +652,7 @@ def step_auto_fix():
         quality_checklist  = st.session_state.qc_output,
     )
 
-    autofix_crew = Crew(
-        agents=[qc_autofix_agent],
-        tasks=[autofix_task],
-        verbose=False,
-        process=Process.sequential,
-    )
-    autofix_body_raw = autofix_crew.kickoff()
-    raw_text = (
-        autofix_body_raw.output if hasattr(autofix_body_raw, "output")
-        else str(autofix_body_raw)
-    )
+    raw_text = run_task(autofix_task).raw
 
     clean_text = final_output_sanitizer(raw_text)
     fixed_text = clean_text + frozen_footer
@@ -661,14 +684,7 @@ def step_qc_after_fix():
     # ────────────────────────────────────────────────────────────────────
     # 📌  QUALITY CHECK 2  – deterministic + AI  (after Auto-Fix)
     # ────────────────────────────────────────────────────────────────────
-    def run_full_qc(text: str) -> dict:
-        det = qc_det(text)
-        ai  = qc_ai(text) if det["__PASS__"] else {"__PASS__": False}  # skip LLM if rigid fail
-        combined = {**det, **ai}                                       # merge dicts
-        combined["__PASS__"] = det["__PASS__"] and ai["__PASS__"]
-        return combined
-
-    qc2 = run_full_qc(fixed_text)   # ← run on the final Auto-Fixed draft
+    qc2 = run_full_qc(fixed_text)   # ← run on the final Auto-Fixed draft (AI cancelled on rigid fail)
 
     # Format for UI
     failed_rules = [k for k, v in qc2.items() if k not in ("__PASS__",) and v is False]
@@ -854,12 +870,16 @@ with st.sidebar:
     # ─── Debug toggle ────────────────────────────────────────────────
     debug_mode        = st.checkbox("🔍 Show debug info", value=False)
     show_full_prompt  = st.checkbox("📄 Show full prompt before send", value=False)
+    stream_draft      = st.checkbox("⚡ Stream the draft as it is written", value=True)
+    n_variants        = st.slider("🎲 Draft variants (generated in parallel, best picked)", 1, 6, 1)
 
     # ─── Sidebar debug (no metrics_block here) ───────────────
     if debug_mode:
         with st.expander("📊 Debug: recent rows"):
             if recent_records:
-                st.markdown(f"```text\n{recent_table}\n```")
+                recent_examples = compact_examples(recent_records, journal=pattern.strip("%"))
+                st.caption(f"🗜️ {recent_examples.report()}")
+                st.code(columnar(recent_examples.rows, recent_examples.shared), language="json")
             else:
                 st.write("No recent rows.")
             st.write("First non-null waiver →", last_waiver)
@@ -913,6 +933,11 @@ with st.sidebar:
 
 if 'run_id' not in st.session_state:
     st.session_state.run_id = str(uuid.uuid4())
+set_run_id(st.session_state.run_id) # LLM telemetry rows carry this run id
+
+if debug_mode:
+    with st.expander("⏱ LLM calls this run – latency / tokens / cost per step", expanded=False):
+        st.dataframe(pd.DataFrame(get_telemetry().latency_by_step(run_id=st.session_state.run_id)))
 
 if 'draft_prompt' in st.session_state:
     with st.expander("🪄 Draft-writer prompt / output", expanded=False):
@@ -931,6 +956,20 @@ if 'fix_prompt' in st.session_state:
         st.code(st.session_state.fix_prompt, language="markdown")
         st.code(st.session_state.fix_output, language="markdown")
 
+# ── N-variant mode: top drafts side by side ─────────────────────
+if st.session_state.get("draft_variants"):
+    top_k = st.session_state.draft_variants[:3]
+    st.subheader("🏆 Best draft variants")
+    for col, (i, v) in zip(st.columns(len(top_k)), enumerate(top_k)):
+        with col:
+            adopted = st.session_state.get("adopted_variant") == i
+            st.markdown(f"**#{v['rank']}**{' · in use' if adopted else ''} – score {v['score']:.2f} "
+                        f"(QC {v['qc_score']:.0%}, ranking {v['ranking_score']:.2f}, {v['seconds']:.0f}s)")
+            st.caption(v["creative_prompt"])
+            st.text_area("Variant", v["text"], height=360, key=f"variant_{i}", label_visibility="collapsed")
+            st.button("Use this draft", key=f"use_variant_{i}", disabled=adopted,
+                      on_click=adopt_variant, args=(i,))
+
 # Create two columns for side-by-side layout
 if st.session_state.subject_lines:
     st.subheader("🎯 Subject Lines")
@@ -953,8 +992,12 @@ with col1:
 with col2:
     st.subheader("Spam Highlights Preview")
     # Highlight the content from the text area for display
-    from common import SPAM_WORDS # Re-import SPAM_WORDS for this section
-    highlighted_display_text = get_highlighted_text(st.session_state.editable_draft_content, SPAM_WORDS)
+    # Per-paragraph hash -> hits memo kept across reruns; only edited paragraphs are rescanned
+    if "spam_scanner" not in st.session_state:
+        st.session_state.spam_scanner = IncrementalScanner()
+    highlighted_display_text = st.session_state.spam_scanner.scan(st.session_state.editable_draft_content).render(
+        lambda word, hit: f"<mark>{word}</mark>", escape=None
+    )
     
     # Display the highlighted content using st.markdown (read-only display)
     st.markdown(
@@ -980,8 +1023,22 @@ with btn_cols[3]:
     re_qc_clicked = st.button("✅  QC After Fix", key="btn_re_qc",
                               disabled=not st.session_state.get('fix_output'))
 
+# --- interrupted draft stream: resume or discard -----------------
+resume_clicked = False
+pending_stream = st.session_state.get("draft_stream")
+if pending_stream and not pending_stream["done"]:
+    st.info(f"⏸ An interrupted draft stream was kept ({len(pending_stream['text']):,} characters).")
+    stream_cols = st.columns(2)
+    with stream_cols[0]:
+        resume_clicked = st.button("⏯  Resume draft", key="btn_resume_stream")
+    with stream_cols[1]:
+        if st.button("🗑  Discard", key="btn_discard_stream"):
+            st.session_state.pop("draft_stream", None)
+            st.rerun()
+
 # --- call the steps *after* we know which button was pressed ----
 if gen_clicked:   step_generate_and_spam()
+if resume_clicked: step_generate_and_spam(resume=True)
 if qc_clicked:    step_qc_only()
 if fix_clicked:   step_auto_fix()
 if re_qc_clicked: step_qc_after_fix()
@@ -57,7 +57,7 @@ htmlizer_agent: Agent = Agent(
     role="HTML Formatter",
     goal="Return pure, production-ready HTML e-mail bodies.",
     backstory=HTML_SYSTEM_PROMPT,
-    llm=openrouter_llm,       # Gemini 2.5-flash routed via OpenRouter
+    llm=openrouter_llm.for_step("html"),       # Gemini 2.5-flash routed via OpenRouter
     verbose=False,
     allow_delegation=False,
 )
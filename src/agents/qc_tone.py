@@ -24,7 +24,7 @@ qc_tone_agent = Agent(
     role="Tone-coach for CFP drafts",
     goal="Label P-1, P-5, P-9 as ✔/❌ with one-line reason—no extra text.",
     backstory="You judge hook clarity, salesy tone, and benefit balance.",
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("qc"),
     verbose=False,
     allow_delegation=False,
     generation_config={"temperature": 0.0, "max_output_tokens": 256},
@@ -10,20 +10,27 @@ Crew-style agent + task builder that:
 Usage
 -----
     from agents.spam_remover import spam_removal_agent, build_remover_task
+    from utils.direct_agent import run_task
     task  = build_remover_task(draft_text, spam_hits)
-    crew  = Crew(agents=[spam_removal_agent], tasks=[task],
-                 process=Process.sequential, verbose=False)
-    result = crew.kickoff()
+    result = run_task(task)                  # utils.direct_agent – no Crew needed
 
     clean_text = strip_markers(result.raw)   # helper provided below
+
+Preferred: rewrite locally first and send only the residue sentences
+    rewrite = rewrite_spam(draft_text, keep=[journal_title, issn])
+    if rewrite.needs_llm:
+        task = build_residue_task(rewrite)
+        clean_text = rewrite.merge_llm(run_task(task).raw)
 """
 
 from __future__ import annotations
 import re
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Union
 
 from crewai import Agent, Task
 from utils.llm import openrouter_llm
+from utils.spam_scan import SpamScan
+from utils.spam_rewrite import RewriteResult
 
 # ── 1. Agent definition ───────────────────────────────────────────────── #
 spam_removal_agent = Agent(
@@ -35,7 +42,7 @@ spam_removal_agent = Agent(
     ),
     allow_delegation=False,
     verbose=False,
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("spam"),
     max_iter=2,
     generation_config={
         "stop_sequences": ["\nThought:", "\nPlan:", "\nReasoning:"],
@@ -45,7 +52,7 @@ spam_removal_agent = Agent(
 )
 
 # ── 2. Task-builder helper ────────────────────────────────────────────── #
-def build_remover_task(draft: str, spam_hits: List[str]) -> Task:
+def build_remover_task(draft: str, spam_hits: Union[List[str], SpamScan]) -> Task:
     """
     Return a CrewAI Task that instructs the agent to clean the draft.
 
@@ -54,12 +61,15 @@ def build_remover_task(draft: str, spam_hits: List[str]) -> Task:
     draft :
         The raw email draft (string).
     spam_hits :
-        List of lower-cased spam words already detected.
+        List of lower-cased spam words already detected, or the draft's
+        `SpamScan` (hype / hard-sell hits are then tagged in the prompt).
 
     Returns
     -------
-    Task – ready to pass to Crew().
+    Task – ready to pass to run_task().
     """
+    if isinstance(spam_hits, SpamScan):
+        spam_hits = spam_hits.remover_terms()
     hits_csv = ", ".join(sorted(spam_hits)) or "«none»"
 
     prompt = f"""
@@ -97,6 +107,21 @@ def build_remover_task(draft: str, spam_hits: List[str]) -> Task:
         ),
     )
 
+def build_residue_task(rewrite: RewriteResult) -> Task:
+    """
+    Task for the hits the local engine (`utils.spam_rewrite`) could not
+    resolve – only the affected sentences are sent, never the whole draft.
+    Merge the answer back with `rewrite.merge_llm(result.raw)`.
+    """
+    return Task(
+        description=rewrite.llm_prompt(),
+        agent=spam_removal_agent,
+        expected_output=(
+            "One `[n] rewritten sentence` line per numbered sentence, "
+            "in order, and NOTHING else."
+        ),
+    )
+
 # ── 3. Helper to strip bracket markers after Crew run ────────────────── #
 _DRAFT_RE = re.compile(
     r"\[BEGIN(?: REFINED)? DRAFT\](?P<body>.*?)\[END(?: REFINED)? DRAFT\]",
@@ -4,26 +4,27 @@ src/agents/writer.py
 ALL logic for the first-pass CFP draft lives here:
 
     from agents.writer import draft_writer_agent, build_writer_task
+    from utils.direct_agent import run_task
     task  = build_writer_task(
                 journal_meta = selected_journal,   # dict from DB
                 ui_inputs    = ui_dict,            # raw Streamlit fields
                 waiver_info  = waiver_dict,        # level/last/recommended/…
                 records      = recent_records,     # last 10 campaign rows
             )
-    crew  = Crew(agents=[draft_writer_agent], tasks=[task],
-                 process=Process.sequential, verbose=False)
-    result = crew.kickoff()
+    result = run_task(task)                # utils.direct_agent – no Crew needed
 
 No other prompt-assembly code is needed in the UI.
 """
 
 from __future__ import annotations
 from typing import Dict, Any, List
-import json, pandas as pd, textwrap
+import json
 
 from crewai import Agent, Task
 from utils.llm import openrouter_llm        # ← same wrapper you use elsewhere
-from utils.tokens import n_tokens           # tiny helper for token budgeting
+from utils.email_compact import (EXAMPLES_RULES, columnar, columnar_fragment, compact_examples,
+                                 examples_heading)
+from utils.metrics_packer import pack_rows     # token-budgeted rows
 
 
 # ════════════════════════════════════════════════════════════════════════
@@ -50,50 +51,72 @@ draft_writer_agent = Agent(
     ),
     allow_delegation=False,
     verbose=False,
-    llm=openrouter_llm,
+    llm=openrouter_llm.for_step("writer"),
 )
 
 
 # ════════════════════════════════════════════════════════════════════════
-# 2) Helper – build waiver / metrics block
+# 2) Static prompt prefix – identical for every draft, so the provider can
+#    serve it from its prompt-prefix cache; per-journal data goes after it
 # ════════════════════════════════════════════════════════════════════════
-def _build_metrics_block(records: List[dict],
-                         waiver_level: str,
-                         last_waiver: int | None,
-                         recommended_pct: int,
-                         waiver_msg: str,
-                         budget: int = 6_000) -> str:
-    keep_cols = ["subject", "email", "sent_date"]
-    trimmed   = [{k: r.get(k) for k in keep_cols} for r in records]
-    df        = pd.DataFrame(trimmed)
-
-    recent_json = df.to_json(orient="records", indent=2, date_format="iso") \
-                   if not df.empty else "[]"
-    latest_json = json.dumps(trimmed[0] if trimmed else {}, indent=2, default=str)
+WRITER_RULES = f"""
+**Absolute Output Restriction:**
+YOUR OUTPUT MUST BE:
+1. 10 subject lines starting with 'Subject: '
+2. The full email draft
+NO OTHER TEXT IS PERMITTED
 
-    block = textwrap.dedent(f"""
-        🧾 **Waiver Analysis**
+{EXAMPLES_RULES}
 
-        Last waiver offered : {last_waiver or 'N/A'} %
-        Journal stance      : {waiver_level}
-        Suggested now       : {recommended_pct}% ({waiver_msg})
+### Layout requirement – side-headings - HARD RULE.
+Structure the email with clear **side-headings** so the reader can scan quickly.
+Use bold formatting for each heading and keep each section concise.
 
-        📈 **JSON export of the same 10 rows**
-        ```json
-        {recent_json}
-        ```
+### Additional hard rules
+- Use bold **creative side-headings**.
+- Final draft must exceed **320 words**.
+- Never output the placeholder text "[mention recipient's specific research area if known, otherwise keep general]".
+- Mention the full journal name only once in the intro and once in the signature.
+- If waiver_available is No, do NOT add a sentence about fee waivers.
+""".strip()
 
-        📌 **Most-recent row only**
-        ```json
-        {latest_json}
-        ```
-    """).strip()
 
-    return block if n_tokens(block) < budget else "📈 Metrics omitted to fit context limit."
+# ════════════════════════════════════════════════════════════════════════
+# 3) Helper – build waiver / metrics block
+# ════════════════════════════════════════════════════════════════════════
+def _build_metrics_block(records: List[dict],
+                         waiver_level: str,
+                         last_waiver: int | None,
+                         recommended_pct: int,
+                         waiver_msg: str,
+                         budget: int = 6_000,
+                         journal: str = "") -> str:
+    # past e-mails as structured text, boilerplate gone, signatures shared
+    ex = compact_examples(records, journal=journal)
+
+    def render(rows: List[dict]) -> str:
+        latest_json = json.dumps(rows[0] if rows else {}, indent=2, ensure_ascii=False, default=str)
+        return "\n".join([
+            "🧾 **Waiver Analysis**",
+            "",
+            f"Last waiver offered : {last_waiver or 'N/A'} %",
+            f"Journal stance      : {waiver_level}",
+            f"Suggested now       : {recommended_pct}% ({waiver_msg})",
+            "",
+            examples_heading(len(rows)),
+            "```json", columnar(rows, ex.shared), "```",
+            "",
+            "📌 **Most-recent row only**",
+            "```json", latest_json, "```",
+        ])
+
+    # newest rows that fit, long bodies truncated before rows are dropped
+    packed = pack_rows(ex.rows, fragment=columnar_fragment, frame=render, budget=budget)
+    return packed.text if packed.tokens <= budget else "📈 Metrics omitted to fit context limit."
 
 
 # ════════════════════════════════════════════════════════════════════════
-# 3) Public helper – build the Task
+# 4) Public helper – build the Task
 # ════════════════════════════════════════════════════════════════════════
 def build_writer_task(*,
                       journal_meta: Dict[str, Any],
@@ -136,30 +159,13 @@ def build_writer_task(*,
 
     # ── waiver / metrics JSON block ---------------------------------------
     metrics_block = _build_metrics_block(
-        records, w["level"], w["last"], w["recommended_pct"], w["waiver_msg"]
+        records, w["level"], w["last"], w["recommended_pct"], w["waiver_msg"],
+        journal=jm["short_title"],
     )
 
-    # ── hard rules (verbatim) ---------------------------------------------
-    hard_rules = """
-    ### Layout requirement – side-headings - HARD RULE.
-    Structure the email with clear **side-headings** so the reader can scan quickly.
-    Use bold formatting for each heading and keep each section concise.
-
-    ### Additional hard rules
-    - Use bold **creative side-headings**.
-    - Final draft must exceed **320 words**.
-    - Never output the placeholder text "[mention recipient's specific research area if known, otherwise keep general]".
-    - Mention the full journal name only once in the intro and once in the signature.
-    - If waiver_available is No, do NOT add a sentence about fee waivers.
-    """.strip()
-
-    # ── final prompt -------------------------------------------------------
+    # ── final prompt: static rules first (prefix cache), journal data after
     prompt = f"""
-**Absolute Output Restriction:**
-YOUR OUTPUT MUST BE:
-1. 10 subject lines starting with 'Subject: '
-2. The full email draft
-NO OTHER TEXT IS PERMITTED
+{WRITER_RULES}
 
 Generate a complete, professional Call-for-Papers email for
 {jm['journal_title']} ({jm['short_title']}) focusing on {ui['domain']}.
@@ -169,15 +175,6 @@ Ensure all required URLs and sender details are included.
 {instr}
 
 {metrics_block}
-
-### How to use the JSON above
-1. Parse the `JSON export of the same 10 rows` section.
-2. Notice the subject, email body, and sent_date for each entry.
-3. Infer tone, length, structure from those examples.
-4. Write a new CFP draft in a **similar style**, but with fresh content.
-5. Do **not** copy the old subjects verbatim—create new ones.
-
-{hard_rules}
 """.strip()
 
     # ── CrewAI Task --------------------------------------------------------
@@ -0,0 +1,76 @@
+"""
+scripts.bench_agents
+====================
+Per-step orchestration overhead: `Crew(...).kickoff()` vs
+`utils.direct_agent.run_task` for the same single-agent task.
+
+The LLM is the record/replay stand-in (`LLM_REPLAY=replay`, zero
+latency, nearest fixture on a miss, response cache off), so what is
+left of the wall time is our own code plus CrewAI's: crew / executor
+setup, prompt assembly, output parsing.  Record a few fixtures first
+(`LLM_REPLAY=record`, any online run).
+
+    python -m scripts.bench_agents [-n 20]      # from src/
+"""
+
+from __future__ import annotations
+import argparse, os, statistics, sys, time
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parents[1]
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+SAMPLE = ("Subject: Call for Papers – IJAR\n\nDear Researcher,\n\nWe invite original "
+          "research articles for the upcoming issue. Submissions are reviewed within "
+          "three weeks.\n\nWarm Regards,\nEditorial Office")
+
+
+def _timed(fn, n: int) -> list:
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("-n", "--repeat", type=int, default=20, help="runs per step and path")
+    args = ap.parse_args(argv)
+
+    os.environ.update({"LLM_REPLAY": "replay", "LLM_REPLAY_LATENCY_MS": "0",
+                       "LLM_REPLAY_ON_MISS": "nearest", "LLM_CACHE_PATH": "off"})
+    os.environ.setdefault("OPENROUTER_API_KEY", "replay")
+
+    from crewai import Crew, Process
+    from agents.htmlizer import build_html_task
+    from agents.qc_tone import build_tone_task
+    from agents.spam_remover import build_remover_task
+    from utils.direct_agent import run_task
+    from utils.llm_replay import get_replay
+
+    if not any(get_replay().store.glob("*.json")):
+        sys.exit(f"no fixtures in {get_replay().store} – record some first")
+
+    steps = {
+        "spam":  lambda: build_remover_task(SAMPLE, ["invite"]),
+        "qc":    lambda: build_tone_task(SAMPLE),
+        "html":  lambda: build_html_task(SAMPLE),
+    }
+    print(f"{'step':<8}{'crew ms':>12}{'direct ms':>12}{'saved ms':>12}")
+    for step, build in steps.items():
+        def kickoff():
+            task = build()
+            return Crew(agents=[task.agent], tasks=[task],
+                        process=Process.sequential, verbose=False).kickoff()
+
+        crew = _timed(kickoff, args.repeat)
+        direct = _timed(lambda: run_task(build()), args.repeat)
+        c, d = statistics.median(crew), statistics.median(direct)
+        print(f"{step:<8}{c:>12.1f}{d:>12.1f}{c - d:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
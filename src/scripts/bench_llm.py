@@ -0,0 +1,78 @@
+"""
+scripts.bench_llm
+=================
+Offline throughput / latency of the LLM layer (wrapper → pool → router →
+telemetry) on recorded traffic.
+
+Every fixture in the replay store (`LLM_REPLAY=record` once, online) is
+sent again through `utils.llm.OpenRouterLLM` in replay mode – no network,
+response cache off – `-c` prompts per `generate` call, so the numbers
+move only with our own code and the synthetic timing knobs.
+
+    python -m scripts.bench_llm [-c 8] [-r 3] [--latency-ms 800] [--tps 60]   # from src/
+"""
+
+from __future__ import annotations
+import argparse, json, os, sys, time, uuid
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parents[1]
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--store", help="fixture directory (default: LLM_REPLAY_DIR / llm_fixtures)")
+    ap.add_argument("-c", "--concurrency", type=int, default=8, help="prompts per generate() call")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="passes over the store")
+    ap.add_argument("--latency-ms", type=float, help="synthetic time to first token")
+    ap.add_argument("--tps", type=float, help="synthetic completion tokens per second")
+    args = ap.parse_args(argv)
+
+    os.environ["LLM_REPLAY"] = "replay"
+    os.environ["LLM_CACHE_PATH"] = "off"
+    os.environ.setdefault("OPENROUTER_API_KEY", "replay")
+    for var, value in (("LLM_REPLAY_DIR", args.store), ("LLM_REPLAY_LATENCY_MS", args.latency_ms),
+                       ("LLM_REPLAY_TOKENS_PER_S", args.tps)):
+        if value is not None:
+            os.environ[var] = str(value)
+
+    from utils.llm import OpenRouterLLM
+    from utils.llm_replay import get_replay
+    from utils.llm_telemetry import get_telemetry, run_context
+
+    fixtures = [json.loads(p.read_text(encoding="utf-8"))
+                for p in sorted(get_replay().store.glob("*.json"))]
+    fixtures = [f for f in fixtures
+                if len(f.get("messages") or []) == 1 and f["messages"][0]["role"] == "user"]
+    if not fixtures:
+        sys.exit(f"no single-prompt fixtures in {get_replay().store} – record some first")
+
+    by_model = {}
+    for f in fixtures:
+        by_model.setdefault((f["model"], f.get("temperature")), []).append(f["messages"][0]["content"])
+
+    run_id = f"bench-{uuid.uuid4().hex[:8]}"
+    n_calls, t0 = 0, time.perf_counter()
+    with run_context(run_id):
+        for _ in range(args.repeat):
+            for (model, temperature), prompts in by_model.items():
+                llm = OpenRouterLLM(model=model, response_cache=False,
+                                    temperature=0.7 if temperature is None else temperature)
+                llm = llm.for_step("bench")
+                for i in range(0, len(prompts), args.concurrency):
+                    batch = prompts[i:i + args.concurrency]
+                    llm.generate(batch)
+                    n_calls += len(batch)
+    wall = time.perf_counter() - t0
+
+    print(f"{n_calls} calls over {len(fixtures)} fixtures in {wall:.2f}s "
+          f"→ {n_calls / wall:.1f} calls/s (concurrency {args.concurrency})")
+    for row in get_telemetry().latency_by_step(run_id=run_id):
+        print(f"  {row['step']:<10} p50 {row['p50_ms']:8.1f} ms   p95 {row['p95_ms']:8.1f} ms   "
+              f"tokens {row['prompt_tokens']:,} in / {row['completion_tokens']:,} out")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,14 +14,20 @@ follow-up AI pass.  `run_qc()` therefore returns:
         "checklist": list[str],       # human-readable ✔ / ❌ lines
         "need_ai": ["P-1", "P-5", …]  # pillars that require AI review
     }
+
+`run_qc_many()` runs the same rules over a batch (bool DataFrame).
 """
 
 from __future__ import annotations
 import re, datetime
-from typing import List, Dict
+from functools import partial
+from typing import List, Dict, Optional
 from urllib.parse import urlparse
 
-from utils.spam_words import SPAM_WORDS        # master list
+from utils import qc_engine
+from utils.qc_cache import CachedCheck
+from utils.qc_engine import Draft, Rule, evaluate, facts
+from utils.spam_scan import ALLOWED_SPAM_EXCEPTIONS, SpamScan, scan     # one lexicon pass per draft
 
 # ---------------------------- helpers --------------------------------- #
 _DATE_RE = re.compile(
@@ -31,12 +37,6 @@ _DATE_RE = re.compile(
 ART_TYPES = {"review", "case study", "case report", "original article",
              "short communication", "editorial"}
 
-HYPE_WORDS = {
-    "groundbreaking", "revolutionary", "spectacular", "incredible",
-    "unbeatable", "seize", "amazing", "once-in-a-lifetime",
-    "bargain", "massive discount", "unrivalled",
-}
-
 FEE_PHRASES = [
     "full waiver", "complete waiver", "no apc", "zero apc",
     "free of charge", "waived fee", "entire waiver",
@@ -57,129 +57,144 @@ OPEN_ACCESS_NEG = re.compile(r"\bopen[- ]access\b", re.I)
 EMAIL_RE = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.I)
 URL_RE   = re.compile(r"https?://\S+", re.I)
 
-ALLOWED_SPAM_EXCEPTIONS = {"deadline", "submission"}   # ≈ “harmless” tokens
 
+_WORD_RE     = re.compile(r"[A-Za-z']+")
+_METRIC_RE   = re.compile(r"\b\d+(\.\d+)?\b")
+_DEADLINE_KW = re.compile(r"(deadline|last date)")      # on folded text
+_CRED_PATH   = re.compile(r"/(about|editorial-board|current-issue)")
+_CLOSE_RE    = re.compile(r"(happy (?:to|for).*assist|available for any questions)")
 
-def _words(text: str) -> List[str]:
-    return re.findall(r"[A-Za-z']+", text)
 
+def _sample(terms, n: int = 5) -> str:
+    terms = sorted(terms)
+    return ", ".join(terms[:n]) + (" …" if len(terms) > n else "")
 
-# -------------------------- check engine ------------------------------ #
-def run_qc(text: str, *, submit_url: str) -> Dict[str, object]:
-    body_words = _words(text)
-    word_count = len(body_words)
 
+# --------------------------- draft facts ------------------------------ #
+def _word_count(d: Draft) -> int:
+    return len(d.words(_WORD_RE))
+
+
+def _types_ok(d: Draft) -> bool:
+    """Article types listed ⇒ 'all types welcome' present."""
+    types_listed = any(t in d.lower for t in ART_TYPES)
+    return (not types_listed) or "all types welcome" in d.lower
+
+
+def _deadline(d: Draft):
+    """(within 60 days?, message, keyword present?) for the first full date."""
+    date_match = d.search(_DATE_RE)
+    if not date_match:
+        return False, "no full date", False
+    for fmt in ("%d %B %Y", "%B %d %Y"):
+        try:
+            dt = datetime.datetime.strptime(date_match.group(0), fmt)
+            break
+        except ValueError:
+            continue
+    else:                                # “10 Sessions 2025” – not a date
+        return False, "no full date", False
+    days = (dt.date() - datetime.date.today()).days
+    return 0 < days <= 60, f"{days} d ahead", bool(d.search(_DEADLINE_KW, folded=True))
+
+
+def _urls(d: Draft) -> List[str]:
+    return list({u.rstrip('.,)') for u in d.urls})
+
+
+# ------------------------------ rules --------------------------------- #
+def _spam_density(d: Draft, ctx):
+    spam_hits = [h for h in ctx["spam"].spans("spam")
+                 if h.term not in ALLOWED_SPAM_EXCEPTIONS]
+    word_count = d.memo(_word_count)
+    return (len(spam_hits) <= 0.02 * word_count,
+            f"{len(spam_hits)} hits / {word_count} words "
+            f"({_sample({h.term for h in spam_hits})})")
+
+
+def _evidence(d: Draft, ctx):
+    hype_hits = ctx["spam"].terms("hype")
+    metrics = d.findall(_METRIC_RE)
+    return ((len(metrics) >= 1) and (len(hype_hits) <= 3),
+            f"hype={len(hype_hits)} metrics={len(metrics)}"
+            + (f" ({_sample(hype_hits)})" if hype_hits else ""))
+
+
+def _single_cta(d: Draft, _ctx):
+    urls, emails = d.memo(_urls), d.emails
+    return ((len(urls) == 1) and (len(emails) == 1),
+            f"urls={len(urls)} emails={len(emails)}")
+
+
+def _cred_links(d: Draft, ctx):
+    root = urlparse(ctx["submit_url"]).netloc
+    cred_links = [u for u in d.memo(_urls) if urlparse(u).netloc == root and
+                  _CRED_PATH.search(u)]
+    return len(cred_links) == 2, f"found={len(cred_links)}"
+
+
+def _rapport_close(d: Draft, _ctx):
+    close_hit = _CLOSE_RE.search(d.lower)
+    # ensure hit appears before signature
+    sig_idx = d.lower.find("warm regards")
+    ok = bool(close_hit) and (close_hit.start() < sig_idx if sig_idx != -1 else True)
+    return ok, "closing line missing"
+
+
+RULES = [
+    Rule("C-1 word-count",
+         lambda d, _: (d.memo(_word_count) > 320, f"{d.memo(_word_count)} words")),
+    Rule("C-2 spam density", _spam_density),
+    Rule("C-3 waiver promise",
+         lambda d, _: (not any(p in d.lower for p in FEE_PHRASES), "fee waiver phrase found")),
+    Rule("C-4 indexing claim",
+         lambda d, _: (not any(p in d.lower for p in INDEX_PHRASES), "indexing phrase found")),
+    Rule("C-5 fast review",
+         lambda d, _: (not any(p in d.lower for p in FAST_PHRASES), "fast-review phrase found")),
+    Rule("C-6 double-blind",
+         lambda d, _: ("double-blind" not in d.lower, "double-blind mentioned")),
+    Rule("C-7 article-types phrase",
+         lambda d, _: (d.memo(_types_ok), "types listed without “all types welcome”")),
+    Rule("C-8 full deadline",
+         lambda d, _: (d.memo(_deadline)[0] and d.memo(_deadline)[2], d.memo(_deadline)[1])),
+    Rule("C-9 openaccess spelling",
+         lambda d, _: (not d.search(OPEN_ACCESS_NEG), "open access/open-access found")),
+    Rule("P-2 evidence over adjectives", _evidence),
+    # (script-only part: ensure 'all types welcome' when article types present)
+    Rule("P-3 topic-centric",
+         lambda d, _: (d.memo(_types_ok), "needs phrase 'all types welcome'")),
+    Rule("P-4 single CTA + email", _single_cta),
+    # near-term deadline already in C-8 – re-use the date check result
+    Rule("P-6 deadline ≤ 60 d",
+         lambda d, _: (d.memo(_deadline)[0], d.memo(_deadline)[1])),
+    Rule("P-7 credibility links", _cred_links),
+    Rule("P-10 soft rapport close", _rapport_close),
+]
+
+
+# -------------------------- check engine ------------------------------ #
+def _verdicts(text: str, submit_url: str, spam_scan: Optional[SpamScan]):
+    sc = spam_scan or scan(text).without(ALLOWED_SPAM_EXCEPTIONS)
+    return evaluate(RULES, facts(text), {"submit_url": submit_url, "spam": sc})
+
+
+def run_qc(text: str, *, submit_url: str,
+           spam_scan: Optional[SpamScan] = None) -> Dict[str, object]:
+    """
+    Run every scriptable rule.  *spam_scan* may be passed in when the caller
+    already scanned `text` (see `utils.spam_scan`); otherwise the shared
+    per-draft scan is narrowed to the allowed exceptions.
+    """
     checklist: List[str] = []
     fails = 0
     need_ai = []                         # P-1, P-5, P-9
 
-    def check(tag: str, ok: bool, reason: str = ""):
-        nonlocal fails
+    for tag, ok, reason in _verdicts(text, submit_url, spam_scan):
         mark = "✔" if ok else "❌"
         checklist.append(f"{mark} {tag}{'' if ok else ' — ' + reason}")
         if not ok:
             fails += 1
 
-    # ---------- C-1  word-count --------------------------------------- #
-    check("C-1 word-count", word_count > 320,
-          f"{word_count} words")
-
-    # ---------- C-2  spam density < 2 % ------------------------------- #
-    spam_hits = [w for w in body_words
-                 if w.lower() in SPAM_WORDS
-                 and w.lower() not in ALLOWED_SPAM_EXCEPTIONS]
-    ok = len(spam_hits) <= 0.02 * word_count
-    check("C-2 spam density", ok,
-          f"{len(spam_hits)} hits / {word_count} words")
-
-    # ---------- C-3 waiver promises ----------------------------------- #
-    waiver_hit = any(p in text.lower() for p in FEE_PHRASES)
-    check("C-3 waiver promise", not waiver_hit, "fee waiver phrase found")
-
-    # ---------- C-4 indexing claims ----------------------------------- #
-    idx_hit = any(p in text.lower() for p in INDEX_PHRASES)
-    check("C-4 indexing claim", not idx_hit, "indexing phrase found")
-
-    # ---------- C-5 fast review promises ------------------------------ #
-    fast_hit = any(p in text.lower() for p in FAST_PHRASES)
-    check("C-5 fast review", not fast_hit, "fast-review phrase found")
-
-    # ---------- C-6 double-blind mention ------------------------------ #
-    db_hit = "double-blind" in text.lower()
-    check("C-6 double-blind", not db_hit, "double-blind mentioned")
-
-    # ---------- C-7 article types → must say 'all types welcome' ------ #
-    types_listed = any(t in text.lower() for t in ART_TYPES)
-    all_types = "all types welcome" in text.lower()
-    ok = (not types_listed) or all_types
-    reason = "types listed without “all types welcome”" if not ok else ""
-    check("C-7 article-types phrase", ok, reason)
-
-    # ---------- C-8 concrete deadline line ---------------------------- #
-    date_match = _DATE_RE.search(text)
-    deadline_ok = False
-    delta_msg = "no full date"
-    if date_match:
-        try:
-            dt = datetime.datetime.strptime(
-                date_match.group(0), "%d %B %Y"
-            )
-        except ValueError:
-            dt = datetime.datetime.strptime(
-                date_match.group(0), "%B %d %Y"
-            )
-        days = (dt.date() - datetime.date.today()).days
-        deadline_ok = 0 < days <= 60
-        delta_msg = f"{days} d ahead"
-    kw_hit = re.search(r"(deadline|last date)", date_match.string, re.I) if date_match else None
-    ok = deadline_ok and kw_hit
-    check("C-8 full deadline", ok, delta_msg)
-
-    # ---------- C-9 open-access spelling ------------------------------ #
-    check("C-9 openaccess spelling",
-          not OPEN_ACCESS_NEG.search(text), "open access/open-access found")
-
-    # ----------------- P-2 evidence over adjectives ------------------- #
-    hype_hits = [w for w in HYPE_WORDS if w in text.lower()]
-    metrics   = re.findall(r"\b\d+(\.\d+)?\b", text)
-    ok = (len(metrics) >= 1) and (len(hype_hits) <= 3)
-    check("P-2 evidence over adjectives", ok,
-          f"hype={len(hype_hits)} metrics={len(metrics)}")
-
-    # ----------------- P-3 topic-centric list ------------------------- #
-    # (script-only part: ensure 'all types welcome' when article types present)
-    check("P-3 topic-centric", ok := (not types_listed or all_types),
-          "needs phrase 'all types welcome'" if not ok else "")
-
-    # ----------------- P-4 single CTA (+ 1 email) --------------------- #
-    urls = list({u.rstrip('.,)') for u in URL_RE.findall(text)})
-    emails = EMAIL_RE.findall(text)
-    ok = (len(urls) == 1) and (len(emails) == 1)
-    check("P-4 single CTA + email", ok,
-          f"urls={len(urls)} emails={len(emails)}")
-
-    # ----------------- P-6 near-term deadline already in C-8 ---------- #
-    # Here we just re-use the date check result.
-    check("P-6 deadline ≤ 60 d", deadline_ok, delta_msg)
-
-    # ----------------- P-7 exactly two credibility links -------------- #
-    root = urlparse(submit_url).netloc
-    cred_links = [u for u in urls if urlparse(u).netloc == root and
-                  re.search(r"/(about|editorial-board|current-issue)", u)]
-    ok = len(cred_links) == 2
-    check("P-7 credibility links", ok,
-          f"found={len(cred_links)}")
-
-    # ----------------- P-10 soft rapport close ------------------------ #
-    close_hit = re.search(
-        r"(happy (?:to|for).*assist|available for any questions)",
-        text.lower()
-    )
-    # ensure hit appears before signature
-    sig_idx = text.lower().find("warm regards")
-    ok = bool(close_hit) and (close_hit.start() < sig_idx if sig_idx != -1 else True)
-    check("P-10 soft rapport close", ok, "closing line missing")
-
     # ----------------- AI-needed pillars ------------------------------ #
     need_ai.extend([p for p in ("P-1", "P-5", "P-9")
                     if p not in (line.split()[1] for line in checklist)])
@@ -189,3 +204,29 @@ def run_qc(text: str, *, submit_url: str) -> Dict[str, object]:
         "checklist": checklist,
         "need_ai": need_ai,
     }
+
+
+def _qc_row(text: str, submit_url: str) -> Dict[str, bool]:
+    row = {tag: ok for tag, ok, _ in _verdicts(text, submit_url, None)}
+    row["passed"] = all(row.values())
+    return row
+
+
+_qc_row_cached = CachedCheck("qc_rules.run_qc", _qc_row,
+                             sources=[__file__, qc_engine.__file__],
+                             key_args=("submit_url",),
+                             dated=True)                 # C-8 / P-6 compare against today
+
+
+def run_qc_many(texts, *, submit_url: str = "", workers: Optional[int] = None,
+                chunk_size: int = 500, strip_html: bool = False, cache: bool = True):
+    """
+    `run_qc` over many bodies (Series, list or streamed chunks) across
+    worker processes → bool DataFrame, one column per rule tag + "passed".
+    With *cache*, verdicts come from `utils.qc_cache` when known.
+    See `utils.qc_batch.check_many`.
+    """
+    from utils.qc_batch import check_many        # pandas – batch use only
+    row = _qc_row_cached if cache else _qc_row
+    return check_many(partial(row, submit_url=submit_url), texts,
+                      workers=workers, chunk_size=chunk_size, strip_html=strip_html)
@@ -12,6 +12,13 @@ highlight_spam(text, css_class="spam", exceptions=None) -> str
     Return HTML string where each spam hit is wrapped in
     <span class="{css_class}">…</span>  (for Streamlit preview).
 
+find_spam_many(texts, ...) -> SpamBatch
+    Bulk variant for whole corpora (multi-process, sparse hit matrix);
+    re-exported from `utils.spam_batch`.
+
+The first two are thin views over `utils.spam_scan.scan()` – call `scan()`
+directly when you need hits, highlight *and* the remover list for one draft.
+
 Usage example
 -------------
 >>> from scripts.spam_check import find_spam
@@ -21,11 +28,11 @@ Usage example
 """
 
 from __future__ import annotations
-import html
-import re
-from typing import Iterable, List, Set
+from typing import Iterable, Set
+
+from utils.spam_scan import scan          # one memoised pass per draft
+from utils.spam_batch import SpamBatch, find_spam_many   # bulk / analysis
 
-from utils.spam_words import SPAM_WORDS  # master list (lower-case!)
 
 # -------------------------------------------------------------------- #
 # Public API                                                           #
@@ -49,17 +56,9 @@ def find_spam(
     -----
     • Word boundaries ⇒ only whole-word matches (case-insensitive).  
     • Punctuation is ignored (`research!` still matches “research”).
+    • One pass over the text via `utils.spam_scan` – no per-word regex.
     """
-    exc = {w.lower() for w in (exceptions or [])}
-
-    hits: Set[str] = set()
-    for w in SPAM_WORDS:
-        if w in exc:
-            continue
-        # compile once per word keeps it readable; list is static anyway
-        if re.search(rf"\b{re.escape(w)}\b", text, flags=re.IGNORECASE):
-            hits.add(w)
-    return hits
+    return scan(text, exceptions=exceptions).terms("spam")
 
 
 def highlight_spam(
@@ -75,19 +74,8 @@ def highlight_spam(
     -------
     >>> st.markdown(highlight_spam(draft), unsafe_allow_html=True)
     """
-    def repl(match: re.Match) -> str:
-        word = match.group(0)
-        if word.lower() in exc:
-            return word  # don’t highlight exceptions
-        return f'<span class="{css_class}">{html.escape(word)}</span>'
-
-    exc = {w.lower() for w in (exceptions or [])}
-    # Build one big regex that OR-joins every spam word
-    spam_regex = re.compile(
-        r"\b(" + "|".join(re.escape(w) for w in SPAM_WORDS if w not in exc) + r")\b",
-        flags=re.IGNORECASE,
-    )
-    return spam_regex.sub(repl, html.escape(text))
+    return scan(text, exceptions=exceptions).render(
+        lambda frag, hit: f'<span class="{css_class}">{frag}</span>', "spam")
 
 
 # -------------------------------------------------------------------- #
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils.direct_agent import run_task, task_prompt
+from utils.helpers import as_text
+
+
+class _LLM:
+    def __init__(self, answer):
+        self.answer, self.prompts = answer, []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return self.answer
+
+
+def _agent(llm, **kw):
+    return SimpleNamespace(role="HTML converter", backstory="You write e-mail HTML.",
+                           goal="Valid HTML.", llm=llm, allow_delegation=True, **kw)
+
+
+def test_single_task_goes_straight_to_the_agents_llm(tmp_path):
+    llm = _LLM("Thought: I now can give a great answer\nFinal Answer: {\"score\": 7}")
+    agent = _agent(llm)
+    task = SimpleNamespace(description="Score this e-mail.", expected_output="JSON",
+                           agent=agent, output_file=str(tmp_path / "out.txt"))
+
+    result = run_task(task)
+    assert result.raw == as_text(result) == str(result) == '{"score": 7}'
+    assert result.json_dict == {"score": 7}
+    assert llm.prompts == [task_prompt(agent, "Score this e-mail.", "JSON")]
+    assert "You are HTML converter" in llm.prompts[0]
+    assert (tmp_path / "out.txt").read_text(encoding="utf-8") == '{"score": 7}'
+
+    plain = run_task(SimpleNamespace(description="d", expected_output="e", agent=_agent(_LLM("<p>hi</p>"))))
+    assert plain.raw == "<p>hi</p>" and plain.json_dict is None
+
+
+def test_agents_with_tools_stay_in_a_crew():
+    task = SimpleNamespace(description="d", expected_output="e",
+                           agent=_agent(_LLM("x"), tools=[object()]))
+    with pytest.raises(ValueError, match="Crew"):
+        run_task(task)
@@ -0,0 +1,27 @@
+from utils.draft_stream import DraftStream
+
+ANSWER = ("Subject: Call for Papers – IJAR 2025\nSubject: Publish your next study\n\n"
+          "Dear Dr. Smith,\n\nThe International Journal of Applied Research invites …\n"
+          "Warm Regards,\nJane Doe")
+
+
+def test_any_split_gives_the_same_view():
+    whole = DraftStream(ANSWER)
+    assert whole.subjects == ["Call for Papers – IJAR 2025", "Publish your next study"]
+    assert whole.body.startswith("Dear Dr. Smith,") and whole.body.endswith("Jane Doe")
+    for size in (1, 3, 7, 50):
+        view = DraftStream()
+        for i in range(0, len(ANSWER), size):
+            view.feed(ANSWER[i:i + size])
+        assert (view.text, view.subjects, view.body) == (ANSWER, whole.subjects, whole.body)
+
+
+def test_partial_subject_line_is_not_shown_as_body():
+    view = DraftStream("Subject: Call for Papers\nSubj")
+    assert view.pending_subject and view.body == ""
+    view.feed("ect: Publish")
+    assert view.subjects == ["Call for Papers"]
+    assert "2. Publish ▌" in view.markdown()
+    view.feed("\nDear")
+    assert not view.pending_subject and view.body == "Dear"
+    assert DraftStream(view.text).subjects == view.subjects        # resume from buffer
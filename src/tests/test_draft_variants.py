@@ -0,0 +1,52 @@
+import random
+import threading
+import time
+
+from utils.draft_variants import (Variant, adopted_state, plan_variants, qc_fraction, rank_variants,
+                                  run_variants, variant_record)
+
+
+class _Ranker:                                   # AgentRanking.rank_drafts shape
+    def rank_drafts(self, drafts):
+        scored = [{"draft_id": i, "ranking_score": d["Subject"].count("Impact")}
+                  for i, d in enumerate(drafts)]
+        return sorted(scored, key=lambda d: d["ranking_score"], reverse=True)
+
+
+def test_plan_spreads_templates_and_prompts():
+    variants = plan_variants(4, ["t1", "t2"], ["c1", "c2", "c3", "c4", "c5"], rng=random.Random(1))
+    assert len(variants) == 4
+    assert len({v.creative_prompt for v in variants}) == 4
+    assert {v.template for v in variants[:2]} == {"t1", "t2"}
+    assert len(plan_variants(50, ["t"], ["c"])) == 6
+
+
+def test_variants_run_concurrently_and_rank_best_first():
+    barrier = threading.Barrier(3, timeout=2)     # all three must be in flight together
+
+    def produce(v):
+        barrier.wait()
+        if v.index == 2:
+            raise RuntimeError("provider down")
+        return [f"Subject: {'Impact ' * v.index}call"], f"body {v.index}"
+
+    check = lambda text: {"a": True, "b": "body 0" in text, "__PASS__": False}
+    variants = plan_variants(3, ["t"], ["c1", "c2", "c3"])
+    t0 = time.monotonic()
+    run_variants(variants, produce=produce, check=check)
+    assert time.monotonic() - t0 < 1
+
+    ranked = rank_variants(variants, ranker=_Ranker())
+    assert [v.index for v in ranked] == [1, 0, 2]       # ranking 1.0 + QC ½ beats QC 1
+    assert ranked[0].score == 0.75 and ranked[1].score == 0.5
+    assert ranked[-1].error.startswith("RuntimeError") and ranked[-1].rank == 3
+    assert qc_fraction({"a": True, "b": False, "__PASS__": False}) == 0.5
+
+
+def test_adopted_variant_keeps_its_subject_lines():
+    v = Variant(0, "t", "c", subjects=["CFP: Impact", "Publish with us"], body="Dear Dr. Roe,\n\nBody.\n")
+    state = adopted_state(variant_record(v))
+    assert state["generated_draft"] == state["draft_output"] == (
+        "Subject Lines:\nCFP: Impact\nPublish with us\n\nDear Dr. Roe,\n\nBody.")
+    assert state["subject_lines"] == v.subjects
+    assert state["editable_draft_content"] == state["spam_checked_output"] == "Dear Dr. Roe,\n\nBody."
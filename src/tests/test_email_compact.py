@@ -0,0 +1,69 @@
+import datetime
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+from utils.email_compact import (EXAMPLES_RULES, UNSUBSCRIBE_SUFFIX, WEBVERSION_PREFIX, columnar,
+                                 compact_examples, examples_heading, html_to_text,
+                                 savings_by_journal)
+
+SIGNATURE = ("<p>Warm Regards,<br>Dr. Jane Smith<br>Editorial Office<br>"
+             "International Journal of Nursing</p>")
+
+
+def _row(i):
+    body = (f"<html><head><style>p {{ color: red }}</style></head><body>{WEBVERSION_PREFIX}"
+            f"<p>We invite <b>original</b> papers, issue {i}.</p>"
+            "<ul><li>Fast review</li><li>Open access</li></ul>"
+            f"{SIGNATURE}<p>{UNSUBSCRIBE_SUFFIX}</p></body></html>")
+    return {"subject": f"Call for Papers {i}", "email": body,
+            "sent_date": datetime.datetime(2025, 1, i + 1), "campaign_name": "IJN"}
+
+
+def test_html_becomes_structured_text():
+    text = html_to_text("<h2>Scope</h2><p>Hi <strong>there</strong> &amp; all</p>"
+                        "<ul><li>a</li><li>b</li></ul><script>x()</script>")
+    assert text == "## Scope\n\nHi **there** & all\n\n- a\n- b"
+    assert html_to_text("plain   text\n\n\n\nstays") == "plain text\n\nstays"
+
+
+def test_boilerplate_goes_and_signatures_are_shared():
+    ex = compact_examples([_row(i) for i in range(3)], journal="IJN")
+    first = ex.rows[0]
+    assert list(first) == ["subject", "email", "sent_date"]
+    assert first["email"] == "We invite **original** papers, issue 0.\n\n- Fast review\n- Open access\n\n[S1]"
+    assert ex.shared == {"S1": "Warm Regards,\nDr. Jane Smith\nEditorial Office\nInternational Journal of Nursing"}
+    assert "%%" not in columnar(ex.rows, ex.shared)
+
+    data = json.loads(columnar(ex.rows, ex.shared))
+    assert data["subject"] == ["Call for Papers 0", "Call for Papers 1", "Call for Papers 2"]
+    assert data["sent_date"][0] == "2025-01-01T00:00:00" and "S1" in data["shared"]
+    assert "shared" not in json.loads(columnar([{"email": "no refs"}], ex.shared))
+
+    assert 0 < ex.tokens_after < ex.tokens_before / 2
+    assert savings_by_journal()["IJN"] == (ex.tokens_before, ex.tokens_after)
+    assert ex.report().startswith("IJN: 3 examples")
+
+
+def test_one_off_paragraphs_stay_inline():
+    ex = compact_examples([_row(0)])
+    assert ex.shared == {} and "Warm Regards" in ex.rows[0]["email"]
+
+
+def test_writer_rules_point_at_the_emitted_section():
+    section = re.search(r"Parse the `(.+?)` section", EXAMPLES_RULES).group(1)
+    assert f"**{section}**" in examples_heading(10)
+    assert "[S1]" in EXAMPLES_RULES and "`shared`" in EXAMPLES_RULES
+
+
+def test_both_writer_prompts_carry_the_example_rules():
+    pytest.importorskip("crewai")
+    sys.path.append(str(Path(__file__).resolve().parents[2]))   # agent_draft_writer.py at the root
+    import agent_draft_writer
+    from agents import writer
+
+    for rules in (agent_draft_writer.WRITER_RULES, writer.WRITER_RULES):
+        assert EXAMPLES_RULES in rules and "JSON export of the same 10 rows" not in rules
@@ -0,0 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from utils import http_clients
+
+
+def test_one_pooled_client_per_name_across_threads():
+    with ThreadPoolExecutor(8) as pool:
+        clients = set(map(id, pool.map(lambda _: http_clients.http_client("t-sync"), range(32))))
+    assert len(clients) == 1
+    assert http_clients.http_client("t-other") is not http_clients.http_client("t-sync")
+    row = http_clients.stats()["t-sync"]
+    assert row["requests"] == row["reused"] == 0 and row["max_connections"] >= 1
+
+
+def test_async_clients_are_per_event_loop():
+    async def grab():
+        return http_clients.async_http_client("t-async"), http_clients.async_http_client("t-async")
+
+    (a1, a2), (b1, _) = asyncio.run(grab()), asyncio.run(grab())
+    assert a1 is a2 and a1 is not b1
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils.llm_cache import LLMCache, cache_key, cached_completion
+
+MSGS = [{"role": "user", "content": "Rewrite this CFP subject line."}]
+
+
+def _caller(calls):
+    def call():
+        calls.append(1)
+        return f"answer {len(calls)}"
+    return call
+
+
+def test_key_covers_model_messages_temperature_and_stop():
+    base = cache_key("m", MSGS, 0.7, None)
+    assert base == cache_key("m", [dict(MSGS[0])], 0.7, [])
+    assert len({base, cache_key("m2", MSGS, 0.7, None), cache_key("m", MSGS, 0.2, None),
+                cache_key("m", MSGS, 0.7, ["\n\n"]),
+                cache_key("m", [{"role": "user", "content": "x"}], 0.7, None)}) == 5
+
+
+def test_two_tiers_bypass_and_counters(tmp_path):
+    db, calls = tmp_path / "llm.db", []
+    cache = LLMCache(db, max_items=1)
+    ask = lambda **kw: cached_completion(_caller(calls), model="m", messages=MSGS,
+                                         temperature=0.7, cache=cache, **kw)
+    assert ask() == ask() == "answer 1"
+    assert ask(bypass=True) == "answer 2"                 # fresh call, stored
+    assert ask() == "answer 2" and cache.stats() == {"hits": 2, "misses": 1}
+
+    cache = LLMCache(db)                                  # new session: SQLite tier
+    assert ask() == "answer 2" and len(calls) == 2 and cache.hits == 1
+    assert cached_completion(_caller(calls), model="m", messages=MSGS,
+                             cache=False) == "answer 3"
+
+
+def test_sampling_calls_skip_the_shared_cache(monkeypatch):
+    from utils import llm_cache
+    monkeypatch.setenv("LLM_CACHE_PATH", "off")
+    monkeypatch.setattr(llm_cache, "_CACHE", None)
+    calls = []
+    ask = lambda t: cached_completion(_caller(calls), model="m", messages=MSGS, temperature=t)
+    assert [ask(0.7), ask(0.7)] == ["answer 1", "answer 2"]      # regenerate → new draft
+    assert ask(0) == ask(0) == "answer 3" and len(calls) == 3
+    assert list(llm_cache.cached_stream(lambda: iter(["a"]), model="m", messages=MSGS,
+                                        temperature=0.7)) == ["a"]
+    assert llm_cache.get_llm_cache().get(cache_key("m", MSGS, 0.7)) is None
+
+
+def test_ttl_and_row_limit(tmp_path, monkeypatch):
+    from utils import llm_cache
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    monkeypatch.setattr(llm_cache, "_PRUNE_EVERY", 1)
+    cache = LLMCache(tmp_path / "llm.db", max_rows=2, ttl=60)
+    for k in "abc":
+        cache.put(k, "m", k.upper())
+        now[0] += 1
+    assert cache._db().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 2
+    assert LLMCache(tmp_path / "llm.db").get("a") is None   # evicted by size
+    assert cache.get("c") == "C"
+    now[0] += 60
+    assert cache.get("c") is None and cache.get("b") is None  # expired
+
+
+def test_stream_is_stored_only_when_complete(tmp_path):
+    from utils.llm_cache import cached_stream
+    cache = LLMCache(tmp_path / "llm.db")
+    stream = lambda **kw: cached_stream(lambda: iter(["Sub", "ject: ", "CFP"]), model="m",
+                                        messages=MSGS, cache=cache, **kw)
+    it = stream()
+    assert next(it) == "Sub"
+    it.close()                                            # interrupted → nothing stored
+    assert cache.get(cache_key("m", MSGS)) is None
+    assert list(stream()) == ["Sub", "ject: ", "CFP"]
+    assert list(stream()) == ["Subject: CFP"]             # replayed as one piece
+    assert cached_completion(lambda: "fresh", model="m", messages=MSGS,
+                             cache=cache) == "Subject: CFP"
+
+
+def test_default_openrouter_llm_caches_deterministic_steps(monkeypatch):
+    pytest.importorskip("langchain_core")
+    pytest.importorskip("httpx")
+    from utils import llm, llm_cache
+    monkeypatch.setenv("LLM_CACHE_PATH", "off")
+    monkeypatch.setattr(llm_cache, "_CACHE", None)
+    calls = []
+
+    def completion(**kw):
+        calls.append(kw)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+            content=f"answer {len(calls)}"))], usage=None)
+
+    monkeypatch.setattr(llm, "completion", completion)
+    base = llm.openrouter_llm.model_copy(update={"api_key": "test"})
+    qc, writer = base.for_step("qc"), base.for_step("writer")
+    assert qc.invoke("Score this draft.") == qc.invoke("Score this draft.") == "answer 1"
+    assert calls[0]["temperature"] == 0
+    assert writer.invoke("Write a CFP.") != writer.invoke("Write a CFP.")   # sampling: not cached
+    assert len(calls) == 3 and calls[-1]["temperature"] == base.temperature > 0
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils import llm_pool
+from utils.llm_pool import amap_prompts, map_prompts, provider_of
+
+
+def _tracked(limit_seen):
+    lock, active = threading.Lock(), [0]
+
+    def fn(prompt):
+        with lock:
+            active[0] += 1
+            limit_seen.append(active[0])
+        time.sleep(0.02 * (5 - int(prompt[-1]) % 5))        # finish out of order
+        with lock:
+            active[0] -= 1
+        return prompt.upper()
+    return fn
+
+
+def test_order_kept_and_provider_limit_respected(monkeypatch):
+    monkeypatch.setenv("LLM_CONCURRENCY_TESTPROV", "3")
+    seen = []
+    prompts = [f"p{i}" for i in range(9)]
+    assert map_prompts(_tracked(seen), prompts, "testprov") == [p.upper() for p in prompts]
+    assert max(seen) == 3
+    assert llm_pool.get_executor("testprov") is llm_pool.get_executor("testprov")
+    assert provider_of("openrouter/google/gemini-2.5-flash") == "openrouter"
+
+
+def test_async_path_and_errors(monkeypatch):
+    monkeypatch.setenv("LLM_CONCURRENCY_TESTASYNC", "2")
+    seen = []
+    prompts = [f"a{i}" for i in range(6)]
+    out = asyncio.run(amap_prompts(_tracked(seen), prompts, "testasync"))
+    assert out == [p.upper() for p in prompts] and max(seen) <= 2
+
+    def boom(prompt):
+        raise ValueError(prompt)
+    with pytest.raises(ValueError):
+        map_prompts(boom, ["x", "y"], "testasync")
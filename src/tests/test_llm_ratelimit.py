@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from utils.llm_ratelimit import RateLimiter, RateLimitTimeout
+
+
+def _drain(limiter, n, priority="interactive"):
+    for _ in range(n):
+        limiter.acquire(0, priority, timeout=0.05)
+
+
+def test_request_and_token_buckets():
+    rpm = RateLimiter(rpm=5)
+    _drain(rpm, 5)
+    with pytest.raises(RateLimitTimeout):
+        rpm.acquire(0, timeout=0.05)
+
+    tpm = RateLimiter(tpm=1000)
+    tpm.acquire(800)
+    tpm.settle(800, 1000)                            # the provider counted more than estimated
+    with pytest.raises(RateLimitTimeout):
+        tpm.acquire(100, timeout=0.05)
+    assert RateLimiter().acquire(10 ** 9) == 0.0     # no limits configured → never waits
+
+
+def test_batch_leaves_a_reserve_for_interactive():
+    limiter = RateLimiter(rpm=10, reserve=0.2)
+    _drain(limiter, 8, "batch")
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(0, "batch", timeout=0.05)
+    _drain(limiter, 2, "interactive")
+
+
+def test_waiting_interactive_request_goes_first():
+    limiter = RateLimiter(rpm=600, reserve=0.0)      # one request per 0.1 s once drained
+    _drain(limiter, 600)
+    order = []
+    run = lambda p: (limiter.acquire(0, p, timeout=5), order.append(p))
+    batch = threading.Thread(target=run, args=("batch",))
+    batch.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=run, args=("interactive",))
+    interactive.start()
+    batch.join(); interactive.join()
+    assert order == ["interactive", "batch"]
+
+
+def test_processes_share_the_budget_through_sqlite(tmp_path):
+    a = RateLimiter(rpm=4, shared=tmp_path / "rate.db")
+    b = RateLimiter(rpm=4, shared=tmp_path / "rate.db")   # another worker on the host
+    _drain(a, 2)
+    _drain(b, 2)
+    with pytest.raises(RateLimitTimeout):
+        a.acquire(0, timeout=0.05)
+
+
+def test_throttle_tokenizes_only_under_a_token_limit(monkeypatch):
+    from utils import llm_ratelimit
+    counted = []
+    monkeypatch.setattr(llm_ratelimit, "n_tokens", lambda text: counted.append(text) or 7)
+    msgs = [{"role": "user", "content": "Write a CFP."}]
+    for env, expected in (({}, 0), ({"LLM_RPM": "100"}, 0), ({"LLM_TPM": "1000"}, 7)):
+        for var in llm_ratelimit._ENV_VARS:
+            monkeypatch.delenv(var, raising=False)
+        for var, value in env.items():
+            monkeypatch.setenv(var, value)
+        with llm_ratelimit.throttle("writer", msgs) as slot:
+            assert slot.estimated == expected
+    assert counted == ["Write a CFP."]
@@ -0,0 +1,52 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils.llm_replay import LLMReplay, ReplayMiss
+
+REQ = dict(model="openrouter/google/gemini-2.5-flash", temperature=0.7,
+           messages=[{"role": "user", "content": "Write 10 subject lines for IJAR."}])
+
+
+def _provider(calls):
+    def completion(**kwargs):
+        calls.append(kwargs)
+        if kwargs.get("stream"):
+            return iter([SimpleNamespace(usage=None, choices=[SimpleNamespace(
+                             delta=SimpleNamespace(content=p))]) for p in ("Subject: ", "CFP")]
+                        + [SimpleNamespace(usage={"prompt_tokens": 9, "completion_tokens": 3},
+                                           choices=[])])
+        return SimpleNamespace(usage={"prompt_tokens": 12, "completion_tokens": 4},
+                               _hidden_params={"response_cost": 0.0004},
+                               choices=[SimpleNamespace(message=SimpleNamespace(content="Subject: A"))])
+    return completion
+
+
+def test_record_then_replay_offline(tmp_path):
+    calls = []
+    LLMReplay("record", tmp_path, upstream=_provider(calls)).completion(**REQ, timeout=30)
+    assert len(calls) == 1 and len(list(tmp_path.glob("*.json"))) == 1
+
+    offline = LLMReplay("replay", tmp_path, upstream=None, latency_ms=0)
+    resp = offline.completion(**REQ, timeout=5)              # timeout is not part of the key
+    assert resp.choices[0].message.content == "Subject: A"
+    assert resp.usage["prompt_tokens"] == 12 and resp._hidden_params["response_cost"] == 0.0004
+    with pytest.raises(ReplayMiss):
+        offline.completion(**{**REQ, "temperature": 0.2})
+    near = LLMReplay("replay", tmp_path, latency_ms=0, on_miss="nearest")
+    assert near.completion(**{**REQ, "temperature": 0.2}).choices[0].message.content == "Subject: A"
+
+
+def test_streams_and_synthetic_timing(tmp_path):
+    calls = []
+    rec = LLMReplay("record", tmp_path, upstream=_provider(calls))
+    assert [c.choices[0].delta.content for c in rec.completion(**REQ, stream=True) if c.choices] \
+        == ["Subject: ", "CFP"]
+
+    slow = LLMReplay("replay", tmp_path, latency_ms=50, tokens_per_s=100)
+    t0 = time.monotonic()
+    chunks = list(slow.completion(**REQ, stream=True))
+    assert "".join(c.choices[0].delta.content for c in chunks if c.choices) == "Subject: CFP"
+    assert chunks[-1].usage["completion_tokens"] == 3
+    assert time.monotonic() - t0 >= 0.05 + 3 / 100
@@ -0,0 +1,107 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import llm_router, llm_telemetry
+from utils.llm_router import RouteError, RoutePolicy, policy_for, route
+
+FAST = dict(backoff=0.001, max_backoff=0.002, hedge=False)
+
+
+class Status(Exception):
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+def test_transient_errors_retry_then_fall_back(monkeypatch):
+    seen = []
+    monkeypatch.setattr(llm_router, "_ATTEMPTS", llm_router.deque(maxlen=50))
+
+    def send(model, timeout):
+        seen.append(model)
+        if model == "m1":
+            raise Status(503)
+        if len(seen) == 4:
+            raise Status(429)
+        return f"{model} ok"
+
+    policy = RoutePolicy(models=("m1", "m2"), retries=2, **FAST)
+    assert route(send, step="t", policy=policy) == "m2 ok"
+    assert seen == ["m1", "m1", "m1", "m2", "m2"]
+    assert [(a.model, a.attempt, a.ok) for a in llm_router.attempts()] == \
+        [("m1", 1, False), ("m1", 2, False), ("m1", 3, False), ("m2", 1, False), ("m2", 2, True)]
+
+
+def test_permanent_error_skips_retries_and_budget_is_enforced():
+    calls = []
+
+    def bad_request(model, timeout):
+        calls.append(model)
+        raise Status(400)
+
+    with pytest.raises(RouteError):
+        route(bad_request, step="t", model="m1", policy=RoutePolicy(retries=3, **FAST))
+    assert calls == ["m1"]
+
+    def slow(model, timeout):
+        time.sleep(0.05)
+        raise TimeoutError
+
+    t0 = time.monotonic()
+    with pytest.raises(RouteError):
+        route(slow, step="t", model="m", policy=RoutePolicy(budget=0.12, retries=50, **FAST))
+    assert time.monotonic() - t0 < 0.5
+
+
+def test_slow_attempt_is_hedged():
+    first = threading.Event()
+
+    def send(model, timeout):
+        if not first.is_set():
+            first.set()
+            time.sleep(0.5)                      # stuck upstream
+            return "slow"
+        return "hedge"
+
+    policy = RoutePolicy(hedge_after=0.05, attempt_timeout=2.0, backoff=0.001)
+    t0 = time.monotonic()
+    assert route(send, step="t", model="m", policy=policy) == "hedge"
+    assert time.monotonic() - t0 < 0.4
+    assert llm_router.attempts()[-1].hedged
+
+
+def test_deterministic_steps_run_at_temperature_zero(monkeypatch):
+    assert {s: policy_for(s).temperature for s in ("analysis", "spam", "qc", "autofix", "html")} \
+        == dict.fromkeys(("analysis", "spam", "qc", "autofix", "html"), 0.0)
+    assert policy_for("writer").temperature is None and policy_for("default").temperature is None
+    monkeypatch.setenv("ROUTE_QC_TEMPERATURE", "0.3")
+    assert policy_for("qc").temperature == 0.3
+
+
+def test_hedge_loser_is_still_billed(tmp_path, monkeypatch):
+    tel = llm_telemetry.Telemetry(tmp_path / "tel.db")
+    monkeypatch.setattr(llm_telemetry, "get_telemetry", lambda: tel)
+    first, loser_done = threading.Event(), threading.Event()
+
+    def send(model, timeout):
+        slow = not first.is_set()
+        first.set()
+        if slow:
+            time.sleep(0.2)
+        llm_telemetry.record_usage(SimpleNamespace(usage={"prompt_tokens": 10, "completion_tokens": 5},
+                                                   _hidden_params={"response_cost": 0.01}))
+        if slow:
+            loser_done.set()
+        return "slow" if slow else "hedge"
+
+    policy = RoutePolicy(hedge_after=0.05, attempt_timeout=2.0, backoff=0.001)
+    with llm_telemetry.run_context("hedge-run"), llm_telemetry.track("t", "m"):
+        assert route(send, step="t", model="m", policy=policy) == "hedge"
+    tel.flush()                                  # the call's row is written before the loser ends
+    assert loser_done.wait(2)
+    totals = tel.totals("hedge-run")
+    assert totals["calls"] == 1 and totals["prompt_tokens"] == 20
+    assert totals["cost"] == pytest.approx(0.02)
@@ -0,0 +1,92 @@
+import contextvars
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import llm_telemetry
+from utils.llm_pool import map_prompts
+from utils.llm_telemetry import Telemetry, first_token, record_usage, run_context, track
+
+
+def _response(p, c, cached=0, cost=0.001):
+    usage = {"prompt_tokens": p, "completion_tokens": c,
+             "prompt_tokens_details": {"cached_tokens": cached}}
+    return SimpleNamespace(usage=usage, _hidden_params={"response_cost": cost})
+
+
+@pytest.fixture
+def telemetry(tmp_path, monkeypatch):
+    tel = Telemetry(tmp_path / "tel.db", batch=3)
+    monkeypatch.setattr(llm_telemetry, "get_telemetry", lambda: tel)
+    return tel
+
+
+def test_calls_are_recorded_per_run_in_batches(telemetry):
+    def call(prompt):                         # runs on the provider pool threads
+        with track("writer", "m"):
+            if prompt != "cached":
+                record_usage(_response(100, 20, cached=60))
+        return prompt
+
+    with run_context("run-1"):
+        assert map_prompts(call, ["a", "b", "cached"], "t-telemetry") == ["a", "b", "cached"]
+        with pytest.raises(ValueError), track("qc", "m"):
+            raise ValueError("upstream")
+
+    assert len(telemetry._buf) == 1                      # first 3 flushed as a batch
+    totals = telemetry.totals("run-1")
+    assert totals == {"prompt_tokens": 200, "completion_tokens": 40, "cached_tokens": 120,
+                      "cost": pytest.approx(0.002), "cache_hits": 1, "calls": 4}
+    rows = telemetry._query("SELECT step, ok, cache_hit FROM llm_calls ORDER BY step, cache_hit")
+    assert rows == [("qc", 0, 0), ("writer", 1, 0), ("writer", 1, 0), ("writer", 1, 1)]
+
+
+def test_latency_percentiles_per_step(telemetry):
+    for ms in (100, 200, 300, 400, 1000):
+        telemetry.record(llm_telemetry.CallRecord("r", "writer", "m", latency_ms=ms))
+    telemetry.record(llm_telemetry.CallRecord("r", "qc", "m", latency_ms=50))
+    stats = {s["step"]: s for s in telemetry.latency_by_step()}
+    assert stats["writer"]["calls"] == 5 and stats["writer"]["p50_ms"] == 300
+    assert stats["writer"]["p95_ms"] == pytest.approx(880)
+    assert stats["qc"]["p95_ms"] == 50
+
+
+def test_prefix_cache_tokens_and_time_to_first_token(telemetry):
+    with track("writer", "m"):
+        time.sleep(0.002)
+        first_token()
+        first_token()                                    # only the first one counts
+        record_usage(SimpleNamespace(usage={"prompt_tokens": 1500, "completion_tokens": 400,
+                                            "cache_read_input_tokens": 1200},
+                                     _hidden_params={"response_cost": 0.0}))
+    stats = telemetry.latency_by_step()[0]
+    assert stats["cached_tokens"] == 1200
+    assert stats["ttft_p50_ms"] is not None and stats["ttft_p50_ms"] <= stats["p50_ms"]
+
+
+def test_tables_from_before_ttft_are_migrated(tmp_path):
+    import sqlite3
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE llm_calls (run_id TEXT, step TEXT NOT NULL, model TEXT NOT NULL, "
+                     "prompt_tokens INTEGER NOT NULL, completion_tokens INTEGER NOT NULL, "
+                     "cached_tokens INTEGER NOT NULL, latency_ms REAL NOT NULL, "
+                     "cost_usd REAL NOT NULL, cache_hit INTEGER NOT NULL, ok INTEGER NOT NULL, "
+                     "created_at REAL NOT NULL)")
+    tel = Telemetry(path)
+    tel.record(llm_telemetry.CallRecord("r", "qc", "m", latency_ms=10, ttft_ms=4))
+    assert tel.latency_by_step()[0]["ttft_p50_ms"] == 4
+
+
+def test_usage_after_the_call_returned_is_billed_not_counted(telemetry):
+    with run_context("run-late"):
+        with track("qc", "m"):
+            record_usage(_response(100, 20))
+            hedge = contextvars.copy_context()          # what a hedged duplicate runs in
+        hedge.run(record_usage, _response(90, 30, cost=0.002))
+    assert telemetry.totals("run-late") == {"prompt_tokens": 190, "completion_tokens": 50,
+                                            "cached_tokens": 0, "cost": pytest.approx(0.003),
+                                            "cache_hits": 0, "calls": 1}
+    stats = telemetry.latency_by_step()[0]
+    assert stats["calls"] == 1 and stats["prompt_tokens"] == 190
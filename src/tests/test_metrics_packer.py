@@ -0,0 +1,71 @@
+import json
+
+from utils.metrics_packer import json_record, pack_rows, table_header, table_line
+from utils.tokens import n_tokens
+
+COLS = ["subject", "email"]
+ROWS = [{"subject": f"Call for papers {i} " + "word " * 40, "email": f"e{i}@x.org"} for i in range(30)]
+
+
+def _frame(rows):
+    body = "\n".join(table_line(r, COLS) for r in rows)
+    return f"Recent ({len(rows)})\n{table_header(COLS)}\n{body}\nNewest: {rows[0] if rows else {}}"
+
+
+def _slow_pack(rows, budget):                      # the old drop-one-and-re-render loop
+    keep = list(rows)
+    while keep and n_tokens(_frame(keep)) > budget:
+        keep = keep[:-1]
+    return keep
+
+
+def test_keeps_the_longest_prefix_that_fits():
+    counted = []
+
+    def count(text):
+        counted.append(text)
+        return n_tokens(text)
+
+    full = n_tokens(_frame(ROWS))
+    budget = full // 2
+    packed = pack_rows(ROWS, lambda r: table_line(r, COLS), _frame, budget, col_limits=(None,), count=count)
+    assert packed.tokens <= budget
+    assert packed.rows == _slow_pack(ROWS, budget) == ROWS[:len(packed.rows)]
+    assert len(counted) == len(ROWS) + 2             # every fragment, the frame, the result
+    assert counted[-1] == packed.text
+
+    everything = pack_rows(ROWS, lambda r: table_line(r, COLS), _frame, full + 10)
+    assert everything.rows == ROWS and everything.col_limit is None
+
+
+def test_join_overshoot_is_corrected_from_the_prefix_sums():
+    counted = []
+
+    def count(text):                                 # joined lines cost more than apart
+        counted.append(text)
+        return len(text) // 4 + 5 * text.count("\n|")
+
+    budget = n_tokens(_frame(ROWS)) // 2
+    packed = pack_rows(ROWS, lambda r: table_line(r, COLS), _frame, budget, col_limits=(None,), count=count)
+    assert packed.tokens == count(packed.text) <= budget
+    assert count(_frame(ROWS[:len(packed.rows) + 2])) > budget     # not dropped needlessly
+    assert len(counted) == len(ROWS) + 3 + 2         # + one corrected render, + the asserts
+
+
+def test_truncates_columns_before_dropping_rows():
+    frag = lambda r: table_line(r, COLS)
+    budget = pack_rows(ROWS[:10], frag, _frame, 10_000, col_limits=(80,)).tokens
+    packed = pack_rows(ROWS[:10], frag, _frame, budget, col_limits=(None, 200, 80))
+    assert len(packed.rows) == 10 and packed.col_limit == 80
+    assert all(r["subject"].endswith("…") for r in packed.rows)
+
+    none_fit = pack_rows(ROWS, frag, _frame, 5)
+    assert none_fit.rows == [] and none_fit.text == _frame([])
+
+
+def test_json_records_join_into_an_array():
+    rows = ROWS[:3]
+    packed = pack_rows(rows, json_record,
+                       lambda rs: "[\n" + ",\n".join(map(json_record, rs)) + "\n]" if rs else "[]",
+                       10_000, sep=",\n")
+    assert json.loads(packed.text) == rows
@@ -0,0 +1,23 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("httpx")                         # qc_ai builds the shared OpenAI client
+sys.path.append(str(Path(__file__).resolve().parents[2]))   # qc_ai.py lives at the repo root
+from qc_ai import _parse_batch                       # noqa: E402
+
+OK = {"hook_ok": True, "balanced_ok": "yes", "tone_ok": 1}
+
+
+def test_zero_based_string_indices_are_recognised():
+    items = [{"i": str(i), **OK, "tone_ok": i != 2} for i in range(3)]
+    out = _parse_batch(f"```json\n{json.dumps(items)}\n```", 3)
+    assert sorted(out) == [0, 1, 2]                  # "0" → zero-based, nothing dropped
+    assert out[0]["__PASS__"] and not out[2]["__PASS__"]
+
+
+def test_one_based_and_malformed_indices():
+    items = [{"index": "1", **OK}, {"index": 2, **OK}, {"index": "x", **OK}]
+    assert sorted(_parse_batch(json.dumps(items), 2)) == [0, 1]
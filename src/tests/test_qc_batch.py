@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.qc_rules import run_qc, run_qc_many
+
+DRAFT = (Path(__file__).resolve().parents[1] / "cfp_draft.txt").read_text(encoding="utf-8")
+URL = "https://example.org/ijar/submit-paper"
+BODIES = [DRAFT, DRAFT.replace("Warm regards", "Cheers"), "", None,
+          "Dear all, 10 Sessions 2025 – act now!"]
+
+
+def test_rows_match_single_draft_checker():
+    df = run_qc_many(BODIES, submit_url=URL, workers=1, cache=False)
+    assert df.dtypes.eq(bool).all() and list(df.index) == [0, 1, 2, 3, 4]
+    for i, text in enumerate(BODIES):
+        report = run_qc(text or "", submit_url=URL)
+        row = df.iloc[i]
+        assert [row[ln.split(" — ")[0][2:]] for ln in report["checklist"]] == \
+            [ln.startswith("✔") for ln in report["checklist"]]
+        assert row["passed"] == report["passed"]
+
+
+def test_streamed_series_chunks_keep_labels_across_workers():
+    chunks = (pd.Series(BODIES[i:i + 2], index=[f"id{j}" for j in range(i, i + 2)])
+              for i in (0, 2))
+    df = run_qc_many(chunks, submit_url=URL, workers=2, chunk_size=1, cache=False)
+    assert list(df.index) == ["id0", "id1", "id2", "id3"]
+    serial = run_qc_many(pd.Series(BODIES[:4], index=df.index), submit_url=URL,
+                         workers=1, cache=False)
+    pd.testing.assert_frame_equal(df, serial)
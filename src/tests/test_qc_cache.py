@@ -0,0 +1,64 @@
+import datetime
+
+from utils import qc_cache, spam_scan
+from utils.qc_cache import CachedCheck, QCCache
+
+CALLS = []
+
+
+def _check(text: str, model: str = "o3") -> dict:
+    CALLS.append((text, model))
+    return {"ok": "amazing" not in text, "__PASS__": True}
+
+
+def test_two_tiers_and_key_args(tmp_path, monkeypatch):
+    db = tmp_path / "qc.db"
+    monkeypatch.setattr(qc_cache, "get_cache", lambda: cache)
+    cache = QCCache(db, max_items=1)
+    check = CachedCheck("test.check", _check, key_args=("model",))
+    CALLS.clear()
+
+    assert check("An amazing issue") == {"ok": False, "__PASS__": True}
+    assert check("An amazing issue") == check("An amazing issue", model="o3")
+    check("An amazing issue", model="gpt-4o")                 # new model → new call
+    assert CALLS == [("An amazing issue", "o3"), ("An amazing issue", "gpt-4o")]
+
+    cache = QCCache(db)                                        # new session: SQLite tier
+    assert check("An amazing issue") == {"ok": False, "__PASS__": True}
+    assert len(CALLS) == 2 and cache.hits == 1
+
+
+def test_ruleset_version_follows_source_edits(tmp_path):
+    rules = tmp_path / "rules.py"
+    rules.write_text("LIMIT = 3\n")
+    before = qc_cache.ruleset_version(rules)
+    assert qc_cache.ruleset_version(rules) == before
+    rules.write_text("LIMIT = 4\n")
+    assert qc_cache.ruleset_version(rules) != before
+
+
+def test_dated_checks_expire_at_midnight(monkeypatch):
+    cache = QCCache(None)
+    monkeypatch.setattr(qc_cache, "get_cache", lambda: cache)
+    day = [datetime.date(2026, 3, 1)]
+    monkeypatch.setattr(qc_cache, "_today", lambda: day[0])
+    dated = CachedCheck("test.dated", _check, dated=True)
+    plain = CachedCheck("test.plain", _check)
+    CALLS.clear()
+
+    dated("Deadline: 15 April 2026"), plain("Deadline: 15 April 2026")
+    dated("Deadline: 15 April 2026"), plain("Deadline: 15 April 2026")
+    assert len(CALLS) == 2
+    day[0] = datetime.date(2026, 3, 2)
+    dated("Deadline: 15 April 2026"), plain("Deadline: 15 April 2026")
+    assert len(CALLS) == 3                                     # only the dated check re-runs
+
+
+def test_ruleset_version_covers_the_scan_rules(tmp_path, monkeypatch):
+    rules, scan_rules = tmp_path / "rules.py", tmp_path / "spam_scan.py"
+    rules.write_text("LIMIT = 3\n")
+    scan_rules.write_text("ALLOWED_SPAM_EXCEPTIONS = frozenset()\n")
+    monkeypatch.setattr(spam_scan, "__file__", str(scan_rules))
+    before = qc_cache.ruleset_version(rules)
+    scan_rules.write_text("ALLOWED_SPAM_EXCEPTIONS = frozenset({'free'})\n")
+    assert qc_cache.ruleset_version(rules) != before
@@ -0,0 +1,67 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from scripts.qc_rules import run_qc
+from utils.qc_engine import Rule, evaluate, facts
+from utils.spam_scan import scan
+
+DRAFT = (Path(__file__).resolve().parents[1] / "cfp_draft.txt").read_text(encoding="utf-8")
+
+
+def test_facts_are_shared_per_text():
+    d = facts("Dear Dr. Roe,\nAn amazing ſcope İssue.\nhello@ex.org\nWarm regards")
+    assert facts(d.text) is d
+    assert d.spam is scan(d.text)
+    assert len(d.folded) == len(d.text) and "scope issue" in d.folded
+    assert d.signature == (d.text.index("Warm"), len(d.text))
+
+
+def test_body_view_matches_a_scan_of_the_extracted_body():
+    for text in (DRAFT, DRAFT.replace("\n", "\r\n"),
+                 "Act now!\nDear all, act\nnow – amazing.\nmail a@b.org\nP.S. hurry"):
+        d = facts(text)
+        assert d.body_spam.terms("spam", "hype") == scan(d.body).terms("spam", "hype")
+
+
+def test_evaluate_skips_none_and_splits_notes():
+    rules = [Rule("a", lambda d, ctx: True),
+             Rule("b", lambda d, ctx: None),
+             Rule("c", lambda d, ctx: (d.lower.count("x") > ctx["n"], "few x"))]
+    assert list(evaluate(rules, facts("xX"), {"n": 2})) == [
+        ("a", True, ""), ("c", False, "few x")]
+
+
+def test_run_qc_shape_and_shared_scan():
+    report = run_qc(DRAFT, submit_url="https://example.org/ijar/submit-paper")
+    assert set(report) == {"passed", "checklist", "need_ai"}
+    assert [ln.split()[1] for ln in report["checklist"]] == [
+        "C-1", "C-2", "C-3", "C-4", "C-5", "C-6", "C-7", "C-8", "C-9",
+        "P-2", "P-3", "P-4", "P-6", "P-7", "P-10"]
+    assert report["need_ai"] == ["P-1", "P-5", "P-9"]
+
+
+def test_sample_draft_passes_the_spam_density_cap():
+    root = str(Path(__file__).resolve().parents[2])     # qc_script.py lives at the repo root
+    if root not in sys.path:
+        sys.path.append(root)
+    import qc_script
+
+    assert qc_script.validate(DRAFT)["spam_density"] is True
+    assert scan(DRAFT).count("spam") / len(DRAFT.split()) > 0.02    # the master list alone fails it
+    spammy = "Dear Dr. Roe, a miracle guarantee for the exclusive winner. " * 3
+    assert qc_script.validate(spammy)["spam_density"] is False
+
+
+class _SlowKey(str):                                # yields the GIL mid dict operation
+    def __hash__(self):
+        time.sleep(0)
+        return str.__hash__(self)
+
+
+def test_memos_survive_concurrent_eviction():
+    texts = [_SlowKey(f"Draft {i}: an amazing offer, act now.") for i in range(40)]
+    with ThreadPoolExecutor(16) as pool:
+        drafts = list(pool.map(lambda i: facts(texts[i % 40]), range(4000)))
+    assert all(d.text == texts[i % 40] and d.spam.text == d.text for i, d in enumerate(drafts))
@@ -0,0 +1,39 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+from utils.qc_runner import run_full_qc
+
+
+def _det(passed: bool, delay: float = 0.2):
+    def det(text):
+        time.sleep(delay)
+        return {"word_count": passed, "__PASS__": passed}
+    return det
+
+
+def _ai(calls, delay: float = 0.2):
+    def ai(text, cancel: threading.Event):
+        calls.append("started")
+        if cancel.wait(delay):
+            calls.append("cancelled")
+            raise CancelledError
+        calls.append("sent")
+        return {"hook_ok": True, "__PASS__": True}
+    return ai
+
+
+def test_checks_overlap_and_merge():
+    calls = []
+    t0 = time.perf_counter()
+    qc = run_full_qc("draft", det=_det(True), ai=_ai(calls))
+    assert time.perf_counter() - t0 < 0.35            # ≈ max(0.2, 0.2), not the sum
+    assert qc == {"word_count": True, "hook_ok": True, "__PASS__": True}
+
+
+def test_rigid_fail_cancels_the_ai_call():
+    calls = []
+    qc = run_full_qc("draft", det=_det(False, 0.05), ai=_ai(calls, 5))
+    assert qc == {"word_count": False, "__PASS__": False}
+    time.sleep(0.05)
+    assert "sent" not in calls
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from scripts.spam_check import find_spam_many
+from utils.spam_scan import scan
+
+DOCS = ["Amazing discount – act now!", None, "",
+        "<p>An <b>amazing</b> paper &amp; amazing data</p>"]
+
+
+def test_counts_match_single_scan_and_keep_series_index():
+    s = pd.Series(DOCS, index=[10, 11, 12, 13])
+    batch = find_spam_many(s, strip_html=True)
+    assert list(batch.index) == [10, 11, 12, 13]
+    assert batch.counts[0] == scan(DOCS[0]).count("spam")
+    assert list(batch.counts[1:3]) == [0, 0]
+    row = dict(zip((batch.terms[i] for i in batch.indices[batch.indptr[3]:]),
+                   batch.data[batch.indptr[3]:]))
+    assert row == {"amazing": 2}
+    assert batch.densities[3] == pytest.approx(2 / 5)
+
+
+def test_streamed_chunks_across_workers_match_inline():
+    inline = find_spam_many(DOCS * 20, workers=1)
+    pooled = find_spam_many(iter(DOCS * 20), workers=2, chunk_size=7)
+    assert (pooled.counts == inline.counts).all()
+    assert (pooled.indptr == inline.indptr).all()
+    assert (pooled.indices == inline.indices).all()
+
+
+def test_sparse_matrix_shape():
+    pytest.importorskip("scipy")
+    batch = find_spam_many(DOCS)
+    assert batch.matrix.shape == (len(DOCS), len(batch.terms))
+    assert batch.matrix.sum() == batch.counts.sum()
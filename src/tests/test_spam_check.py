@@ -0,0 +1,31 @@
+from scripts.spam_check import find_spam, highlight_spam
+from utils.spam_matcher import SpamMatcher
+
+
+def test_find_spam_whole_words_case_insensitive():
+    hits = find_spam("AMAZING discount on groundbreaking research!")
+    assert {"amazing", "discount", "groundbreaking"} <= hits
+    assert "amaz" not in hits
+
+
+def test_find_spam_exceptions():
+    hits = find_spam("Amazing discount", exceptions={"Discount"})
+    assert "discount" not in hits and "amazing" in hits
+
+
+def test_phrases_span_whitespace_and_keep_punctuation():
+    m = SpamMatcher(["act now", "50% off", "age-defying", "don't miss"])
+    assert m.find("Act\n  now, 50% off") == {"act now", "50% off"}
+    assert m.find("age - defying") == set()
+    assert m.find("Don’t miss it") == {"don't miss"}
+
+
+def test_spans_are_leftmost_longest():
+    m = SpamMatcher(["act", "act now", "now"])
+    assert [h.term for h in m.spans("act now and now")] == ["act now", "now"]
+    assert {h.term for h in m.finditer("act now")} == {"act", "act now", "now"}
+
+
+def test_highlight_spam_escapes_html():
+    out = highlight_spam("<b>Amazing</b>")
+    assert out == '&lt;b&gt;<span class="spam">Amazing</span>&lt;/b&gt;'
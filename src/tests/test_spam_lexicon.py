@@ -0,0 +1,56 @@
+import pytest
+
+from utils import spam_lexicon
+
+
+@pytest.fixture
+def artifact(tmp_path, monkeypatch):
+    path = tmp_path / "spam_lexicon.bin"
+    monkeypatch.setattr(spam_lexicon, "ARTIFACT_PATH", path)
+    monkeypatch.setattr(spam_lexicon, "_LEXICON", None)
+    monkeypatch.delenv("SPAM_WORD_PATH", raising=False)
+    return path
+
+
+def test_build_then_load_from_artifact(artifact):
+    built = spam_lexicon.build()
+    assert artifact.exists()
+    fresh = spam_lexicon._read_artifact(artifact, built.fingerprint)
+    assert fresh is not None and fresh.lists == built.lists
+    assert fresh.rewrites == built.rewrites and fresh.rewrites["platforms"] == "forum"
+    assert fresh.matcher("spam").find("Amazing zorblax") == {"amazing"}
+
+
+def test_replacement_regex_keys_become_words(artifact):
+    repl = spam_lexicon.load().words("replacements")
+    assert {"platform", "platforms", "feel free to"} <= set(repl)
+
+
+def test_views_do_not_leak_other_lists(artifact):
+    lex = spam_lexicon.load()
+    assert lex.matcher("spam").find("a reduction") == set()
+    assert lex.matcher("spam", "replacements").find("a reduction") == {"reduction"}
+
+
+def test_reloads_when_spam_word_path_changes(artifact, tmp_path, monkeypatch):
+    first = spam_lexicon.load()
+    assert spam_lexicon.load() is first
+    extra = tmp_path / "extra.csv"
+    extra.write_text("Zorblax Deal\n", encoding="utf-8")
+    monkeypatch.setenv("SPAM_WORD_PATH", str(extra))
+    second = spam_lexicon.load()
+    assert second is not first
+    assert "zorblax deal" in second.matcher().find("a ZORBLAX  deal")
+
+
+def test_sources_are_stated_at_most_once_per_window(artifact, monkeypatch):
+    calls, real = [], spam_lexicon._fingerprint
+    monkeypatch.setattr(spam_lexicon, "_fingerprint", lambda: calls.append(1) or real())
+    now = [1000.0]
+    monkeypatch.setattr(spam_lexicon.time, "monotonic", lambda: now[0])
+    first = spam_lexicon.load()                        # stats (and builds) once
+    calls.clear()
+    assert all(spam_lexicon.load() is first for _ in range(50)) and calls == []
+    assert spam_lexicon.load(reload=True) is first and len(calls) == 1
+    now[0] += spam_lexicon.RECHECK_SECONDS
+    assert spam_lexicon.load() is first and len(calls) == 2
@@ -0,0 +1,35 @@
+from utils import spam_rewrite
+from utils.spam_rewrite import rewrite_spam
+
+
+def test_local_replacements_keep_case_articles_and_spacing():
+    res = rewrite_spam("Please submit. We offer an opportunity on this AMAZING platform.")
+    assert res.text.startswith("Submit. We offer a window on this NOTABLE forum.")
+    assert ("opportunity", "window") in res.replaced
+
+
+def test_protected_regions_are_untouched():
+    text = ("Visit https://ex.org/explore-platform for the Amazing Journal.\n\n"
+            "Warm regards,\nExplore Team\nexplore@ex.org")
+    res = rewrite_spam(text, keep=["Amazing Journal"])
+    assert res.text == text[len("Visit "):]
+    assert not res.needs_llm
+
+
+def test_only_residue_sentences_go_to_the_llm():
+    res = rewrite_spam("Our groundbreaking issue is out. Act now, as we close soon.")
+    assert res.text.startswith("Our original issue is out.")
+    (span, terms), = res.residue_sentences()
+    prompt = res.llm_prompt()
+    assert "[1] Act now, as we close soon." in prompt and "out." not in prompt
+    merged = res.merge_llm("[1] We close on 30 May.\n")
+    assert merged == "Our original issue is out. We close on 30 May."
+    assert res.merge_llm("garbage") == res.text
+
+
+def test_stats_count_drafts_that_skip_the_llm(monkeypatch):
+    monkeypatch.setattr(spam_rewrite, "STATS", spam_rewrite.Counter())
+    rewrite_spam("A groundbreaking paper.")
+    rewrite_spam("Act now!")
+    s = spam_rewrite.stats()
+    assert (s["drafts"], s["llm_skipped"], s["llm_skip_rate"]) == (2, 1, 0.5)
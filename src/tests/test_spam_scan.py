@@ -0,0 +1,55 @@
+from scripts import qc_rules
+from utils.spam_scan import IncrementalScanner, scan
+
+
+def test_categories_follow_priority():
+    sc = scan("Seize this amazing chance – act now!")
+    cats = {h.term: h.category for h in sc.hits}
+    assert cats["seize"] == "hard_sell"           # also a hype word
+    assert cats["amazing"] == "hype"               # also a spam word
+    assert sc.terms("hard_sell") == {"seize", "act now"}
+    assert "amazing" in sc.terms("hype") and "amazing" in sc.terms("spam")
+
+
+def test_sub_list_spans_are_not_shadowed_by_other_lists():
+    sc = scan("We offer a massive discount.")
+    assert [h.term for h in sc.spans("hype")] == ["massive discount"]
+    assert "discount" in sc.terms("spam")
+
+
+def test_render_and_remover_terms_come_from_one_scan():
+    sc = scan("<b>Hurry</b>, amazing paper", exceptions={"paper"})
+    assert scan("<b>Hurry</b>, amazing paper", exceptions={"PAPER"}) is sc
+    assert sc.render(lambda frag, hit: f"[{frag}]", "hard_sell") == \
+        "&lt;b&gt;[Hurry]&lt;/b&gt;, amazing paper"
+    assert sc.remover_terms() == ["amazing (hype)", "hurry (hard_sell)"]
+
+
+def test_run_qc_reuses_passed_scan(monkeypatch):
+    text = "Dear colleague, an amazing and groundbreaking issue."
+    sc = scan(text)
+    monkeypatch.setattr(qc_rules, "scan", None)    # a second scan would fail
+    report = qc_rules.run_qc(text, submit_url="https://example.org/s",
+                             spam_scan=sc)
+    p2 = next(ln for ln in report["checklist"] if "P-2" in ln)
+    assert "hype=2" in p2 and "amazing, groundbreaking" in p2
+
+
+def test_incremental_scanner_rescans_only_changed_paragraphs():
+    inc = IncrementalScanner()
+    draft = "An amazing issue.\n\nAct now, please.\n\nPlain closing words."
+    first = inc.scan(draft)
+    assert inc.rescanned == 3
+    edited = draft.replace("Act now", "Act now or hurry")
+    second = inc.scan(edited)
+    assert inc.rescanned == 1
+    assert second.spans("hard_sell") == scan(edited).spans("hard_sell")
+    assert [h.term for h in first.spans("hype")] == ["amazing"]
+
+
+def test_incremental_scanner_reuses_clean_paragraphs():
+    inc = IncrementalScanner()
+    inc.scan("Plain words.\n\nPlain words.\n\nPlain words.")
+    assert inc.rescanned == 2                       # the repeat's cached () is a hit
+    inc.scan("Plain words.\n\nAmazing offer.")
+    assert inc.rescanned == 1
@@ -0,0 +1,49 @@
+from utils.tokens import _UNLOADED, TokenCounter, estimate_tokens, get_counter, n_tokens
+
+
+class _Encoding:                                  # tiktoken.Encoding shape, 1 token per word
+    def __init__(self):
+        self.calls = []
+
+    def encode_ordinary(self, text):
+        self.calls.append([text])
+        return text.split()
+
+    def encode_ordinary_batch(self, texts):
+        self.calls.append(list(texts))
+        return [t.split() for t in texts]
+
+
+def _counter(maxsize=4):
+    counter = TokenCounter(maxsize=maxsize)
+    counter._enc = _Encoding()
+    return counter
+
+
+def test_encoding_is_loaded_on_first_count_only():
+    counter = TokenCounter()
+    assert counter.count("hello world", estimate=True) == estimate_tokens("hello world")
+    assert counter._enc is _UNLOADED                      # estimates need no tokenizer
+    assert counter.count("hello world") > 0 and counter._enc is not _UNLOADED
+    assert n_tokens("hello world") == get_counter().count("hello world") > 0
+
+
+def test_counts_are_memoised_and_bounded():
+    counter = _counter(maxsize=2)
+    prompt = "one two three"
+    assert [counter.count(prompt) for _ in range(3)] == [3, 3, 3]
+    assert counter._enc.calls == [[prompt]]
+    assert counter.cache_info() == {"hits": 2, "misses": 1, "size": 1, "maxsize": 2}
+
+    counter.count("a"), counter.count("b")                 # evicts the oldest entry
+    counter.count(prompt)
+    assert len(counter._enc.calls) == 4
+
+
+def test_count_many_encodes_misses_in_one_batch():
+    counter = _counter()
+    counter.count("cached text")
+    counts = counter.count_many(["a b", "cached text", "c d e", "a b"])
+    assert counts == [2, 2, 3, 2]
+    assert counter._enc.calls[-1] == ["a b", "c d e"]    # one batch, duplicates encoded once
+    assert counter.count_many(["a b", "c d e"]) == [2, 3] and len(counter._enc.calls) == 2
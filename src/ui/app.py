@@ -5,32 +5,35 @@ Streamlit front-end for the 5-agent CFP pipeline.
 
 Order of execution
 ------------------
-1.  Writer (Crew)         – first-pass draft
+1.  Writer                – first-pass draft
 2.  spam_check.py         – detect hits
-3.  Spam-remover (Crew)   – rewrite
+3.  Spam-remover          – rewrite
 4.  qc_rules.py           – deterministic 18-rule checker
-5.  qc_tone.py (Crew)     – rate P-1, P-5, P-9   (only if needed)
-6.  qc_autofix.py (Crew)  – patch any ❌
-7.  htmlizer.py (Crew)    – plain-text → HTML
+5.  qc_tone.py            – rate P-1, P-5, P-9   (only if needed)
+6.  qc_autofix.py         – patch any ❌
+7.  htmlizer.py           – plain-text → HTML
 
-Each AI step logs tokens & latency via utils.db.log_prompt_output.
+Every AI step is a single agent + task, run with utils.direct_agent.run_task
+(no Crew).  Each logs tokens & latency via utils.db.log_prompt_output.
 """
 
 from __future__ import annotations
 import time, uuid, random
 import streamlit as st
-from crewai import Crew, Process
 
 # ---------- project imports ------------------------------------------ #
 from agents.writer import draft_writer_agent, build_writer_task
-from agents.spam_remover import spam_removal_agent, build_remover_task, strip_markers
+from agents.spam_remover import spam_removal_agent, build_residue_task
 from agents.qc_tone import qc_tone_agent, build_tone_task
 from agents.qc_autofix import qc_autofix_agent, build_autofix_task
 from agents.htmlizer import htmlizer_agent, build_html_task
-from scripts.spam_check import find_spam, highlight_spam
-from scripts.qc_rules import run_qc
+from scripts.qc_rules import run_qc, ALLOWED_SPAM_EXCEPTIONS
+from utils.spam_scan import CATEGORIES, scan
+from utils.spam_rewrite import rewrite_spam, stats as rewrite_stats
 from utils.db import log_prompt_output
+from utils.direct_agent import run_task
 from utils.tokens import n_tokens
+from utils.llm_telemetry import set_run_id
 
 # ------------------- helper stubs you must implement ----------------- #
 from utils.helpers import parse_full_date, as_text       #  ← add as_text
@@ -45,6 +48,7 @@ if "step" not in st.session_state:
     st.session_state.step = 0          # 0 = input, 1 = draft, … 6 = html
 if "run_id" not in st.session_state:
     st.session_state.run_id = str(uuid.uuid4())
+set_run_id(st.session_state.run_id)    # tags every LLM call's telemetry row
 
 # ═════════════════ 0 · INPUT FORM  (DB-driven) ════════════════════════ #
 if st.session_state.step == 0:
@@ -118,14 +122,7 @@ if st.session_state.step == 0:
         )
 
         t0   = time.time()
-        crew = Crew(
-        agents=[draft_writer_agent],
-        tasks=[writer_task],
-        process=Process.sequential,
-        verbose=False,
-        )
-
-        result = crew.kickoff()
+        result = run_task(writer_task)
 
         st.session_state.draft_raw = result.raw or str(result)
         log_prompt_output(writer_task.description,
@@ -142,19 +139,31 @@ if st.session_state.step == 0:
 elif st.session_state.step == 1:
     st.header("Spam-word scan")
     draft_raw = st.session_state.draft_raw
-    spam_hits = find_spam(draft_raw, exceptions={"deadline", "submission"})
-    st.markdown(highlight_spam(draft_raw), unsafe_allow_html=True)
-    st.info(f"Found {len(spam_hits)} spam hits: {', '.join(sorted(spam_hits))}"
+    draft_scan = scan(draft_raw, exceptions=ALLOWED_SPAM_EXCEPTIONS)  # one pass
+    spam_hits = draft_scan.remover_terms()
+    st.markdown(draft_scan.render(
+        lambda frag, hit: f'<span class="spam {hit.category}">{frag}</span>',
+        *CATEGORIES), unsafe_allow_html=True)
+    st.info(f"Found {len(spam_hits)} spam hits: {', '.join(spam_hits)}"
             if spam_hits else "No spam words 🎉")
+    rw = rewrite_stats()
+    if rw.get("drafts"):
+        st.caption(f"Local rewrite: LLM skipped for {rw['llm_skipped']}/"
+                   f"{rw['drafts']} drafts ({rw['llm_skip_rate']:.0%})")
 
     if st.button("Clean spam words 🧹"):
-        task = build_remover_task(draft_raw, list(spam_hits))
+        # local replacements first; the LLM only sees residue sentences
         t0 = time.time()
-        crew = Crew(agents=[spam_removal_agent], tasks=[task],
-                    process=Process.sequential, verbose=False)
-        cleaned = strip_markers(crew.kickoff().raw or "")
-        log_prompt_output(task.description, cleaned, "spam_remove",
-                          journal_name, spam_removal_agent.llm.model,
+        rewrite = rewrite_spam(draft_raw, keep=[journal_name, journal_short, issn],
+                               exceptions=ALLOWED_SPAM_EXCEPTIONS)
+        if rewrite.needs_llm:
+            task = build_residue_task(rewrite)
+            cleaned = rewrite.merge_llm(run_task(task).raw or "")
+            prompt, model = task.description, spam_removal_agent.llm.model
+        else:
+            cleaned, prompt, model = rewrite.text, "", "local-rewrite"
+        log_prompt_output(prompt, cleaned, "spam_remove",
+                          journal_name, model,
                           int((time.time() - t0) * 1000))
         st.session_state.draft_clean = cleaned
         st.session_state.step = 2
@@ -169,9 +178,7 @@ elif st.session_state.step == 2:
     if qc["need_ai"]:
         tone_task = build_tone_task(draft)
         t0 = time.time()
-        crew = Crew(agents=[qc_tone_agent], tasks=[tone_task],
-                    process=Process.sequential, verbose=False)
-        tone_lines = (crew.kickoff().raw or "").splitlines()
+        tone_lines = (run_task(tone_task).raw or "").splitlines()
         checklist += [ln.strip() for ln in tone_lines if ln.strip()]
         log_prompt_output(tone_task.description, "\n".join(tone_lines),
                           "qc_tone", journal_name, qc_tone_agent.llm.model,
@@ -195,9 +202,7 @@ elif st.session_state.step == 2:
                 quality_checklist="\n".join(checklist),
             )
             t0 = time.time()
-            crew = Crew(agents=[qc_autofix_agent], tasks=[task],
-                        process=Process.sequential, verbose=False)
-            fixed_body = as_text(crew.kickoff())
+            fixed_body = as_text(run_task(task))
             fixed = fixed_body + footer
             log_prompt_output(task.description, fixed, "qc_autofix",
                               journal_name, qc_autofix_agent.llm.model,
@@ -211,9 +216,7 @@ elif st.session_state.step == 4:
     st.header("Generate HTML")
     task = build_html_task(draft_final)
     t0 = time.time()
-    crew = Crew(agents=[htmlizer_agent], tasks=[task],
-                process=Process.sequential, verbose=False)
-    html_out = as_text(crew.kickoff())
+    html_out = as_text(run_task(task))
     log_prompt_output(task.description, html_out, "htmlizer",
                       journal_name, htmlizer_agent.llm.model,
                       int((time.time() - t0) * 1000))
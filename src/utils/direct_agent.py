@@ -0,0 +1,87 @@
+"""
+utils.direct_agent
+==================
+Run one CrewAI `Task` on its agent's LLM – no `Crew`.
+
+Every pipeline step used to build a one-agent, one-task
+`Crew(...).kickoff()`.  With no delegation and no tools that only adds
+the crew / agent-executor setup and the ReAct "Thought / Final Answer"
+round-trip on every call.  `run_task(task)` frames the agent persona and
+the task the way Crew presents them (`task_prompt`), sends that prompt
+straight through the agent's LLM wrapper – routing, response cache, rate
+limit and telemetry as before – and returns a `TaskResult` that honours
+the kickoff contract (`.raw`, `str(result)`, `json_dict`), so
+`as_text`, `parse_crew` and the sanitizers work unchanged.
+
+Crew stays in use only where agents actually delegate to each other (a
+multi-agent crew) or use tools; `run_task` refuses agents with tools.  An
+agent alone in its crew has no one to delegate to, so `allow_delegation`
+makes no difference here.
+
+Usage
+-----
+>>> result = run_task(build_html_task(draft))
+>>> html = html_output_sanitizer(result.raw)
+"""
+
+from __future__ import annotations
+import json, re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+__all__ = ["TaskResult", "run_task", "task_prompt"]
+
+_FINAL_ANSWER_RE = re.compile(r"^\s*(?:Thought:.*?\n)?\s*Final Answer:\s*", re.S)
+
+
+@dataclass
+class TaskResult:
+    """What `Crew.kickoff()` hands back, for a single task."""
+    raw: str
+    description: str = ""
+    agent: str = ""
+
+    @property
+    def json_dict(self) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self.raw)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+def task_prompt(agent, description: str, expected_output: str) -> str:
+    """The agent persona + task, framed the way Crew presents them to the LLM."""
+    return (
+        f"You are {agent.role}\n{agent.backstory}\n\n"
+        f"Your personal goal is: {agent.goal}\n\n"
+        f"Current Task: {description}\n\n"
+        f"This is the expected criteria for your final answer: {expected_output}\n"
+        "You MUST return the actual complete content as the final answer, not a summary.\n"
+    )
+
+
+def _call(llm, prompt: str) -> str:
+    if hasattr(llm, "invoke"):                     # LangChain LLMs (our wrappers)
+        out = llm.invoke(prompt)
+        return out if isinstance(out, str) else getattr(out, "content", str(out))
+    return llm.call([{"role": "user", "content": prompt}])   # crewai.LLM
+
+
+def run_task(task, agent=None, llm=None) -> TaskResult:
+    """
+    `Crew(agents=[agent], tasks=[task]).kickoff()` for a single agent
+    without tools.  *llm* overrides the agent's.
+    """
+    agent = agent or task.agent
+    if getattr(agent, "tools", None):
+        raise ValueError(f"agent {agent.role!r} uses tools – run it in a Crew")
+    text = _call(llm or agent.llm, task_prompt(agent, task.description, task.expected_output))
+    text = _FINAL_ANSWER_RE.sub("", text, count=1).strip()
+    if getattr(task, "output_file", None):
+        with open(task.output_file, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    return TaskResult(raw=text, description=task.description, agent=agent.role)
@@ -0,0 +1,81 @@
+"""
+utils.draft_stream
+==================
+Incremental view of the draft writer's output while it streams.
+
+The writer answers with ten `Subject: …` lines followed by the e-mail
+body.  `DraftStream.feed(piece)` takes the text exactly as it arrives
+(pieces split lines anywhere) and keeps
+
+    subjects   complete subject lines seen so far
+    body       body text so far, the unfinished last line included
+    text       the raw concatenation (what `filter_agent_output` parses
+               once the stream is done)
+
+so the page can show subjects and body separately from the first few
+tokens on.  `DraftStream(text)` rebuilds the view from a buffered
+partial answer when an interrupted stream is resumed.
+
+Usage
+-----
+>>> view = DraftStream()
+>>> for piece in llm.stream(prompt):
+...     view.feed(piece)
+...     box.markdown(view.markdown())
+"""
+
+from __future__ import annotations
+from typing import List
+
+__all__ = ["DraftStream", "SUBJECT_PREFIX"]
+
+SUBJECT_PREFIX = "Subject: "
+
+
+class DraftStream:
+    """Subjects / body split of a streamed writer answer."""
+
+    def __init__(self, text: str = ""):
+        self.text = ""
+        self.subjects: List[str] = []
+        self._body: List[str] = []
+        self._tail = ""                  # unfinished last line
+        if text:
+            self.feed(text)
+
+    def feed(self, piece: str) -> None:
+        if not piece:
+            return
+        self.text += piece
+        *lines, self._tail = (self._tail + piece).split("\n")
+        for line in lines:
+            if line.startswith(SUBJECT_PREFIX):
+                self.subjects.append(line[len(SUBJECT_PREFIX):].strip())
+            else:
+                self._body.append(line)
+
+    @property
+    def pending_subject(self) -> bool:
+        """The unfinished line is (or may still become) a subject line."""
+        return self._tail.startswith(SUBJECT_PREFIX) or (
+            bool(self._tail) and SUBJECT_PREFIX.startswith(self._tail))
+
+    @property
+    def body(self) -> str:
+        lines = self._body if self.pending_subject else self._body + [self._tail]
+        return "\n".join(lines).strip()
+
+    def markdown(self, cursor: str = " ▌") -> str:
+        """Subjects as a numbered list, then the body; *cursor* marks the live end."""
+        subjects = list(self.subjects)
+        if self.pending_subject and self._tail.startswith(SUBJECT_PREFIX):
+            subjects.append(self._tail[len(SUBJECT_PREFIX):] + cursor)
+            cursor = ""
+        parts = []
+        if subjects:
+            parts.append("**Subject lines**\n\n" +
+                         "\n".join(f"{n}. {s}" for n, s in enumerate(subjects, 1)))
+        body = self.body
+        if body or cursor:
+            parts.append(body + cursor)
+        return "\n\n---\n\n".join(parts)
@@ -0,0 +1,149 @@
+"""
+utils.draft_variants
+====================
+Generate N draft variants at once and pick the best.
+
+Each variant differs from the others by its template and/or creative
+enhancement prompt (`plan_variants`).  `run_variants` sends every variant
+through the caller's writer → rewrite → local spam pipeline concurrently,
+so N drafts take about as long as one, then scores each with the fast
+local QC (deterministic rules, no LLM).  `rank_variants` orders them by
+`AgentRanking.rank_drafts` (historic campaign performance) blended with
+the share of deterministic QC rules passed.
+
+Usage
+-----
+>>> variants = plan_variants(3, templates, CREATIVE_PROMPTS)
+>>> run_variants(variants, produce=write_variant, check=qc_det)
+>>> best, *rest = rank_variants(variants, ranker=agent_ranker)
+>>> st.session_state.draft_variants = [variant_record(v) for v in (best, *rest)]
+>>> st.session_state.update(adopted_state(st.session_state.draft_variants[0]))
+"""
+
+from __future__ import annotations
+import contextvars, random, time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+__all__ = ["Variant", "adopted_state", "plan_variants", "qc_fraction", "rank_variants",
+           "run_variants", "variant_record"]
+
+MAX_VARIANTS = 6
+
+
+@dataclass
+class Variant:
+    index: int
+    template: str
+    creative_prompt: str
+    subjects: List[str] = field(default_factory=list)
+    body: str = ""
+    qc: Dict[str, Any] = field(default_factory=dict)
+    qc_score: float = 0.0                 # share of deterministic QC rules passed
+    ranking_score: float = 0.0            # AgentRanking overall engagement potential
+    score: float = 0.0                    # blend of both, what the ranking uses
+    rank: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def text(self) -> str:
+        return "Subject Lines:\n" + "\n".join(self.subjects) + "\n\n" + self.body
+
+
+def _spread(pool: Sequence[str], n: int, rng: random.Random) -> List[str]:
+    """n picks, all different while the pool lasts."""
+    picks: List[str] = []
+    while len(picks) < n and pool:
+        picks += rng.sample(list(pool), min(len(pool), n - len(picks)))
+    return picks
+
+
+def plan_variants(n: int, templates: Sequence[str], creative_prompts: Sequence[str],
+                  rng: Optional[random.Random] = None) -> List[Variant]:
+    """*n* variants, spreading them over different templates and creative prompts."""
+    rng = rng or random.Random()
+    n = max(1, min(n, MAX_VARIANTS))
+    return [Variant(i, t, c) for i, (t, c) in enumerate(zip(_spread(templates, n, rng),
+                                                          _spread(creative_prompts, n, rng)))]
+
+
+def qc_fraction(report: Dict[str, Any]) -> float:
+    rules = [v for k, v in report.items() if not k.startswith("__")]
+    return sum(v is True for v in rules) / len(rules) if rules else 0.0
+
+
+def run_variants(variants: List[Variant],
+                 produce: Callable[[Variant], Tuple[List[str], str]],
+                 check: Callable[[str], Dict[str, Any]],
+                 workers: Optional[int] = None) -> List[Variant]:
+    """
+    Fill every variant concurrently: `produce(v)` → (subjects, body), then
+    `check(text)` → deterministic QC report.  A failing variant keeps its
+    error and does not stop the others.
+    """
+    def one(v: Variant) -> Variant:
+        t0 = time.monotonic()
+        try:
+            v.subjects, v.body = produce(v)
+            v.qc = check(v.text)
+            v.qc_score = qc_fraction(v.qc)
+        except Exception as e:                    # one bad variant ≠ no drafts
+            v.error = f"{type(e).__name__}: {e}"
+        v.seconds = time.monotonic() - t0
+        return v
+
+    # Own pool: the LLM calls inside `produce` queue on the provider pool,
+    # which the variants must not occupy themselves.
+    with ThreadPoolExecutor(max_workers=workers or len(variants) or 1,
+                            thread_name_prefix="draft-variant") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, one, v) for v in variants]
+        return [f.result() for f in futures]
+
+
+def rank_variants(variants: List[Variant], ranker=None, qc_weight: float = 0.5) -> List[Variant]:
+    """
+    Best first.  Score = (1 - qc_weight) × normalised AgentRanking score +
+    qc_weight × QC share; variants that failed to generate come last.
+    """
+    ok = [v for v in variants if not v.error]
+    if ranker is not None and ok:
+        ranked = ranker.rank_drafts([{"Subject": v.subjects[0] if v.subjects else "",
+                                      "Email": v.body} for v in ok])
+        for r in ranked:
+            ok[r["draft_id"]].ranking_score = float(r["ranking_score"])
+    lo = min((v.ranking_score for v in ok), default=0.0)
+    hi = max((v.ranking_score for v in ok), default=0.0)
+    for v in ok:
+        norm = (v.ranking_score - lo) / (hi - lo) if hi > lo else 1.0
+        v.score = (1 - qc_weight) * norm + qc_weight * v.qc_score
+    for v in variants:
+        if v.error:
+            v.score = -1.0
+    ordered = sorted(variants, key=lambda v: v.score, reverse=True)
+    for rank, v in enumerate(ordered, 1):
+        v.rank = rank
+    return ordered
+
+
+def variant_record(v: Variant) -> Dict[str, Any]:
+    """What the UI keeps of a ranked variant (plain values, session-state safe)."""
+    return {"rank": v.rank, "subjects": list(v.subjects), "body": v.body.strip(),
+            "text": v.text.strip(), "creative_prompt": v.creative_prompt,
+            "qc_score": v.qc_score, "ranking_score": v.ranking_score, "score": v.score,
+            "seconds": v.seconds}
+
+
+def adopted_state(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Session-state values that make a `variant_record` the current draft –
+    as the single-draft path leaves them: `draft_output` / `generated_draft`
+    hold the merged draft (subject lines + body), the spam-checked and
+    editable copies hold the body.
+    """
+    return {"subject_lines": list(record["subjects"]),
+            "draft_output": record["text"],
+            "generated_draft": record["text"],
+            "spam_checked_output": record["body"],
+            "editable_draft_content": record["body"]}
@@ -0,0 +1,260 @@
+"""
+utils.email_compact
+===================
+Shrink past campaign e-mails before they go into a writer prompt.
+
+The writer prompt carries the last ten `interspire_data` rows as examples.
+Raw, every `email` is full HTML with the `%%webversion%%` header, the
+unsubscribe footer and the same signature block ten times over.
+`compact_examples` keeps what the writer learns from – subject lines,
+paragraphing, bullets, bold, headings, tone – and drops the rest:
+
+1. `html_to_text`      HTML → structured text ("- " bullets, "**bold**",
+                       "## " headings, blank line between blocks);
+2. `strip_boilerplate` the Interspire header / footer that
+                       `clean_email_content` removes, plus stray link tags;
+3. shared blocks       paragraphs that recur in several rows (signatures,
+                       footers, fixed journal blurbs) are kept once in
+                       `shared` and replaced by "[S1]" references;
+4. `columnar`          one compact JSON object of parallel column lists.
+
+Token counts before (the indented JSON export the prompt used to embed)
+and after are kept per journal (`savings_by_journal`) and logged.
+
+Usage
+-----
+>>> ex = compact_examples(records, journal="IJN")
+>>> prompt += examples_heading(len(ex.rows)) + columnar(ex.rows, ex.shared)
+>>> ex.report()
+'IJN: 10 examples 14,210 → 2,385 tokens (-83%)'
+"""
+
+from __future__ import annotations
+import json, logging, re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .tokens import n_tokens
+
+__all__ = ["COLUMNAR_LEGEND", "EXAMPLES_HEADING", "EXAMPLES_RULES", "UNSUBSCRIBE_SUFFIX",
+           "WEBVERSION_PREFIX", "CompactExamples", "columnar", "columnar_fragment",
+           "compact_examples", "examples_heading", "html_to_text", "savings_by_journal",
+           "strip_boilerplate"]
+
+logger = logging.getLogger(__name__)
+
+# Interspire template boilerplate (also used by interspire_analysis.clean_email_content)
+WEBVERSION_PREFIX = ("Your email client cannot read this email. To view it online, please go here: "
+                     "%%webversion%% Dear Dr. %%First Name%%,")
+UNSUBSCRIBE_SUFFIX = "To stop receiving these emails:%%unsubscribelink%%"
+
+COLUMNAR_LEGEND = ("Columns are parallel lists, newest e-mail first. "
+                   "[S1], [S2] … stand for the `shared` blocks (signatures / footers "
+                   "common to several e-mails).")
+
+# The prompt section holding `columnar(...)`, and the static writer rules that
+# point at it (part of every WRITER_RULES prefix – keep both in step).
+EXAMPLES_HEADING = "Recent campaign e-mails"
+EXAMPLES_RULES = f"""### How to use the recent-campaign e-mails
+1. Parse the `{EXAMPLES_HEADING}` section below: one JSON object whose `subject`, `email` and `sent_date` lists are parallel columns, index 0 = the newest e-mail.
+2. In an `email` body, `[S1]`, `[S2]` … stand for the text under that key in the object's `shared` map (signatures / footers common to several e-mails). Read each e-mail with those blocks put back in place; never write `[S#]` markers yourself.
+3. Infer tone, length, and structure from those examples.
+4. Write a new CFP draft in a **similar style**, but with fresh content.
+5. Do **not** copy the old subjects verbatim—create new ones."""
+
+# The same boilerplate once tags are gone (spacing and line breaks vary).
+_BOILERPLATE_RES = [
+    re.compile(r"Your email client cannot read this email\.?\s*To view it online,?\s*"
+               r"please go here:?\s*%%webversion%%(?:\s*Dear Dr\.\s*%%First Name%%,)?", re.I),
+    re.compile(r"To stop receiving these emails:?\s*%%unsubscribelink%%", re.I),
+    re.compile(r"%%(?:webversion|unsubscribe\w*|\w*link)%%", re.I),   # stray link tags
+]
+
+_SKIP = {"script", "style", "head", "title"}
+_BOLD = {"b", "strong"}
+_HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_BLOCKS = {"p", "div", "ul", "ol", "table", "tr", "blockquote", "section", "hr", "center"}
+
+MIN_SHARED_CHARS = 40                     # shorter repeats cost less than a reference
+
+
+# -------------------------------------------------------------------- #
+# HTML → text                                                          #
+# -------------------------------------------------------------------- #
+class _TextParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.out: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP:
+            self._skip += 1
+        elif tag == "li":
+            self.out.append("\n- ")
+        elif tag in _HEADINGS:
+            self.out.append("\n\n## ")
+        elif tag in _BOLD:
+            self.out.append("**")
+        elif tag == "br":
+            self.out.append("\n")
+        elif tag in _BLOCKS:
+            self.out.append("\n\n")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BOLD:
+            self.out.append("**")
+        elif tag in _HEADINGS or tag in _BLOCKS:
+            self.out.append("\n\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.out.append(re.sub(r"\s+", " ", data))
+
+
+def _tidy(text: str) -> str:
+    text = re.sub(r"\*\*\s*\*\*", "", text)                   # empty / adjacent bold
+    lines = [re.sub(r"[ \t\xa0]+", " ", ln).strip() for ln in text.split("\n")]
+    text = "\n".join(ln for ln in lines if ln not in ("-", "**"))
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def html_to_text(html: Optional[str]) -> str:
+    """Structured plain text of an e-mail body; plain text passes through."""
+    if not isinstance(html, str):
+        return ""
+    if "<" not in html:
+        return _tidy(html)
+    parser = _TextParser()
+    parser.feed(html)
+    parser.close()
+    return _tidy("".join(parser.out))
+
+
+def strip_boilerplate(text: str) -> str:
+    for rx in _BOILERPLATE_RES:
+        text = rx.sub("", text)
+    return _tidy(text)
+
+
+# -------------------------------------------------------------------- #
+# Shared blocks                                                        #
+# -------------------------------------------------------------------- #
+def _key(paragraph: str) -> str:
+    return " ".join(paragraph.split()).lower()
+
+
+def _share_blocks(bodies: Sequence[str]) -> Tuple[List[str], Dict[str, str]]:
+    """Replace paragraphs found in ≥ 2 bodies by "[S#]"; return (bodies, shared)."""
+    split = [[p for p in body.split("\n\n") if p.strip()] for body in bodies]
+    seen: Dict[str, int] = {}
+    for paras in split:
+        for k in {_key(p) for p in paras if len(p) >= MIN_SHARED_CHARS}:
+            seen[k] = seen.get(k, 0) + 1
+
+    labels: Dict[str, str] = {}
+    shared: Dict[str, str] = {}
+    out: List[str] = []
+    for paras in split:
+        kept: List[str] = []
+        for p in paras:
+            k = _key(p)
+            if seen.get(k, 0) < 2:
+                kept.append(p)
+                continue
+            if k not in labels:
+                labels[k] = f"S{len(labels) + 1}"
+                shared[labels[k]] = p
+            ref = f"[{labels[k]}]"
+            if kept and re.fullmatch(r"(\[S\d+\])+", kept[-1]):
+                kept[-1] += ref                               # a signature spans paragraphs
+            else:
+                kept.append(ref)
+        out.append("\n\n".join(kept))
+    return out, shared
+
+
+# -------------------------------------------------------------------- #
+# Serialisation                                                        #
+# -------------------------------------------------------------------- #
+def _json_default(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+
+def columnar(rows: Sequence[Dict[str, Any]], shared: Optional[Dict[str, str]] = None) -> str:
+    """`{"col": [v1, v2, …], …, "shared": {...}}` – only blocks the rows reference."""
+    columns = list(rows[0]) if rows else []
+    data: Dict[str, Any] = {c: [r.get(c) for r in rows] for c in columns}
+    if shared:
+        used = _dumps(data)
+        refs = {k: v for k, v in shared.items() if f"[{k}]" in used}
+        if refs:
+            data["shared"] = refs
+    return _dumps(data)
+
+
+def examples_heading(n: int) -> str:
+    """Heading line of the examples section (*n* e-mails)."""
+    return f"📈 **{EXAMPLES_HEADING}** ({n}) – {COLUMNAR_LEGEND}"
+
+
+def columnar_fragment(row: Dict[str, Any]) -> str:
+    """What one row adds to `columnar` – for `metrics_packer.pack_rows`."""
+    return _dumps(list(row.values()))
+
+
+# -------------------------------------------------------------------- #
+# Public entry point                                                   #
+# -------------------------------------------------------------------- #
+@dataclass
+class CompactExamples:
+    rows: List[Dict[str, Any]]
+    shared: Dict[str, str] = field(default_factory=dict)
+    journal: str = ""
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def report(self) -> str:
+        pct = 100 * self.saved / self.tokens_before if self.tokens_before else 0.0
+        return (f"{self.journal or '?'}: {len(self.rows)} examples "
+                f"{self.tokens_before:,} → {self.tokens_after:,} tokens (-{pct:.0f}%)")
+
+
+_SAVINGS: Dict[str, CompactExamples] = {}
+
+
+def savings_by_journal() -> Dict[str, Tuple[int, int]]:
+    """journal → (tokens before, tokens after) of its latest compaction."""
+    return {j: (ex.tokens_before, ex.tokens_after) for j, ex in _SAVINGS.items()}
+
+
+def compact_examples(records: Sequence[Dict[str, Any]],
+                     columns: Sequence[str] = ("subject", "email", "sent_date"),
+                     body: str = "email",
+                     journal: str = "") -> CompactExamples:
+    """Compact *columns* of *records* (newest first); *body* is the HTML column."""
+    raw = [{c: r.get(c) for c in columns} for r in records]
+    bodies, shared = _share_blocks([strip_boilerplate(html_to_text(r.get(body))) for r in raw])
+    rows = [{**r, body: b} if body in r else dict(r) for r, b in zip(raw, bodies)]
+
+    ex = CompactExamples(rows, shared, journal)
+    ex.tokens_before = n_tokens(json.dumps(raw, indent=2, default=str))
+    ex.tokens_after = n_tokens(columnar(rows, shared))
+    if journal:
+        _SAVINGS[journal] = ex
+    logger.info("example compaction %s", ex.report())
+    return ex
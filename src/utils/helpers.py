@@ -187,8 +187,8 @@ def filter_agent_output(output_text: str, *, include_subjects: bool = False) ->
 # ------------------------------------------------------------------
 def as_text(result) -> str:
     """
-    Crew.kickoff() sometimes returns a plain str, sometimes an object
-    exposing `.raw`.  This helper always gives you the final text.
+    Crew.kickoff() / run_task() sometimes return a plain str, sometimes an
+    object exposing `.raw`.  This helper always gives you the final text.
     """
     return result if isinstance(result, str) else getattr(result, "raw", str(result))
 
@@ -0,0 +1,173 @@
+"""
+utils.http_clients
+==================
+Process-wide registry of pooled keep-alive HTTP clients for LLM calls.
+
+Every `openai.OpenAI()` and every fresh `litellm.completion` session
+used to open its own connections, so each agent step in the pipeline
+paid a TCP + TLS handshake.  Clients here are created once per provider
+(“openai”, “litellm”, …) and shared by all threads; async clients are
+kept per running event loop, since an `httpx.AsyncClient` is bound to
+the loop it was first used on.
+
+    http_client(name)          → httpx.Client
+    async_http_client(name)    → httpx.AsyncClient (current loop)
+    openai_client()            → openai.OpenAI on the shared "openai" pool
+    use_with_litellm()         → litellm.client_session = shared pool
+    stats()                    → {name: requests / connections / reused …}
+
+Pool limits come from the environment: `LLM_HTTP_MAX_CONN` (20),
+`LLM_HTTP_KEEPALIVE` (10 idle connections kept), `LLM_HTTP_KEEPALIVE_S`
+(60 s idle expiry).
+"""
+
+from __future__ import annotations
+import asyncio, atexit, os, threading, weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+__all__ = ["async_http_client", "close_all", "http_client", "openai_client",
+           "stats", "use_with_litellm"]
+
+TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=int(os.getenv("LLM_HTTP_MAX_CONN", 20)),
+                        max_keepalive_connections=int(os.getenv("LLM_HTTP_KEEPALIVE", 10)),
+                        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_S", 60)))
+
+
+# -------------------------------------------------------------------- #
+# Metrics                                                              #
+# -------------------------------------------------------------------- #
+class _Stats:
+    """Requests vs. new connections, counted from httpcore trace events."""
+
+    def __init__(self, limits: httpx.Limits):
+        self.limits = limits
+        self.requests = self.connections = self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    def _count(self, event: str) -> None:
+        with self._lock:
+            if event == "connection.connect_tcp.complete":
+                self.connections += 1
+            elif event == "connection.start_tls.complete":
+                self.tls_handshakes += 1
+
+    # sync hooks
+    def trace(self, event: str, info: dict) -> None:
+        self._count(event)
+
+    def on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self.trace
+
+    # async hooks
+    async def atrace(self, event: str, info: dict) -> None:
+        self._count(event)
+
+    async def aon_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self.atrace
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"requests": self.requests,
+                "connections": self.connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused": max(0, self.requests - self.connections),
+                "max_connections": self.limits.max_connections,
+                "max_keepalive": self.limits.max_keepalive_connections}
+
+
+def _open_connections(client) -> Optional[int]:
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    conns = getattr(pool, "connections", None)
+    return None if conns is None else len(conns)
+
+
+# -------------------------------------------------------------------- #
+# Registry                                                             #
+# -------------------------------------------------------------------- #
+_LOCK = threading.Lock()
+_CLIENTS: Dict[str, Tuple[httpx.Client, _Stats]] = {}
+_ASYNC: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Tuple[httpx.AsyncClient, _Stats]]]" \
+    = weakref.WeakKeyDictionary()
+_OPENAI: Dict[Tuple[Optional[str], Optional[str]], object] = {}
+
+
+def http_client(name: str = "default") -> httpx.Client:
+    """The shared keep-alive client for *name* (thread-safe)."""
+    with _LOCK:
+        found = _CLIENTS.get(name)
+        if found is None:
+            st = _Stats(_limits())
+            client = httpx.Client(limits=st.limits, timeout=TIMEOUT,
+                                  event_hooks={"request": [st.on_request]})
+            found = _CLIENTS[name] = (client, st)
+        return found[0]
+
+
+def async_http_client(name: str = "default") -> httpx.AsyncClient:
+    """The shared async client for *name* on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        per_loop = _ASYNC.setdefault(loop, {})
+        found = per_loop.get(name)
+        if found is None or found[0].is_closed:
+            st = _Stats(_limits())
+            client = httpx.AsyncClient(limits=st.limits, timeout=TIMEOUT,
+                                       event_hooks={"request": [st.aon_request]})
+            found = per_loop[name] = (client, st)
+        return found[0]
+
+
+def openai_client(base_url: Optional[str] = None, api_key: Optional[str] = None):
+    """`openai.OpenAI` reusing the "openai" pool; one instance per (base URL, key)."""
+    import openai                                     # only the callers that need it
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    key = (base_url, api_key)
+    with _LOCK:
+        client = _OPENAI.get(key)
+    if client is None:
+        client = openai.OpenAI(base_url=base_url, api_key=api_key,
+                               http_client=http_client("openai"))
+        with _LOCK:
+            client = _OPENAI.setdefault(key, client)
+    return client
+
+
+def use_with_litellm() -> None:
+    """Route litellm's OpenAI-compatible calls (OpenRouter …) through the shared pool."""
+    import litellm
+
+    if getattr(litellm, "client_session", None) is None:
+        litellm.client_session = http_client("litellm")
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """Per-client pool limits, request / connection counts and reuse."""
+    out: Dict[str, Dict[str, int]] = {}
+    with _LOCK:
+        entries = list(_CLIENTS.items())
+        for loop, per_loop in list(_ASYNC.items()):
+            entries += [(f"{name}@loop{id(loop):x}", found) for name, found in per_loop.items()]
+    for name, (client, st) in entries:
+        out[name] = {**st.snapshot(), "open_connections": _open_connections(client)}
+    return out
+
+
+@atexit.register
+def close_all() -> None:
+    """Close the sync clients (async ones close with their loop)."""
+    with _LOCK:
+        clients = [c for c, _ in _CLIENTS.values()]
+        _CLIENTS.clear()
+        _OPENAI.clear()
+    for client in clients:
+        client.close()
@@ -3,6 +3,22 @@ utils/llm.py
 ------------
  • Pure-OpenRouter LangChain wrapper (no Gemini fallback).
  • Exposes `.bind()` so CrewAI works.
+ • Completions go through the response cache (utils.llm_cache);
+   `llm.invoke(prompt, bypass_cache=True)` skips it for one call.
+ • litellm calls share one keep-alive HTTP pool (utils.http_clients).
+ • Calls run under the step's route policy (utils.llm_router): latency
+   budget, retries with backoff, hedging, fallback models.  Agents pick
+   their step with `openrouter_llm.for_step("writer")`; deterministic
+   steps (spam, qc, autofix, html, analysis) also get temperature 0 from
+   their policy, so their answers are response-cached.
+ • Each HTTP attempt waits for the process-wide RPM / TPM budget
+   (utils.llm_ratelimit); interactive steps go before batch analysis.
+ • Every call is measured (utils.llm_telemetry): tokens, latency, cost,
+   cache hit, per run id and step.
+ • `LLM_REPLAY=record|replay` swaps the provider for the fixture-backed
+   stand-in (utils.llm_replay) – offline runs and benchmarks.
+ • Multi-prompt generations fan out on the shared per-provider pool
+   (utils.llm_pool), sync and async (`_agenerate`); order is preserved.
 """
 
 from __future__ import annotations
@@ -12,13 +28,21 @@ from dotenv import load_dotenv
 
 from langchain_core.language_models.llms import BaseLLM
 from langchain_core.outputs import LLMResult
-from litellm import completion
+
+from .http_clients import use_with_litellm
+from .llm_cache import cached_completion
+from .llm_pool import amap_prompts, map_prompts, provider_of
+from .llm_ratelimit import throttle
+from .llm_replay import completion                  # litellm, or record / replay (LLM_REPLAY)
+from .llm_router import policy_for, route
+from .llm_telemetry import record_usage, track
 
 # ------------------------------------------------------------------ #
 #  Environment
 # ------------------------------------------------------------------ #
 load_dotenv()                               # loads .env in container
 OR_KEY = os.getenv("OPENROUTER_API_KEY")    # **required**
+use_with_litellm()                          # keep-alive pool shared by all calls
 
 # ------------------------------------------------------------------ #
 #  LangChain-compatible LLM
@@ -28,6 +52,8 @@ class OpenRouterLLM(BaseLLM):
     api_key:     str   = OR_KEY or ""
     base_url:    str   = "https://openrouter.ai/api/v1"
     temperature: float = 0.7
+    response_cache: Any = None      # LLMCache; None → shared cache (temperature 0 only), False → off
+    route:       str   = "default"  # pipeline step → RoutePolicy
 
     # ---- LangChain plumbing ----
     @property
@@ -42,6 +68,14 @@ class OpenRouterLLM(BaseLLM):
             "base_url": self.base_url,
         }
 
+    def for_step(self, step: str) -> "OpenRouterLLM":
+        """Same LLM, routed under *step*'s policy (and its temperature, if set)."""
+        update: dict = {"route": step}
+        temperature = policy_for(step).temperature
+        if temperature is not None:
+            update["temperature"] = temperature
+        return self.model_copy(update=update)
+
     # ---- generation ----
     def _generate(
         self,
@@ -49,21 +83,56 @@ class OpenRouterLLM(BaseLLM):
         stop: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> LLMResult:
+        one, provider = self._one_prompt(stop, kwargs)
+        texts = map_prompts(one, prompts, provider)
+        return LLMResult(generations=[[{"text": t}] for t in texts])
+
+    async def _agenerate(
+        self,
+        prompts: List[str],
+        stop: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> LLMResult:
+        one, provider = self._one_prompt(stop, kwargs)
+        texts = await amap_prompts(one, prompts, provider)
+        return LLMResult(generations=[[{"text": t}] for t in texts])
+
+    def _one_prompt(self, stop: Optional[List[str]], kwargs: dict):
+        """prompt → text callable for this request, plus its provider."""
         if not self.api_key:
             raise RuntimeError("OPENROUTER_API_KEY missing")
 
-        gens = []
-        for prompt in prompts:
-            resp = completion(
-                model       = kwargs.get("model", self.model),
-                api_key     = self.api_key,
-                base_url    = self.base_url,
-                messages    = [{"role": "user", "content": prompt}],
-                temperature = kwargs.get("temperature", self.temperature),
-                stop        = stop,
-            )
-            gens.append([{"text": resp.choices[0].message.content}])
-        return LLMResult(generations=gens)
+        bypass = kwargs.pop("bypass_cache", False)      # per-call opt-out
+        model = kwargs.get("model", self.model)
+        temperature = kwargs.get("temperature", self.temperature)
+        step = kwargs.pop("route", self.route)
+
+        def one(prompt: str) -> str:
+            messages = [{"role": "user", "content": prompt}]
+
+            def send(m: str, timeout: float) -> str:
+                with throttle(step, messages, timeout) as slot:   # shared RPM / TPM budget
+                    resp = completion(
+                        model       = m,
+                        api_key     = self.api_key,
+                        base_url    = self.base_url,
+                        messages    = messages,
+                        temperature = temperature,
+                        stop        = stop,
+                        timeout     = timeout,
+                        num_retries = 0,            # the router retries
+                    )
+                    slot.settle(resp)
+                record_usage(resp)
+                return resp.choices[0].message.content
+
+            with track(step, model):
+                return cached_completion(
+                    lambda: route(send, step=step, model=model),
+                    model=model, messages=messages, temperature=temperature, stop=stop,
+                    cache=self.response_cache, bypass=bypass,
+                )
+        return one, provider_of(model)
 
 # singleton used everywhere
 openrouter_llm = OpenRouterLLM()
@@ -0,0 +1,271 @@
+"""
+utils.llm_cache
+===============
+Response cache for the LangChain LLM wrappers (`common.CustomLiteLLM`,
+`utils.llm.OpenRouterLLM`).
+
+A completion is keyed by
+
+    blake2b(model × messages × temperature × stop sequences)
+
+so a Streamlit rerun, a retried task or the same historical e-mail
+re-analysed returns the stored text instead of a new (billed) call.
+Two tiers, like `utils.qc_cache`:
+
+    memory   per-process LRU (`LLM_CACHE_ITEMS`, default 256)
+    SQLite   `llm_cache.db` next to `journal_data.db` (`LLM_CACHE_PATH`),
+             entries expire after `LLM_CACHE_TTL` seconds (default 7 days)
+             and the table is LRU-pruned to `LLM_CACHE_ROWS` rows
+             (default 20 000).
+
+Streamed completions (`cached_stream`) are stored once the stream has
+run to the end; a hit replays the whole text as one piece.
+
+Sampling calls (temperature > 0 – the writer, rewrite and variant steps)
+skip the shared cache: "regenerate" and parallel variants must each reach
+the provider.  Passing an `LLMCache` explicitly caches them anyway.  The
+deterministic steps (analysis, spam, QC, autofix, HTML) get temperature 0
+from their route policy (`utils.llm_router`), so they are cached.
+
+`LLM_CACHE_PATH=off` keeps the memory tier only.  A single call skips the
+cache with `llm.invoke(prompt, bypass_cache=True)`; an LLM instance opts
+out with `response_cache=False`.  `hits` / `misses` on the cache feed the
+token-usage ledger (`cache_hits`).
+
+Usage
+-----
+>>> text = cached_completion(lambda: completion(**params).choices[0].message.content,
+...                          model=params["model"], messages=params["messages"],
+...                          temperature=0.7)
+"""
+
+from __future__ import annotations
+import hashlib, json, logging, os, sqlite3, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+__all__ = ["LLMCache", "cache_key", "cached_completion", "cached_stream", "get_llm_cache"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parents[2] / "llm_cache.db"
+DEFAULT_TTL = 7 * 24 * 3600              # seconds
+_PRUNE_EVERY = 100                       # inserts between SQLite prunes
+
+
+def cache_key(model: str, messages: Sequence[Dict[str, str]],
+              temperature: Optional[float] = None,
+              stop: Optional[Sequence[str]] = None) -> str:
+    """Stable key for one chat completion request."""
+    payload = json.dumps([model, list(messages), temperature, list(stop or ())],
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8", "surrogatepass"),
+                           digest_size=20).hexdigest()
+
+
+# -------------------------------------------------------------------- #
+# Two-tier store                                                       #
+# -------------------------------------------------------------------- #
+class LLMCache:
+    """In-process LRU in front of an optional SQLite table with TTL."""
+
+    def __init__(self, path: str | Path | None = DEFAULT_PATH,
+                 max_items: int = 256, max_rows: int = 20_000,
+                 ttl: Optional[float] = DEFAULT_TTL):
+        self.path = None if path in (None, "off") else str(path)
+        self.max_items = max_items
+        self.max_rows = max_rows
+        self.ttl = ttl or None
+        self.hits = self.misses = 0
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()     # key → (text, created)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._inserts = 0
+
+    # ---------------- SQLite tier ------------------------------------- #
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key         TEXT PRIMARY KEY,
+                    model       TEXT NOT NULL,
+                    response    TEXT NOT NULL,
+                    created_at  REAL NOT NULL,
+                    used_at     REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_used ON llm_cache(used_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _fresh(self, created: float, now: float) -> bool:
+        return self.ttl is None or now - created < self.ttl
+
+    def _remember(self, key: str, text: str, created: float) -> None:
+        self._mem[key] = (text, created)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            found = self._mem.get(key)
+            if found is not None and self._fresh(found[1], now):
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return found[0]
+            self._mem.pop(key, None)
+            db = self._db()
+            row = db.execute("SELECT response, created_at FROM llm_cache WHERE key = ?",
+                             (key,)).fetchone() if db else None
+            if row is None or not self._fresh(row[1], now):
+                if row is not None:
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    db.commit()
+                self.misses += 1
+                return None
+            db.execute("UPDATE llm_cache SET used_at = ? WHERE key = ?", (now, key))
+            db.commit()
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, text: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, text, now)
+            db = self._db()
+            if db is None:
+                return
+            db.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                       (key, model, text, now, now))
+            self._inserts += 1
+            if self._inserts % _PRUNE_EVERY == 0:
+                self._prune(db, now)
+            db.commit()
+
+    def _prune(self, db: sqlite3.Connection, now: float) -> None:
+        if self.ttl is not None:
+            db.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        db.execute("""DELETE FROM llm_cache WHERE key IN (
+                          SELECT key FROM llm_cache ORDER BY used_at DESC
+                          LIMIT -1 OFFSET ?)""", (self.max_rows,))
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            db = self._db()
+            if db:
+                db.execute("DELETE FROM llm_cache")
+                db.commit()
+
+
+_CACHE: Optional[LLMCache] = None
+_CACHE_PID = 0
+
+
+def get_llm_cache() -> LLMCache:
+    """Process-wide cache configured from the environment."""
+    global _CACHE, _CACHE_PID
+    if _CACHE is None or _CACHE_PID != os.getpid():     # new worker → own connection
+        _CACHE = LLMCache(os.getenv("LLM_CACHE_PATH") or DEFAULT_PATH,
+                          max_items=int(os.getenv("LLM_CACHE_ITEMS", 256)),
+                          max_rows=int(os.getenv("LLM_CACHE_ROWS", 20_000)),
+                          ttl=float(os.getenv("LLM_CACHE_TTL", DEFAULT_TTL)))
+        _CACHE_PID = os.getpid()
+    return _CACHE
+
+
+# -------------------------------------------------------------------- #
+# Call wrapper                                                         #
+# -------------------------------------------------------------------- #
+def _store(cache: Union[LLMCache, bool, None], temperature: Optional[float]) -> Optional[LLMCache]:
+    """The cache for this call; None = call the provider uncached."""
+    if isinstance(cache, LLMCache):
+        return cache
+    if cache is False or (temperature is not None and temperature > 0):
+        return None                        # sampled: every call should differ
+    return get_llm_cache()
+
+
+def cached_completion(
+    call: Callable[[], str],
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    stop: Optional[Sequence[str]] = None,
+    cache: Union[LLMCache, bool, None] = None,
+    bypass: bool = False,
+) -> str:
+    """
+    Text of `call()`, served from / stored in the response cache.
+
+    Parameters
+    ----------
+    call :
+        Performs the request and returns the completion text.
+    model, messages, temperature, stop :
+        The request parameters that make up the key.
+    cache :
+        An `LLMCache`; `None` → `get_llm_cache()` unless *temperature* > 0,
+        `False` → no caching.
+    bypass :
+        Skip the lookup for this call (the fresh answer is still stored).
+    """
+    store = _store(cache, temperature)
+    if store is None:
+        return call()
+    key = cache_key(model, messages, temperature, stop)
+    if not bypass:
+        found = store.get(key)
+        if found is not None:
+            logger.debug("LLM cache hit (%s, %s…)", model, key[:8])
+            return found
+    text = call()
+    if text is not None:
+        store.put(key, model, text)
+    return text
+
+
+def cached_stream(
+    call: Callable[[], Iterable[str]],
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    stop: Optional[Sequence[str]] = None,
+    cache: Union[LLMCache, bool, None] = None,
+    bypass: bool = False,
+) -> Iterator[str]:
+    """
+    Streaming twin of `cached_completion`: yields the text pieces of
+    `call()`.  The joined text is stored only when the stream finishes –
+    an interrupted stream (generator closed) leaves no entry.
+    """
+    store = _store(cache, temperature)
+    if store is None:
+        yield from call()
+        return
+    key = cache_key(model, messages, temperature, stop)
+    if not bypass:
+        found = store.get(key)
+        if found is not None:
+            logger.debug("LLM cache hit (%s, %s…, streamed)", model, key[:8])
+            yield found
+            return
+    parts: List[str] = []
+    for piece in call():
+        parts.append(piece)
+        yield piece
+    store.put(key, model, "".join(parts))
@@ -0,0 +1,85 @@
+"""
+utils.llm_pool
+==============
+Bounded, order-preserving fan-out of blocking LLM calls.
+
+LangChain hands `_generate` / `_agenerate` a *list* of prompts; the
+wrappers used to walk it one blocking `litellm.completion` at a time.
+`map_prompts(fn, prompts, provider)` runs `fn(prompt)` on a thread pool
+that is shared by every wrapper talking to the same provider, so the
+provider-wide limit holds however many agents, crews or Streamlit
+sessions are generating at once.  `amap_prompts` is the `await`-able
+twin for `_agenerate`; it uses the same pools.  Workers run in a copy of
+the caller's context, so context variables (the telemetry run id …)
+carry over.
+
+Limits come from the environment:
+
+    LLM_CONCURRENCY_<PROVIDER>   e.g. LLM_CONCURRENCY_OPENROUTER=16
+    LLM_CONCURRENCY              fallback for every provider (default 8)
+
+Usage
+-----
+>>> texts = map_prompts(lambda p: ask(p), prompts, provider_of(model))
+"""
+
+from __future__ import annotations
+import asyncio, contextvars, os, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Sequence, TypeVar
+
+__all__ = ["amap_prompts", "concurrency", "get_executor", "map_prompts", "provider_of"]
+
+T = TypeVar("T")
+DEFAULT_CONCURRENCY = 8
+
+_POOLS: Dict[str, ThreadPoolExecutor] = {}
+_LOCK = threading.Lock()
+
+
+def provider_of(model: str) -> str:
+    """`openrouter/google/gemini-…` → `openrouter`."""
+    return model.split("/", 1)[0] if "/" in model else "default"
+
+
+def concurrency(provider: str) -> int:
+    env = os.getenv(f"LLM_CONCURRENCY_{provider.upper().replace('-', '_')}") \
+        or os.getenv("LLM_CONCURRENCY")
+    return max(1, int(env)) if env else DEFAULT_CONCURRENCY
+
+
+def get_executor(provider: str) -> ThreadPoolExecutor:
+    """The process-wide pool for *provider* (created on first use)."""
+    with _LOCK:
+        pool = _POOLS.get(provider)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=concurrency(provider),
+                                      thread_name_prefix=f"llm-{provider}")
+            _POOLS[provider] = pool
+        return pool
+
+
+def map_prompts(fn: Callable[[str], T], prompts: Sequence[str], provider: str) -> List[T]:
+    """`[fn(p) for p in prompts]`, at most `concurrency(provider)` at a time.
+
+    A single prompt runs in the calling thread.  The first exception
+    propagates, as it did in the sequential loop.
+    """
+    if len(prompts) <= 1:
+        return [fn(p) for p in prompts]
+    pool = get_executor(provider)
+    futures = [pool.submit(contextvars.copy_context().run, fn, p) for p in prompts]
+    try:
+        return [f.result() for f in futures]
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        raise
+
+
+async def amap_prompts(fn: Callable[[str], T], prompts: Sequence[str], provider: str) -> List[T]:
+    """Async `map_prompts`: awaits the provider pool without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    pool = get_executor(provider)
+    return list(await asyncio.gather(*(loop.run_in_executor(pool, contextvars.copy_context().run, fn, p)
+                                       for p in prompts)))
@@ -0,0 +1,252 @@
+"""
+utils.llm_ratelimit
+===================
+Token-bucket limiter for every LLM request of the process – drafting
+sessions, the QC / spam agents and the interspire analysis share one
+requests-per-minute and one tokens-per-minute budget, so a batch job can
+no longer run the provider's rate limit dry for everyone else.
+
+The wrappers call `throttle(step, messages)` around each HTTP attempt:
+the prompt's estimated tokens are taken up front and corrected with the
+provider's token count once the response is in (`slot.settle(resp)`).
+
+Priority classes come from the step's `RoutePolicy.priority` (or
+`priority_context(...)`):
+
+    interactive   drafting – served first
+    batch         background analysis – waits while an interactive
+                  request is queued, and never takes the last
+                  `LLM_RATE_RESERVE` (default 10 %) of either bucket
+
+Configuration (unset / 0 → that bucket is unlimited):
+
+    LLM_RPM            requests per minute
+    LLM_TPM            prompt + completion tokens per minute
+    LLM_RATE_SHARED    SQLite file shared by every worker process on the
+                       host (`1` → `llm_ratelimit.db` in the repo root);
+                       unset → the buckets live in this process only
+
+Usage
+-----
+>>> with throttle("writer", messages) as slot:
+...     resp = completion(model=…, messages=messages)
+...     slot.settle(resp)
+"""
+
+from __future__ import annotations
+import contextvars, os, sqlite3, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .llm_router import policy_for
+from .tokens import n_tokens
+
+__all__ = ["PRIORITIES", "RateLimiter", "RateLimitTimeout", "get_limiter",
+           "priority_context", "throttle"]
+
+DEFAULT_SHARED_PATH = Path(__file__).resolve().parents[2] / "llm_ratelimit.db"
+PRIORITIES = ("interactive", "batch")          # first preempts the rest
+
+_PRIORITY: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_priority",
+                                                                          default=None)
+
+State = Dict[str, Tuple[float, float]]         # bucket → (level, updated_at)
+
+
+class RateLimitTimeout(TimeoutError):
+    """No request / token budget within the caller's timeout."""
+
+
+# -------------------------------------------------------------------- #
+# Bucket state: this process, or a SQLite file shared on the host      #
+# -------------------------------------------------------------------- #
+class _LocalState:
+    def __init__(self):
+        self._state: State = {}
+
+    def update(self, fn: Callable[[State], float]) -> float:
+        return fn(self._state)                 # the limiter's lock is held
+
+
+class _SharedState:
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS rate_buckets (
+                                name TEXT PRIMARY KEY, level REAL NOT NULL,
+                                updated_at REAL NOT NULL)""")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def update(self, fn: Callable[[State], float]) -> float:
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")          # one process at a time touches the buckets
+        try:
+            state = {n: (lvl, ts) for n, lvl, ts in
+                     db.execute("SELECT name, level, updated_at FROM rate_buckets")}
+            result = fn(state)
+            db.executemany("INSERT OR REPLACE INTO rate_buckets VALUES (?, ?, ?)",
+                           [(n, lvl, ts) for n, (lvl, ts) in state.items()])
+            db.execute("COMMIT")
+            return result
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+
+# -------------------------------------------------------------------- #
+# Limiter                                                              #
+# -------------------------------------------------------------------- #
+class RateLimiter:
+    """Requests- and tokens-per-minute buckets with priority classes."""
+
+    def __init__(self, rpm: float = 0, tpm: float = 0, *, reserve: float = 0.1,
+                 shared: str | Path | None = None):
+        self.limits = {name: float(per_min) for name, per_min in (("rpm", rpm), ("tpm", tpm))
+                       if per_min and per_min > 0}
+        self.reserve = reserve
+        self._state = _SharedState(shared) if shared else _LocalState()
+        self._cond = threading.Condition()
+        self._waiting = dict.fromkeys(PRIORITIES, 0)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.limits)
+
+    def _refilled(self, state: State, now: float) -> Dict[str, float]:
+        levels = {}
+        for name, per_min in self.limits.items():
+            level, ts = state.get(name, (per_min, now))
+            levels[name] = min(per_min, level + max(0.0, now - ts) * per_min / 60)
+        return levels
+
+    def _take(self, cost: Dict[str, float], reserve: float) -> float:
+        """Take *cost* now (→ 0.0) or return the seconds until it fits."""
+        def fn(state: State) -> float:
+            now = time.time()
+            levels = self._refilled(state, now)
+            wait = 0.0
+            for name, per_min in self.limits.items():
+                need = min(cost[name], per_min) + reserve * per_min
+                if levels[name] < need:
+                    wait = max(wait, (need - levels[name]) * 60 / per_min)
+            if wait:
+                return wait
+            for name in self.limits:
+                state[name] = (levels[name] - cost[name], now)
+            return 0.0
+        return self._state.update(fn)
+
+    def acquire(self, tokens: int = 0, priority: str = "interactive",
+                timeout: Optional[float] = None) -> float:
+        """Block until one request of ~*tokens* fits; returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        rank = PRIORITIES.index(priority) if priority in PRIORITIES else len(PRIORITIES) - 1
+        reserve = self.reserve if rank else 0.0
+        cost = {"rpm": 1.0, "tpm": float(tokens)}
+        t0 = time.monotonic()
+        deadline = None if timeout is None else t0 + timeout
+        with self._cond:
+            self._waiting[PRIORITIES[rank]] += 1
+            try:
+                while True:
+                    ahead = any(self._waiting[p] for p in PRIORITIES[:rank])
+                    wait = 0.5 if ahead else self._take(cost, reserve)
+                    if not wait:
+                        return time.monotonic() - t0
+                    if deadline is not None:
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            raise RateLimitTimeout(f"LLM rate limit: no {priority} slot "
+                                                   f"within {timeout:.0f}s")
+                        wait = min(wait, left)
+                    self._cond.wait(min(wait, 1.0))   # re-check: other processes refill too
+            finally:
+                self._waiting[PRIORITIES[rank]] -= 1
+                self._cond.notify_all()
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the provider reported *actual* tokens."""
+        if "tpm" not in self.limits or actual == estimated:
+            return
+        def fn(state: State) -> float:
+            now = time.time()
+            level = self._refilled(state, now)["tpm"] - (actual - estimated)
+            state["tpm"] = (max(-self.limits["tpm"], level), now)
+            for name in self.limits:
+                state.setdefault(name, (self.limits[name], now))
+            return 0.0
+        with self._cond:
+            self._state.update(fn)
+            self._cond.notify_all()
+
+
+# -------------------------------------------------------------------- #
+# Wrapper hook                                                         #
+# -------------------------------------------------------------------- #
+@contextmanager
+def priority_context(priority: str) -> Iterator[None]:
+    """Run the LLM calls of this block under *priority* (e.g. a batch job)."""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+class _Slot:
+    def __init__(self, limiter: RateLimiter, estimated: int):
+        self.limiter = limiter
+        self.estimated = estimated
+
+    def settle(self, response) -> None:
+        usage = getattr(response, "usage", None)
+        if not usage:
+            return
+        get = usage.get if isinstance(usage, dict) else lambda k: getattr(usage, k, None)
+        actual = int(get("total_tokens") or
+                     (get("prompt_tokens") or 0) + (get("completion_tokens") or 0))
+        if actual:
+            self.limiter.settle(self.estimated, actual)
+
+
+@contextmanager
+def throttle(step: str, messages: List[dict], timeout: Optional[float] = None) -> Iterator[_Slot]:
+    """Wait for this step's request / token budget, then run the block."""
+    limiter = get_limiter()
+    estimated = 0                                  # no limits (the default) → no tokenizing
+    if limiter.enabled:
+        if "tpm" in limiter.limits:
+            estimated = sum(n_tokens(str(m.get("content") or "")) for m in messages)
+        priority = _PRIORITY.get() or policy_for(step).priority
+        limiter.acquire(estimated, priority, timeout)
+    yield _Slot(limiter, estimated)
+
+
+_LIMITER: Optional[RateLimiter] = None
+_LIMITER_ENV: Optional[tuple] = None
+_ENV_VARS = ("LLM_RPM", "LLM_TPM", "LLM_RATE_RESERVE", "LLM_RATE_SHARED")
+
+
+def get_limiter() -> RateLimiter:
+    """The process-wide limiter configured from the environment."""
+    global _LIMITER, _LIMITER_ENV
+    env = tuple(os.getenv(v) for v in _ENV_VARS)
+    if _LIMITER is None or env != _LIMITER_ENV:
+        rpm, tpm, reserve, shared = env
+        if shared in ("1", "true", "yes"):
+            shared = str(DEFAULT_SHARED_PATH)
+        _LIMITER = RateLimiter(float(rpm or 0), float(tpm or 0),
+                               reserve=float(reserve) if reserve else 0.1,
+                               shared=shared or None)
+        _LIMITER_ENV = env
+    return _LIMITER
@@ -0,0 +1,267 @@
+"""
+utils.llm_replay
+================
+Record / replay stand-in for the LLM provider – offline end-to-end runs
+and benchmarks of `run_pipeline.py`, `src/ui/app.py` and
+`interspire_analysis/app.py`.
+
+`completion(**kwargs)` is a drop-in for `litellm.completion` (the LLM
+wrappers import it from here) and `chat_client(factory)` wraps the
+OpenAI client used by `qc_ai`.  Selected by `LLM_REPLAY`:
+
+    off      (default) straight to the provider
+    record   call the provider and save every prompt / response pair
+    replay   never touch the network: serve the saved pairs
+
+Fixtures are JSON files in `LLM_REPLAY_DIR` (default `llm_fixtures/` in
+the repo root), one per request, keyed like the response cache (model ×
+messages × temperature × stop).  Replay shapes the timing:
+
+    LLM_REPLAY_LATENCY_MS    fixed time to first token (default: as recorded)
+    LLM_REPLAY_TOKENS_PER_S  adds completion_tokens / rate (default: none)
+    LLM_REPLAY_ON_MISS       error (default) | nearest – the fixture of the
+                             same model whose prompt shares the longest prefix
+
+Token counts and cost are the recorded ones (chars / 4 when the provider
+sent none), so telemetry and budgets behave as in production.  Set
+`LLM_CACHE_PATH=off` when benchmarking, or the response cache answers
+repeated prompts before the stand-in sees them.
+
+Usage
+-----
+$ LLM_REPLAY=record streamlit run run_pipeline.py      # once, online
+$ LLM_REPLAY=replay LLM_CACHE_PATH=off streamlit run run_pipeline.py   # offline
+$ cd src && python -m scripts.bench_llm -c 8 --latency-ms 800 --tps 60
+"""
+
+from __future__ import annotations
+import json, os, threading, time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .llm_cache import cache_key
+from .tokens import estimate_tokens
+
+__all__ = ["LLMReplay", "ReplayMiss", "chat_client", "completion", "get_replay"]
+
+DEFAULT_DIR = Path(__file__).resolve().parents[2] / "llm_fixtures"
+MODES = ("off", "record", "replay")
+
+
+class ReplayMiss(LookupError):
+    """Replay mode and no fixture for this request."""
+
+
+def _usage_dict(usage) -> Optional[dict]:
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return dict(usage)
+    for attr in ("model_dump", "dict"):
+        if hasattr(usage, attr):
+            return getattr(usage, attr)()
+    return {k: getattr(usage, k, 0) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
+
+
+def _message(content: str) -> SimpleNamespace:
+    return SimpleNamespace(role="assistant", content=content)
+
+
+class LLMReplay:
+    """One fixture store + mode; `completion` mirrors `litellm.completion`."""
+
+    def __init__(self, mode: str = "off", store: str | Path = DEFAULT_DIR, *,
+                 upstream: Optional[Callable[..., Any]] = None,
+                 latency_ms: Optional[float] = None,
+                 tokens_per_s: Optional[float] = None,
+                 on_miss: str = "error"):
+        if mode not in MODES:
+            raise ValueError(f"LLM_REPLAY must be one of {MODES}, not {mode!r}")
+        self.mode = mode
+        self.store = Path(store)
+        self.upstream = upstream
+        self.latency_ms = latency_ms
+        self.tokens_per_s = tokens_per_s
+        self.on_miss = on_miss
+        self._lock = threading.Lock()
+        self._index: Optional[List[dict]] = None      # for on_miss="nearest"
+
+    # ---------------- fixture store ----------------------------------- #
+    @staticmethod
+    def key(kwargs: Dict[str, Any]) -> str:
+        return cache_key(kwargs.get("model", ""), kwargs.get("messages", []),
+                         kwargs.get("temperature"), kwargs.get("stop"))
+
+    def _path(self, key: str) -> Path:
+        return self.store / f"{key}.json"
+
+    def save(self, kwargs: Dict[str, Any], content: str, usage: Optional[dict],
+             cost: Optional[float], latency_ms: float) -> None:
+        record = {"model": kwargs.get("model"), "messages": kwargs.get("messages"),
+                  "temperature": kwargs.get("temperature"), "stop": kwargs.get("stop"),
+                  "content": content, "usage": usage, "cost_usd": cost,
+                  "latency_ms": round(latency_ms, 1), "recorded_at": time.time()}
+        with self._lock:
+            self.store.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(self.key(kwargs)).with_suffix(".tmp")
+            tmp.write_text(json.dumps(record, ensure_ascii=False, indent=1, default=str),
+                           encoding="utf-8")
+            tmp.replace(self._path(self.key(kwargs)))
+            self._index = None
+
+    def load(self, kwargs: Dict[str, Any]) -> dict:
+        path = self._path(self.key(kwargs))
+        if path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+        if self.on_miss == "nearest":
+            found = self._nearest(kwargs)
+            if found is not None:
+                return found
+        raise ReplayMiss(f"no LLM fixture for {kwargs.get('model')} "
+                         f"({self.key(kwargs)[:12]}…) in {self.store}")
+
+    def _nearest(self, kwargs: Dict[str, Any]) -> Optional[dict]:
+        with self._lock:
+            if self._index is None:
+                self._index = [json.loads(p.read_text(encoding="utf-8"))
+                               for p in sorted(self.store.glob("*.json"))]
+            index = self._index
+        prompt = json.dumps(kwargs.get("messages", []), ensure_ascii=False)
+        best, best_len = None, -1
+        for rec in index:
+            if rec.get("model") != kwargs.get("model"):
+                continue
+            other = json.dumps(rec.get("messages", []), ensure_ascii=False)
+            n = len(os.path.commonprefix([prompt, other]))
+            if n > best_len:
+                best, best_len = rec, n
+        return best
+
+    # ---------------- replay ------------------------------------------ #
+    def _usage(self, rec: dict) -> dict:
+        usage = dict(rec.get("usage") or {})
+        if not usage.get("prompt_tokens"):
+            usage["prompt_tokens"] = estimate_tokens(json.dumps(rec.get("messages", [])))
+        if not usage.get("completion_tokens"):
+            usage["completion_tokens"] = estimate_tokens(rec.get("content") or "")
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return usage
+
+    def _delays(self, rec: dict, usage: dict) -> tuple:
+        """(seconds to first token, seconds for the rest)."""
+        first = (self.latency_ms if self.latency_ms is not None
+                 else rec.get("latency_ms") or 0.0) / 1000
+        rest = usage["completion_tokens"] / self.tokens_per_s if self.tokens_per_s else 0.0
+        return first, rest
+
+    def _replay(self, kwargs: Dict[str, Any]):
+        rec = self.load(kwargs)
+        usage = self._usage(rec)
+        first, rest = self._delays(rec, usage)
+        content = rec.get("content") or ""
+        hidden = {"response_cost": rec.get("cost_usd") or 0.0, "replayed": True}
+        rid = f"replay-{self.key(kwargs)[:12]}"
+        if not kwargs.get("stream"):
+            time.sleep(first + rest)
+            return SimpleNamespace(id=rid, model=rec.get("model"), usage=usage,
+                                   _hidden_params=hidden,
+                                   choices=[SimpleNamespace(index=0, finish_reason="stop",
+                                                            message=_message(content))])
+        return self._replay_stream(rid, content, usage, hidden, first, rest)
+
+    @staticmethod
+    def _replay_stream(rid, content, usage, hidden, first, rest) -> Iterator[SimpleNamespace]:
+        words = content.split(" ")
+        pieces = [w + " " for w in words[:-1]] + [words[-1]] if content else []
+        time.sleep(first)
+        for piece in pieces:
+            if rest:
+                time.sleep(rest / len(pieces))
+            yield SimpleNamespace(id=rid, usage=None, _hidden_params=hidden,
+                                  choices=[SimpleNamespace(index=0, delta=_message(piece))])
+        yield SimpleNamespace(id=rid, usage=usage, _hidden_params=hidden, choices=[])
+
+    # ---------------- record ------------------------------------------ #
+    def _record_stream(self, kwargs: Dict[str, Any], chunks, t0: float):
+        parts: List[str] = []
+        usage = None
+        for chunk in chunks:
+            if getattr(chunk, "usage", None):
+                usage = _usage_dict(chunk.usage)
+            if getattr(chunk, "choices", None):
+                parts.append(chunk.choices[0].delta.content or "")
+            yield chunk
+        self.save(kwargs, "".join(parts), usage, None, (time.monotonic() - t0) * 1000)
+
+    # ---------------- entry points ------------------------------------ #
+    def completion(self, **kwargs):
+        if self.mode == "replay":
+            return self._replay(kwargs)
+        upstream = self.upstream or _litellm_completion
+        if self.mode == "off":
+            return upstream(**kwargs)
+        t0 = time.monotonic()
+        resp = upstream(**kwargs)
+        if kwargs.get("stream"):
+            return self._record_stream(kwargs, resp, t0)
+        self.save(kwargs, resp.choices[0].message.content, _usage_dict(getattr(resp, "usage", None)),
+                  (getattr(resp, "_hidden_params", None) or {}).get("response_cost"),
+                  (time.monotonic() - t0) * 1000)
+        return resp
+
+
+def _litellm_completion(**kwargs):
+    import litellm
+    return litellm.completion(**kwargs)
+
+
+# -------------------------------------------------------------------- #
+# Process-wide stand-in                                                #
+# -------------------------------------------------------------------- #
+_REPLAY: Optional[LLMReplay] = None
+_REPLAY_ENV: Optional[tuple] = None
+_ENV_VARS = ("LLM_REPLAY", "LLM_REPLAY_DIR", "LLM_REPLAY_LATENCY_MS",
+             "LLM_REPLAY_TOKENS_PER_S", "LLM_REPLAY_ON_MISS")
+
+
+def get_replay() -> LLMReplay:
+    """The stand-in configured from the environment (rebuilt when it changes)."""
+    global _REPLAY, _REPLAY_ENV
+    env = tuple(os.getenv(v) for v in _ENV_VARS)
+    if _REPLAY is None or env != _REPLAY_ENV:
+        mode, store, latency, rate, miss = env
+        _REPLAY = LLMReplay((mode or "off").lower(), store or DEFAULT_DIR,
+                            latency_ms=float(latency) if latency else None,
+                            tokens_per_s=float(rate) if rate else None,
+                            on_miss=miss or "error")
+        _REPLAY_ENV = env
+    return _REPLAY
+
+
+def completion(**kwargs):
+    """`litellm.completion`, recorded or replayed per `LLM_REPLAY`."""
+    return get_replay().completion(**kwargs)
+
+
+class _ReplayChat:
+    """`client.chat.completions.create(…)` through the stand-in."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        replay = get_replay()
+        if replay.mode == "replay":
+            return replay.completion(**kwargs)
+        client = self._factory()                  # record: the real client does the call
+        return LLMReplay("record", replay.store,
+                         upstream=client.chat.completions.create).completion(**kwargs)
+
+
+def chat_client(factory: Callable[[], Any]):
+    """The OpenAI client from *factory*, or its record/replay stand-in."""
+    if get_replay().mode == "off":
+        return factory()
+    return _ReplayChat(factory)
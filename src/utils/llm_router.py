@@ -0,0 +1,272 @@
+"""
+utils.llm_router
+================
+Retry, hedging and model fallback under the LLM wrappers.
+
+`route(send, step)` runs one completion under the step's `RoutePolicy`:
+
+    • each attempt gets the time left in the step's latency budget
+      (capped by `attempt_timeout`), passed to `send(model, timeout)`;
+    • transient failures (timeouts, 429, 5xx, dropped connections) are
+      retried with exponential backoff + jitter;
+    • when an attempt is still running after the model's observed p95
+      latency (or `hedge_after`), one duplicate request is sent and the
+      first answer wins;
+    • when a model keeps failing – or fails for good (bad request, auth)
+      – the next model in `models` is tried.
+
+Every attempt is recorded (`Attempt`): kept in a ring buffer (`attempts()`)
+and passed to registered sinks (`add_sink`) for analysis.
+
+Policies are per pipeline step; `ROUTE_<STEP>_MODELS`, `…_BUDGET`,
+`…_TIMEOUT`, `…_RETRIES`, `…_HEDGE_AFTER`, `…_PRIORITY` and `…_TEMPERATURE`
+override the defaults, e.g.
+`ROUTE_WRITER_MODELS="openrouter/google/gemini-2.5-flash-preview-05-20,openrouter/openai/gpt-4o-mini"`.
+
+A policy's `temperature` is applied by the wrappers' `for_step`: the
+deterministic steps (analysis, spam, QC, autofix, HTML) run at 0, so
+their answers are served from the response cache (`utils.llm_cache`);
+the writer keeps the LLM's sampling temperature.
+
+Usage
+-----
+>>> text = route(lambda model, timeout: completion(model=model, timeout=timeout, …)
+...              .choices[0].message.content, step="writer", model=llm.model)
+"""
+
+from __future__ import annotations
+import contextvars, logging, os, random, threading, time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, replace
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+__all__ = ["Attempt", "RoutePolicy", "RouteError", "add_sink", "attempts",
+           "is_transient", "latency_p95", "policy_for", "route"]
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[str, float], str]          # (model, timeout) → text
+
+_TRANSIENT_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 520, 522, 524, 529}
+_TRANSIENT_NAMES = ("timeout", "ratelimit", "apiconnection", "serviceunavailable",
+                    "internalserver", "connection", "overloaded")
+
+
+class RouteError(RuntimeError):
+    """Every model and retry of a step failed (or its budget ran out)."""
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    models: Tuple[str, ...] = ()          # ordered fallback list; () → the caller's model
+    budget: float = 120.0                 # seconds for the whole step
+    attempt_timeout: float = 60.0         # cap per attempt
+    retries: int = 2                      # extra attempts per model (transient errors)
+    backoff: float = 1.0                  # first backoff, doubled each retry
+    max_backoff: float = 8.0
+    hedge: bool = True
+    hedge_after: Optional[float] = None   # seconds; None → observed p95 of the model
+    min_samples: int = 20                 # latencies needed before p95 is trusted
+    priority: str = "interactive"         # rate-limit class (utils.llm_ratelimit): interactive | batch
+    temperature: Optional[float] = None   # None → the LLM's own; 0 → response-cached
+
+
+@dataclass
+class Attempt:
+    step: str
+    model: str
+    attempt: int                          # 1-based, per model
+    hedged: bool
+    ok: bool
+    latency: float
+    error: str = ""
+    started_at: float = field(default_factory=time.time)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+# -------------------------------------------------------------------- #
+# Policies                                                             #
+# -------------------------------------------------------------------- #
+POLICIES: Dict[str, RoutePolicy] = {
+    "default":   RoutePolicy(),
+    "writer":    RoutePolicy(budget=180.0, attempt_timeout=120.0),
+    "spam":      RoutePolicy(budget=90.0, temperature=0.0),
+    "qc":        RoutePolicy(budget=60.0, attempt_timeout=30.0, temperature=0.0),
+    "autofix":   RoutePolicy(budget=120.0, temperature=0.0),
+    "html":      RoutePolicy(budget=90.0, temperature=0.0),
+    "analysis":  RoutePolicy(budget=90.0, attempt_timeout=45.0, priority="batch",
+                             temperature=0.0),
+    "bench":     RoutePolicy(priority="batch"),
+}
+
+
+def policy_for(step: str) -> RoutePolicy:
+    """The step's policy with `ROUTE_<STEP>_*` environment overrides."""
+    base = POLICIES.get(step, POLICIES["default"])
+    env = lambda name: os.getenv(f"ROUTE_{step.upper()}_{name}")
+    over = {}
+    if env("MODELS"):
+        over["models"] = tuple(m.strip() for m in env("MODELS").split(",") if m.strip())
+    for name, attr, cast in (("BUDGET", "budget", float), ("TIMEOUT", "attempt_timeout", float),
+                             ("RETRIES", "retries", int), ("HEDGE_AFTER", "hedge_after", float),
+                             ("PRIORITY", "priority", str), ("TEMPERATURE", "temperature", float)):
+        if env(name):
+            over[attr] = cast(env(name))
+    return replace(base, **over) if over else base
+
+
+# -------------------------------------------------------------------- #
+# Attempt log + latency stats                                          #
+# -------------------------------------------------------------------- #
+_LOCK = threading.Lock()
+_ATTEMPTS: Deque[Attempt] = deque(maxlen=1000)
+_LATENCIES: Dict[str, Deque[float]] = {}
+_SINKS: List[Callable[[Attempt], None]] = []
+
+
+def add_sink(sink: Callable[[Attempt], None]) -> None:
+    """Call *sink(attempt)* for every recorded attempt (e.g. a telemetry table)."""
+    with _LOCK:
+        if sink not in _SINKS:
+            _SINKS.append(sink)
+
+
+def attempts() -> List[Attempt]:
+    """The most recent attempts (oldest first)."""
+    with _LOCK:
+        return list(_ATTEMPTS)
+
+
+def latency_p95(model: str) -> Optional[float]:
+    with _LOCK:
+        samples = sorted(_LATENCIES.get(model, ()))
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+
+def _record(a: Attempt) -> None:
+    with _LOCK:
+        _ATTEMPTS.append(a)
+        if a.ok:
+            _LATENCIES.setdefault(a.model, deque(maxlen=200)).append(a.latency)
+        sinks = list(_SINKS)
+    level = logging.DEBUG if a.ok else logging.WARNING
+    logger.log(level, "[route] %s %s #%d%s %s in %.2fs %s", a.step, a.model, a.attempt,
+               " (hedge)" if a.hedged else "", "ok" if a.ok else "failed", a.latency, a.error)
+    for sink in sinks:
+        try:
+            sink(a)
+        except Exception:                          # analysis must never break a call
+            logger.exception("route sink failed")
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Worth retrying: timeouts, rate limits, 5xx, dropped connections."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None),
+                                                          "status_code", None)
+    if isinstance(status, int):
+        return status in _TRANSIENT_STATUS
+    name = type(exc).__name__.lower()
+    return any(n in name for n in _TRANSIENT_NAMES)
+
+
+# -------------------------------------------------------------------- #
+# Routing                                                              #
+# -------------------------------------------------------------------- #
+_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-route")
+
+
+def _timed(send: Send, model: str, timeout: float) -> Tuple[str, float]:
+    t0 = time.monotonic()
+    return send(model, timeout), t0
+
+
+def _one_attempt(send: Send, step: str, model: str, n: int, timeout: float,
+                 policy: RoutePolicy) -> str:
+    """One attempt, hedged with a duplicate request once it runs past p95."""
+    hedge_at = policy.hedge_after
+    if hedge_at is None and policy.hedge:
+        with _LOCK:
+            enough = len(_LATENCIES.get(model, ())) >= policy.min_samples
+        hedge_at = latency_p95(model) if enough else None
+    if not policy.hedge or hedge_at is None or hedge_at >= timeout:
+        t0 = time.monotonic()
+        try:
+            text = send(model, timeout)
+        except BaseException as e:
+            _record(Attempt(step, model, n, False, False, time.monotonic() - t0, repr(e)))
+            raise
+        _record(Attempt(step, model, n, False, True, time.monotonic() - t0))
+        return text
+
+    started = time.monotonic()
+    submit = lambda t: _POOL.submit(contextvars.copy_context().run, _timed, send, model, t)
+    futures: Dict[Future, bool] = {submit(timeout): False}
+    done, _ = wait(futures, timeout=hedge_at)
+    if not done:                                   # slow → send the duplicate
+        futures[submit(max(1.0, timeout - hedge_at))] = True
+    error: Optional[BaseException] = None
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, started + timeout - time.monotonic()),
+                             return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for fut in done:
+            hedged = futures[fut]
+            try:
+                text, t0 = fut.result()
+            except BaseException as e:
+                _record(Attempt(step, model, n, hedged, False, time.monotonic() - started, repr(e)))
+                error = e
+                continue
+            _record(Attempt(step, model, n, hedged, True, time.monotonic() - t0))
+            for other in pending:                  # not sent yet → cancelled; in flight →
+                other.cancel()                     # its usage is logged late (llm_telemetry)
+            return text
+    if error is not None:
+        raise error
+    _record(Attempt(step, model, n, False, False, time.monotonic() - started, "timeout"))
+    raise TimeoutError(f"{model} gave no answer within {timeout:.0f}s")
+
+
+def route(send: Send, step: str = "default", model: Optional[str] = None,
+          policy: Optional[RoutePolicy] = None) -> str:
+    """
+    Text of `send(model, timeout)` under *step*'s policy.
+
+    *model* is the caller's model; it heads the fallback list unless the
+    policy names its own models.  Raises `RouteError` (chained to the last
+    failure) when the budget is spent or every model failed.
+    """
+    policy = policy or policy_for(step)
+    models = list(policy.models or ())
+    if model and model not in models and not policy.models:
+        models.insert(0, model)
+    if not models:
+        raise ValueError(f"no model to route step {step!r} to")
+
+    deadline = time.monotonic() + policy.budget
+    last: Optional[BaseException] = None
+    for m in models:
+        for n in range(1, policy.retries + 2):
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise RouteError(f"{step}: latency budget of {policy.budget:.0f}s spent") from last
+            try:
+                return _one_attempt(send, step, m, n, min(policy.attempt_timeout, left), policy)
+            except Exception as e:
+                last = e
+                if not is_transient(e):
+                    break                          # permanent for this model → fall back
+                if n <= policy.retries:
+                    pause = min(policy.max_backoff, policy.backoff * 2 ** (n - 1))
+                    time.sleep(min(pause * random.uniform(0.5, 1.0),
+                                   max(0.0, deadline - time.monotonic())))
+    raise RouteError(f"{step}: all models failed ({', '.join(models)})") from last
@@ -0,0 +1,305 @@
+"""
+utils.llm_telemetry
+===================
+One record per LLM call – tokens, latency, cost, cache hit – for every
+step of every run.
+
+The LLM wrappers open `track(step, model)` around each prompt; the
+request code reports the provider response with `record_usage(resp)`
+(called once per HTTP attempt, so hedged duplicates and retries are
+billed too).  A hedged duplicate that loses cannot be interrupted
+mid-request; when it finishes after its call was recorded, its usage gets
+a row of its own (`late`) – counted in tokens and cost, not in calls or
+latency.  A call that never reached `record_usage` was served by the
+response cache.  `cached_tokens` is the part of the prompt the provider
+served from its prefix cache; streamed calls also log the time to first
+token (`first_token()`), so both show whether a stable prompt prefix
+pays off across consecutive drafts.  Records are buffered and written in batches to the
+`llm_calls` table of `llm_telemetry.db` (`LLM_TELEMETRY_PATH`, `off`
+disables), every `LLM_TELEMETRY_BATCH` records (default 50) or 5 s.
+
+The run id comes from the context (`set_run_id` / `run_context`); the
+Streamlit apps set it to their `run_id`.  Worker threads started by
+`utils.llm_pool` / `utils.llm_router` inherit it.
+
+Usage
+-----
+>>> set_run_id(st.session_state.run_id)
+>>> get_telemetry().latency_by_step()          # p50 / p95 per step
+[{'step': 'writer', 'calls': 12, 'p50_ms': 8400.0, 'p95_ms': 15210.0, …}]
+"""
+
+from __future__ import annotations
+import atexit, contextvars, logging, os, sqlite3, threading, time
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+__all__ = ["CallRecord", "Telemetry", "first_token", "get_telemetry", "record_usage",
+           "run_context", "set_run_id", "track"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parents[2] / "llm_telemetry.db"
+FLUSH_SECONDS = 5.0
+
+_RUN_ID: contextvars.ContextVar[str] = contextvars.ContextVar("llm_run_id", default="")
+_CALL: contextvars.ContextVar[Optional["CallRecord"]] = contextvars.ContextVar("llm_call",
+                                                                                default=None)
+_T0: contextvars.ContextVar[float] = contextvars.ContextVar("llm_call_t0", default=0.0)
+
+
+@dataclass
+class CallRecord:
+    run_id: str
+    step: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    latency_ms: float = 0.0
+    ttft_ms: float = 0.0                  # streamed calls only
+    cost_usd: float = 0.0
+    cache_hit: bool = True                # until a provider response is recorded
+    ok: bool = True
+    late: bool = False                    # usage of an attempt that outlived its call
+    created_at: float = field(default_factory=time.time)
+
+    _closed = False                       # set when `track` queued the record (not a column)
+
+
+_COLUMNS = [f.name for f in fields(CallRecord)]
+_USAGE_LOCK = threading.Lock()            # hedged attempts report usage concurrently
+
+
+# -------------------------------------------------------------------- #
+# Context                                                              #
+# -------------------------------------------------------------------- #
+def set_run_id(run_id: str) -> None:
+    """Run id for the calls made from this context from now on."""
+    _RUN_ID.set(str(run_id))
+
+
+@contextmanager
+def run_context(run_id: str) -> Iterator[None]:
+    token = _RUN_ID.set(str(run_id))
+    try:
+        yield
+    finally:
+        _RUN_ID.reset(token)
+
+
+@contextmanager
+def track(step: str, model: str) -> Iterator[CallRecord]:
+    """Measure one LLM call; the record is queued when the block exits."""
+    rec = CallRecord(_RUN_ID.get(), step, model)
+    token = _CALL.set(rec)
+    t0 = time.monotonic()
+    t0_token = _T0.set(t0)
+    try:
+        yield rec
+    except BaseException:
+        rec.ok = rec.cache_hit = False
+        raise
+    finally:
+        _CALL.reset(token)
+        _T0.reset(t0_token)
+        with _USAGE_LOCK:
+            rec.latency_ms = round((time.monotonic() - t0) * 1000, 1)
+            rec._closed = True
+        get_telemetry().record(rec)
+
+
+def first_token() -> None:
+    """Mark the first streamed token of the call being tracked."""
+    rec = _CALL.get()
+    if rec is not None and not rec.ttft_ms:
+        rec.ttft_ms = round((time.monotonic() - _T0.get()) * 1000, 1)
+
+
+def _usage_field(usage, name: str) -> int:
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return int(value or 0)
+
+
+def record_usage(response) -> None:
+    """Add a provider response's tokens and cost to the call being tracked."""
+    rec = _CALL.get()
+    if rec is None:
+        return
+    usage = getattr(response, "usage", None) or {}
+    details = (usage.get("prompt_tokens_details") if isinstance(usage, dict)
+               else getattr(usage, "prompt_tokens_details", None)) or {}
+    cost = (getattr(response, "_hidden_params", None) or {}).get("response_cost")
+    if cost is None:
+        try:
+            import litellm
+            cost = litellm.completion_cost(completion_response=response)
+        except Exception:                      # unknown model price / not litellm
+            cost = 0.0
+    with _USAGE_LOCK:
+        late = rec._closed
+        if late:                               # a hedge loser finishing after the winner
+            rec = CallRecord(rec.run_id, rec.step, rec.model, latency_ms=0.0, late=True)
+        rec.prompt_tokens += _usage_field(usage, "prompt_tokens")
+        rec.completion_tokens += _usage_field(usage, "completion_tokens")
+        rec.cached_tokens += (_usage_field(details, "cached_tokens")
+                              or _usage_field(usage, "cache_read_input_tokens"))   # Anthropic
+        rec.cost_usd += float(cost or 0.0)
+        rec.cache_hit = False
+    if late:
+        get_telemetry().record(rec)
+
+
+# -------------------------------------------------------------------- #
+# Store                                                                #
+# -------------------------------------------------------------------- #
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+class Telemetry:
+    """Buffered writer + query helpers for the `llm_calls` table."""
+
+    def __init__(self, path: str | Path | None = DEFAULT_PATH, batch: int = 50):
+        self.path = None if path in (None, "off") else str(path)
+        self.batch = batch
+        self._buf: List[CallRecord] = []
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._flushed_at = time.monotonic()
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_calls (
+                    run_id             TEXT,
+                    step               TEXT NOT NULL,
+                    model              TEXT NOT NULL,
+                    prompt_tokens      INTEGER NOT NULL,
+                    completion_tokens  INTEGER NOT NULL,
+                    cached_tokens      INTEGER NOT NULL,
+                    latency_ms         REAL NOT NULL,
+                    ttft_ms            REAL NOT NULL DEFAULT 0,
+                    cost_usd           REAL NOT NULL,
+                    cache_hit          INTEGER NOT NULL,
+                    ok                 INTEGER NOT NULL,
+                    late               INTEGER NOT NULL DEFAULT 0,
+                    created_at         REAL NOT NULL
+                )""")
+            have = {row[1] for row in conn.execute("PRAGMA table_info(llm_calls)")}
+            for column, decl in (("ttft_ms", "REAL"), ("late", "INTEGER")):
+                if column not in have:            # tables from before the column was logged
+                    conn.execute(f"ALTER TABLE llm_calls ADD COLUMN {column} {decl} NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_calls_run ON llm_calls(run_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_calls_step ON llm_calls(step, created_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def record(self, rec: CallRecord) -> None:
+        with self._lock:
+            self._buf.append(rec)
+            due = (len(self._buf) >= self.batch or
+                   time.monotonic() - self._flushed_at >= FLUSH_SECONDS)
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._buf = self._buf, []
+            self._flushed_at = time.monotonic()
+            db = self._db()
+            if not rows or db is None:
+                return
+            try:
+                db.executemany(f"INSERT INTO llm_calls ({', '.join(_COLUMNS)}) "
+                               f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                               [astuple(r) for r in rows])
+                db.commit()
+            except sqlite3.Error:                 # telemetry must never break a call
+                logger.exception("LLM telemetry flush failed (%d rows dropped)", len(rows))
+
+    # ---------------- queries ----------------------------------------- #
+    def _query(self, sql: str, args: tuple = ()) -> List[tuple]:
+        self.flush()
+        db = self._db()
+        if db is None:
+            return []
+        with self._lock:
+            return db.execute(sql, args).fetchall()
+
+    def latency_by_step(self, since: Optional[float] = None,
+                        run_id: Optional[str] = None) -> List[Dict[str, object]]:
+        """p50 / p95 latency, p50 time to first token, calls, tokens, cost and cache hits per step."""
+        where, args = ["1 = 1"], []
+        if since is not None:
+            where.append("created_at >= ?"); args.append(since)
+        if run_id is not None:
+            where.append("run_id = ?"); args.append(run_id)
+        rows = self._query(f"""SELECT step, latency_ms, ttft_ms, prompt_tokens, completion_tokens,
+                                      cached_tokens, cost_usd, cache_hit, late FROM llm_calls
+                               WHERE {' AND '.join(where)} ORDER BY step, latency_ms""",
+                           tuple(args))
+        out: Dict[str, Dict[str, object]] = {}
+        lat: Dict[str, List[float]] = {}
+        ttft: Dict[str, List[float]] = {}
+        for step, ms, first, p_tok, c_tok, cached, cost, hit, late in rows:
+            s = out.setdefault(step, {"step": step, "calls": 0, "prompt_tokens": 0,
+                                      "completion_tokens": 0, "cached_tokens": 0,
+                                      "cost_usd": 0.0, "cache_hits": 0})
+            s["prompt_tokens"] += p_tok
+            s["completion_tokens"] += c_tok
+            s["cached_tokens"] += cached
+            s["cost_usd"] += cost
+            if late:                              # billed, but not a call of its own
+                continue
+            s["calls"] += 1
+            s["cache_hits"] += hit
+            lat.setdefault(step, []).append(ms)
+            if first:
+                ttft.setdefault(step, []).append(first)
+        for step, s in out.items():
+            s["p50_ms"] = _percentile(lat.get(step, []), 0.50)
+            s["p95_ms"] = _percentile(lat.get(step, []), 0.95)
+            s["ttft_p50_ms"] = _percentile(sorted(ttft.get(step, [])), 0.50)
+        return list(out.values())
+
+    def totals(self, run_id: str) -> Dict[str, float]:
+        """Token / cost / cache-hit totals of one run (usage ledgers)."""
+        row = self._query("""SELECT COALESCE(SUM(prompt_tokens), 0), COALESCE(SUM(completion_tokens), 0),
+                                    COALESCE(SUM(cached_tokens), 0), COALESCE(SUM(cost_usd), 0),
+                                    COALESCE(SUM(cache_hit), 0), COALESCE(SUM(1 - late), 0)
+                             FROM llm_calls WHERE run_id = ?""", (str(run_id),))
+        keys = ("prompt_tokens", "completion_tokens", "cached_tokens", "cost", "cache_hits", "calls")
+        return dict(zip(keys, row[0])) if row else dict.fromkeys(keys, 0)
+
+
+_TELEMETRY: Optional[Telemetry] = None
+_TELEMETRY_PID = 0
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide telemetry configured from the environment."""
+    global _TELEMETRY, _TELEMETRY_PID
+    if _TELEMETRY is None or _TELEMETRY_PID != os.getpid():
+        _TELEMETRY = Telemetry(os.getenv("LLM_TELEMETRY_PATH") or DEFAULT_PATH,
+                               batch=int(os.getenv("LLM_TELEMETRY_BATCH", 50)))
+        _TELEMETRY_PID = os.getpid()
+    return _TELEMETRY
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if _TELEMETRY is not None and _TELEMETRY_PID == os.getpid():
+        _TELEMETRY.flush()
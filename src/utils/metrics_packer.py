@@ -0,0 +1,126 @@
+"""
+utils.metrics_packer
+====================
+Fit recent-campaign rows into a prompt's token budget in one pass.
+
+The metrics blocks used to drop one row at a time and re-render +
+re-tokenize the whole block after each drop (quadratic in rows × body
+size), or drop the block outright.  `pack_rows` instead:
+
+1. renders every row's fragment (a table line, a JSON record …) once and
+   counts them in one `utils.tokens.count_many` batch – counts are
+   memoised there, so reruns of the same rows cost nothing;
+2. measures the frame (headings, waiver text, newest-row JSON …) once;
+3. finds the longest row prefix that fits with a prefix sum + bisect;
+4. when rows had to go, retries with long text columns truncated
+   (`col_limits`, loosest first) and keeps the setting that fits the
+   most rows;
+5. counts the rendered block once; if joining shifted the count past the
+   budget, drops the rows whose counted cost covers the overshoot.
+
+Rows are newest first, so a prefix keeps the most recent ones.
+
+Usage
+-----
+>>> packed = pack_rows(rows, fragment=table_line, frame=render, budget=6_000)
+>>> packed.text, len(packed.rows), packed.col_limit
+"""
+
+from __future__ import annotations
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .tokens import count_many, n_tokens
+
+__all__ = ["Packed", "json_record", "pack_rows", "table_header", "table_line", "truncate_row"]
+
+Row = Dict[str, Any]
+DEFAULT_COL_LIMITS = (None, 500, 200, 80)
+
+
+@dataclass
+class Packed:
+    text: str
+    rows: List[Row]                       # the rows that made it in (possibly truncated)
+    tokens: int
+    col_limit: Optional[int] = None       # text-column truncation used, None = none
+
+
+# -------------------------------------------------------------------- #
+# Fragments                                                            #
+# -------------------------------------------------------------------- #
+def truncate_row(row: Row, limit: Optional[int]) -> Row:
+    """*row* with every string value cut to *limit* characters."""
+    if limit is None:
+        return row
+    return {k: (v[:limit] + "…" if isinstance(v, str) and len(v) > limit else v)
+            for k, v in row.items()}
+
+
+def _cell(value: Any) -> str:
+    return " ".join(str("" if value is None else value).split()).replace("|", "\\|")
+
+
+def table_header(columns: Sequence[str]) -> str:
+    """Header + separator of a compact (unpadded) Markdown pipe table."""
+    return "| " + " | ".join(columns) + " |\n|" + "---|" * len(columns)
+
+
+def table_line(row: Row, columns: Sequence[str]) -> str:
+    return "| " + " | ".join(_cell(row.get(c)) for c in columns) + " |"
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def json_record(row: Row, indent: int = 2) -> str:
+    """One record of an indented JSON array (without the separating comma)."""
+    text = json.dumps(row, indent=indent, default=_json_default, ensure_ascii=False)
+    return "\n".join(" " * indent + line for line in text.splitlines())
+
+
+# -------------------------------------------------------------------- #
+# Packer                                                               #
+# -------------------------------------------------------------------- #
+def pack_rows(rows: Sequence[Row],
+              fragment: Callable[[Row], str],
+              frame: Callable[[List[Row]], str],
+              budget: int,
+              *,
+              sep: str = "\n",
+              col_limits: Sequence[Optional[int]] = DEFAULT_COL_LIMITS,
+              count: Optional[Callable[[str], int]] = None) -> Packed:
+    """
+    Largest row prefix (and loosest truncation) whose block fits *budget*.
+
+    fragment(row)        → the row's piece as it appears in the block
+                           (followed by *sep*) – only its cost is used
+    frame(rows)          → the whole block for *rows*
+    count(text)          → token count, default the shared `utils.tokens` counter
+    """
+    measure = count or n_tokens
+    best: Optional[Packed] = None
+    for limit in col_limits:
+        trimmed = [truncate_row(r, limit) for r in rows]
+        chunks = [fragment(r) + sep for r in trimmed]
+        costs = count_many(chunks) if count is None else [count(c) for c in chunks]
+        prefix = list(accumulate(costs, initial=0))
+        fixed = measure(frame(trimmed[:1])) - costs[0] if trimmed else 0   # block minus its rows
+        k = max(0, bisect_right(prefix, budget - fixed) - 1)
+        text = frame(trimmed[:k])
+        tokens = measure(text)
+        if k and tokens > budget:
+            # fragments tokenize slightly differently once joined: drop the
+            # oldest kept rows whose counted cost covers the overshoot
+            k = max(0, bisect_right(prefix, prefix[k] - (tokens - budget)) - 1)
+            text = frame(trimmed[:k])
+            tokens = measure(text)
+        if best is None or k > len(best.rows):
+            best = Packed(text, trimmed[:k], tokens, limit)
+        if k == len(rows):
+            break
+    return best if best is not None else Packed(frame([]), [], 0)
@@ -0,0 +1,120 @@
+"""
+utils.qc_batch
+==============
+Batch QC for backtests over historical bodies (`interspire_data.email`, …) –
+the bulk counterpart of `qc_script.validate` / `scripts.qc_rules.run_qc`.
+
+`check_many(check, texts)` streams *texts* in chunks to worker processes,
+runs the single-draft checker (`check(text) → {rule: bool}`, i.e. the same
+rule tables via `utils.qc_engine`) on every body and returns a boolean
+DataFrame – one row per body, one column per rule.  Only the boolean
+blocks travel back, and at most `2 × workers` chunks are in flight, so a
+server-side cursor can feed 100k+ bodies with flat memory.
+
+Most callers use the wrappers next to each checker:
+
+>>> from qc_script import validate_many
+>>> qc = validate_many(df["email"])                      # index kept
+>>> qc = validate_many(c.set_index("id")["email"] for c in iter_history())
+"""
+
+from __future__ import annotations
+import html, os, re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+__all__ = ["check_many"]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+Check = Callable[[str], Mapping[str, object]]
+
+
+def _plain(text, strip_html: bool) -> str:
+    if not isinstance(text, str):
+        return ""                            # NaN / None rows
+    return html.unescape(_TAG_RE.sub(" ", text)) if strip_html else text
+
+
+def _check_chunk(check: Check, texts: List[str], strip_html: bool) -> pd.DataFrame:
+    rows = [check(_plain(t, strip_html)) for t in texts]
+    return pd.DataFrame.from_records(rows).astype(bool)
+
+
+def _labelled(texts) -> Iterator[Tuple[Any, Any]]:
+    """(label, text) pairs from a Series, a list / iterator of strings or
+    an iterator of Series chunks (e.g. `pd.read_sql(..., chunksize=…)`)."""
+    if isinstance(texts, pd.Series):
+        yield from texts.items()
+        return
+    for n, item in enumerate(texts):
+        if isinstance(item, pd.Series):
+            yield from item.items()
+        else:
+            yield n, item
+
+
+def _chunks(pairs: Iterator[Tuple[Any, Any]], size: int
+            ) -> Iterator[Tuple[List[Any], List[Any]]]:
+    while True:
+        chunk = list(islice(pairs, size))
+        if not chunk:
+            return
+        labels, texts = zip(*chunk)
+        yield list(labels), list(texts)
+
+
+def check_many(
+    check: Check,
+    texts: Iterable,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    strip_html: bool = False,
+) -> pd.DataFrame:
+    """
+    Run *check* over many bodies; return a bool DataFrame (rows × rules).
+
+    Parameters
+    ----------
+    check :
+        Picklable single-draft checker returning `{rule: bool}` (a
+        module-level function or `functools.partial` of one).
+    texts :
+        pandas Series, list, iterator of strings or iterator of Series
+        chunks.  Series labels become the row index; plain strings are
+        numbered in arrival order.  NaN / None rows count as empty.
+    workers :
+        Worker processes (default: CPU count); `1` runs in-process.
+    chunk_size :
+        Bodies per task.
+    strip_html :
+        Drop tags and unescape entities first.  Off by default – the
+        structure rules (bullets, `<p>` signature) read the HTML.
+    """
+    workers = workers or os.cpu_count() or 1
+    if isinstance(texts, (list, tuple, pd.Series)) and len(texts) <= chunk_size:
+        workers = 1
+
+    parts: List[pd.DataFrame] = []
+    chunks = _chunks(_labelled(texts), chunk_size)
+    if workers <= 1:
+        for labels, batch in chunks:
+            parts.append(_check_chunk(check, batch, strip_html).set_axis(labels))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: deque = deque()
+            for labels, batch in chunks:
+                pending.append((labels, pool.submit(_check_chunk, check, batch, strip_html)))
+                if len(pending) >= 2 * workers:
+                    labels, fut = pending.popleft()
+                    parts.append(fut.result().set_axis(labels))
+            parts.extend(fut.result().set_axis(labels) for labels, fut in pending)
+
+    if not parts:
+        return pd.DataFrame(dtype=bool)
+    out = pd.concat(parts)
+    return out.fillna(False).astype(bool)      # a rule skipped on some rows
@@ -0,0 +1,245 @@
+"""
+utils.qc_cache
+==============
+Content-addressed cache for QC verdicts – deterministic (`qc_script`,
+`qc_rules`) and LLM (`qc_ai`, billed per call).
+
+A verdict is keyed by
+
+    blake2b(draft)  ×  rule-set version  ×  key args (model, submit URL …)
+                    [× today's date, for `dated` checkers]
+
+The rule-set version hashes the checker's source files plus the spam
+lexicon and `utils.spam_scan` (scan lists, allowed exceptions), so editing
+a rule or a word list invalidates old verdicts automatically.  Checkers
+with date-relative rules ("deadline within 60 days") pass `dated=True`;
+their verdicts only live for the day.  Two tiers:
+
+    memory   per-process LRU (`QC_CACHE_ITEMS`, default 256)
+    SQLite   `qc_cache.db` next to `journal_data.db` (`QC_CACHE_PATH`),
+             LRU-pruned to `QC_CACHE_ROWS` rows (default 50 000);
+             shared by Streamlit reruns, sessions and batch workers.
+
+`QC_CACHE_PATH=off` keeps the memory tier only.
+
+Usage
+-----
+>>> validate_cached = CachedCheck("qc_script.validate", validate,
+...                               sources=[__file__], dated=True)
+>>> validate_cached(draft)                 # computed once, then served
+>>> score_cached = CachedCheck("qc_ai.score", score, key_args=("model",))
+"""
+
+from __future__ import annotations
+import datetime, hashlib, inspect, json, os, sqlite3, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from . import spam_lexicon, spam_scan
+from .spam_scan import SCAN_LISTS
+
+__all__ = ["CachedCheck", "QCCache", "get_cache", "ruleset_version"]
+
+DEFAULT_PATH = Path(__file__).resolve().parents[2] / "qc_cache.db"
+_PRUNE_EVERY = 100                       # inserts between SQLite prunes
+
+
+# -------------------------------------------------------------------- #
+# Rule-set version                                                     #
+# -------------------------------------------------------------------- #
+_VERSIONS: Dict[Tuple[str, ...], Tuple[tuple, object, str]] = {}
+
+
+def _stat(paths: Sequence[str]) -> tuple:
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((0, 0))
+    return tuple(out)
+
+
+def ruleset_version(*sources: str | Path) -> str:
+    """Hash of the *sources* files' contents + `utils.spam_scan` + the spam lexicon words."""
+    paths = tuple(str(p) for p in sources) + (spam_scan.__file__,)
+    lex = spam_lexicon.load()
+    stat = _stat(paths)
+    cached = _VERSIONS.get(paths)
+    if cached and cached[0] == stat and cached[1] is lex:
+        return cached[2]
+    h = hashlib.blake2b(digest_size=12)
+    for p in paths:
+        try:
+            h.update(Path(p).read_bytes())
+        except OSError:
+            h.update(b"\0missing\0" + p.encode())
+    for name in SCAN_LISTS:
+        h.update("\n".join(lex.words(name)).encode("utf-8") + b"\0")
+    version = h.hexdigest()
+    _VERSIONS[paths] = (stat, lex, version)
+    return version
+
+
+# -------------------------------------------------------------------- #
+# Two-tier store                                                       #
+# -------------------------------------------------------------------- #
+class QCCache:
+    """In-process LRU in front of an optional SQLite table."""
+
+    def __init__(self, path: str | Path | None = DEFAULT_PATH,
+                 max_items: int = 256, max_rows: int = 50_000):
+        self.path = None if path in (None, "off") else str(path)
+        self.max_items = max_items
+        self.max_rows = max_rows
+        self.hits = self.misses = 0
+        self._mem: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._inserts = 0
+
+    # ---------------- SQLite tier ------------------------------------- #
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS qc_cache (
+                    key      TEXT PRIMARY KEY,
+                    checker  TEXT NOT NULL,
+                    result   TEXT NOT NULL,
+                    used_at  REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS qc_cache_used ON qc_cache(used_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, result: dict) -> None:
+        self._mem[key] = result
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            found = self._mem.get(key)
+            if found is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return dict(found)
+            db = self._db()
+            row = db.execute("SELECT result FROM qc_cache WHERE key = ?",
+                             (key,)).fetchone() if db else None
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE qc_cache SET used_at = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+            found = json.loads(row[0])
+            self._remember(key, found)
+            self.hits += 1
+            return dict(found)
+
+    def put(self, key: str, checker: str, result: dict) -> None:
+        with self._lock:
+            self._remember(key, dict(result))
+            db = self._db()
+            if db is None:
+                return
+            db.execute("INSERT OR REPLACE INTO qc_cache VALUES (?, ?, ?, ?)",
+                       (key, checker, json.dumps(result, ensure_ascii=False), time.time()))
+            self._inserts += 1
+            if self._inserts % _PRUNE_EVERY == 0:
+                db.execute("""DELETE FROM qc_cache WHERE key IN (
+                                  SELECT key FROM qc_cache ORDER BY used_at DESC
+                                  LIMIT -1 OFFSET ?)""", (self.max_rows,))
+            db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            db = self._db()
+            if db:
+                db.execute("DELETE FROM qc_cache")
+                db.commit()
+
+
+_CACHE: Optional[QCCache] = None
+_CACHE_PID = 0
+
+
+def get_cache() -> QCCache:
+    """Process-wide cache configured from the environment."""
+    global _CACHE, _CACHE_PID
+    if _CACHE is None or _CACHE_PID != os.getpid():     # new worker → own connection
+        _CACHE = QCCache(os.getenv("QC_CACHE_PATH") or DEFAULT_PATH,
+                         max_items=int(os.getenv("QC_CACHE_ITEMS", 256)),
+                         max_rows=int(os.getenv("QC_CACHE_ROWS", 50_000)))
+        _CACHE_PID = os.getpid()
+    return _CACHE
+
+
+# -------------------------------------------------------------------- #
+# Checker wrapper                                                      #
+# -------------------------------------------------------------------- #
+def _today() -> datetime.date:
+    return datetime.date.today()
+
+
+class CachedCheck:
+    """
+    `fn(text, …) → dict` served from the cache.
+
+    Parameters
+    ----------
+    checker :
+        Stable name, stored with each row (e.g. "qc_ai.score").
+    fn :
+        The checker; must return a JSON-serialisable dict.
+    sources :
+        Files whose contents define the rule set (default: *fn*'s module).
+    key_args :
+        Argument names of *fn* that change the verdict (model, URL …);
+        their values – defaults included – join the key.
+    dated :
+        The verdict depends on today's date (deadline windows …); the
+        date joins the key, so yesterday's verdicts are never served.
+    """
+
+    def __init__(self, checker: str, fn: Callable[..., dict], *,
+                 sources: Iterable[str | Path] = (),
+                 key_args: Sequence[str] = (),
+                 dated: bool = False):
+        self.checker = checker
+        self.fn = fn
+        self.sources = tuple(str(p) for p in sources) or (inspect.getfile(fn),)
+        self.key_args = tuple(key_args)
+        self.dated = dated
+
+    def key(self, text: str, *args, **kwargs) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{self.checker}\0{ruleset_version(*self.sources)}\0".encode())
+        if self.dated:
+            h.update(f"date={_today().isoformat()}\0".encode())
+        if self.key_args:
+            bound = inspect.signature(self.fn).bind(text, *args, **kwargs)
+            bound.apply_defaults()
+            for name in self.key_args:
+                h.update(f"{name}={bound.arguments.get(name)!r}\0".encode())
+        h.update(text.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def __call__(self, text: str, *args, **kwargs) -> dict:
+        cache = get_cache()
+        key = self.key(text, *args, **kwargs)
+        found = cache.get(key)
+        if found is None:
+            found = self.fn(text, *args, **kwargs)
+            cache.put(key, self.checker, found)
+        return found
@@ -0,0 +1,212 @@
+"""
+utils.qc_engine
+===============
+Shared draft facts + rule runner behind the three deterministic checkers:
+
+    qc_script.validate                     → {rule: bool, …, "__PASS__"}
+    quality_check_rules.run_quality_check  → {"passed", "checklist"}
+    scripts.qc_rules.run_qc                → {"passed", "checklist", "need_ai"}
+
+`facts(text)` returns a `Draft` whose artifacts are computed at most once
+and shared by every rule of every checker run on the same text:
+
+    lower        `text.lower()`; `folded` is the `re.I` view (same length)
+    lines        `str.splitlines()` lines and their character spans
+    words(p)     tokenisation by pattern *p* (each checker counts its own way)
+    urls         `https?://…` runs                 emails    e-mail addresses
+    dates        “31 July 2025” (day month year)   signature sign-off → end
+    body         greeting → e-mail line, as `quality_check_rules` reads it
+    spam         the memoised `utils.spam_scan` pass; `body_spam` views it
+
+`findall()` / `search()` memoise any other compiled pattern and `memo()`
+any checker-specific derived fact.  A checker declares its rules once as
+`Rule(key, check)` tuples – `check(draft, ctx)` returns a bool,
+`(bool, note)` or None (rule skipped) – and `evaluate()` runs them in
+order; the checker only formats the verdicts into its own result shape.
+
+Usage
+-----
+>>> d = facts(draft)
+>>> [(key, ok) for key, ok, _ in evaluate(RULES, d, {"submit_url": url})]
+"""
+
+from __future__ import annotations
+import re, threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import (Callable, Dict, Iterable, Iterator, List, Mapping,
+                    NamedTuple, Optional, Pattern, Tuple, Union)
+
+from .spam_scan import SpamScan, scan
+
+__all__ = ["Draft", "Rule", "evaluate", "facts"]
+
+URL_RE = re.compile(r"https?://\S+", re.I)
+EMAIL_RE = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.I)
+DATE_RE = re.compile(r"\b(\d{1,2}\s+[A-Za-z]+\s+\d{4})\b")      # 31 July 2025
+SIGN_OFF_RE = re.compile(r"warm regards|sincerely|kind regards")  # on `folded`
+_FOLD = str.maketrans("ıſ", "is")          # `re.I` matches these to 'i' / 's'
+
+Span = Tuple[int, int]
+Verdict = Union[bool, Tuple[bool, str], None]
+
+
+class Draft:
+    """Lazily computed, cached facts about one draft text."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self._memo: Dict[object, object] = {}
+
+    # ---------------- generic memo ------------------------------------ #
+    def memo(self, fn: Callable[["Draft"], object]):
+        """`fn(self)`, computed once per draft."""
+        try:
+            return self._memo[fn]
+        except KeyError:
+            value = self._memo[fn] = fn(self)
+            return value
+
+    def findall(self, pattern: Pattern, *, folded: bool = False) -> list:
+        """`pattern.findall` over the text (or `folded`), memoised."""
+        key = ("findall", pattern, folded)
+        try:
+            return self._memo[key]
+        except KeyError:
+            found = self._memo[key] = pattern.findall(self.folded if folded else self.text)
+            return found
+
+    def search(self, pattern: Pattern, *, folded: bool = False):
+        """`pattern.search` over the text (or `folded`), memoised."""
+        key = ("search", pattern, folded)
+        try:
+            return self._memo[key]
+        except KeyError:
+            found = self._memo[key] = pattern.search(self.folded if folded else self.text)
+            return found
+
+    def words(self, pattern: Pattern) -> List[str]:
+        return self.findall(pattern)
+
+    # ---------------- shared artifacts -------------------------------- #
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def folded(self) -> str:
+        """
+        Lower-cased like `re.I` sees the text, same length as `text`: a
+        lower-case pattern on `folded` behaves like the case-insensitive
+        one on `text`, only faster.
+        """
+        low = self.lower
+        if len(low) != len(self.text):           # e.g. 'İ' → 'i̇' (2 chars)
+            low = "".join(ch.lower()[:1] for ch in self.text)
+        return low.translate(_FOLD)
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.splitlines()
+
+    @cached_property
+    def line_spans(self) -> List[Span]:
+        spans, pos = [], 0
+        for raw in self.text.splitlines(keepends=True):
+            spans.append((pos, pos + len(raw.splitlines()[0])))
+            pos += len(raw)
+        return spans
+
+    @cached_property
+    def urls(self) -> List[str]:
+        return URL_RE.findall(self.text)
+
+    @cached_property
+    def emails(self) -> List[str]:
+        return EMAIL_RE.findall(self.text)
+
+    @cached_property
+    def dates(self) -> List[str]:
+        return DATE_RE.findall(self.text)
+
+    @cached_property
+    def signature(self) -> Optional[Span]:
+        m = SIGN_OFF_RE.search(self.folded)
+        return (m.start(), len(self.text)) if m else None
+
+    @cached_property
+    def body_lines(self) -> Tuple[int, int]:
+        """Greeting (“Dear …”) line → last line holding an e-mail address."""
+        lines = self.lines
+        start = next((i for i, ln in enumerate(lines)
+                      if ln.strip().lower().startswith("dear")), 0)
+        end = next((i for i in range(len(lines) - 1, -1, -1) if "@" in lines[i]),
+                   len(lines) - 1)
+        return start, end
+
+    @cached_property
+    def body_span(self) -> Span:
+        start, end = self.body_lines
+        if start > end:                          # no lines / e-mail before greeting
+            return (0, 0)
+        return (self.line_spans[start][0], self.line_spans[end][1])
+
+    @cached_property
+    def body(self) -> str:
+        """The body lines joined with spaces (`quality_check_rules` view)."""
+        start, end = self.body_lines
+        return " ".join(self.lines[start:end + 1]).strip()
+
+    @cached_property
+    def body_lower(self) -> str:
+        return self.body.lower()
+
+    @property
+    def spam(self) -> SpamScan:
+        return scan(self.text)                   # memoised in utils.spam_scan
+
+    @property
+    def body_spam(self) -> SpamScan:
+        return self.spam.within(*self.body_span)
+
+
+# -------------------------------------------------------------------- #
+# Per-text memo                                                        #
+# -------------------------------------------------------------------- #
+_FACTS: "OrderedDict[str, Draft]" = OrderedDict()
+_FACTS_MAX = 8
+_FACTS_LOCK = threading.Lock()
+
+
+def facts(text: str) -> Draft:
+    """The shared `Draft` for *text*; the last few are memoised."""
+    with _FACTS_LOCK:                        # Draft() is lazy – cheap to build here
+        found = _FACTS.get(text)
+        if found is None:
+            found = _FACTS[text] = Draft(text)
+        _FACTS.move_to_end(text)
+        while len(_FACTS) > _FACTS_MAX:
+            _FACTS.popitem(last=False)
+        return found
+
+
+# -------------------------------------------------------------------- #
+# Rules                                                                #
+# -------------------------------------------------------------------- #
+class Rule(NamedTuple):
+    """One check: result key / checklist tag + `check(draft, ctx)`."""
+    key: str
+    check: Callable[[Draft, Mapping[str, object]], Verdict]
+
+
+def evaluate(rules: Iterable[Rule], draft: Draft,
+             ctx: Optional[Mapping[str, object]] = None
+             ) -> Iterator[Tuple[str, bool, str]]:
+    """Yield `(key, ok, note)` per rule, in order; skipped rules are omitted."""
+    ctx = ctx or {}
+    for rule in rules:
+        verdict = rule.check(draft, ctx)
+        if verdict is None:
+            continue
+        ok, note = verdict if isinstance(verdict, tuple) else (verdict, "")
+        yield rule.key, bool(ok), note
@@ -0,0 +1,78 @@
+"""
+utils.qc_runner
+===============
+Deterministic + AI QC in parallel, with early cancellation.
+
+`run_full_qc(text, det=…, ai=…)` starts the AI check on a worker thread
+*while* the deterministic rules run in the caller, so QC wall-clock is
+≈ max(det, ai) instead of det + ai.  When the deterministic verdict
+already fails (the draft goes to Auto-Fix anyway) the AI call is
+cancelled: a not-yet-started task is dropped, and a running one sees
+its `cancel` event set before it sends the request (see `qc_ai.score`).
+
+The merged verdict has the same shape the pipeline always used:
+`{**det, **ai, "__PASS__": det ∧ ai}`, with `ai = {"__PASS__": False}`
+when the AI check was skipped.
+
+Usage
+-----
+>>> from qc_script import validate_cached
+>>> from qc_ai import score_cached
+>>> qc = run_full_qc(draft, det=validate_cached, ai=score_cached)
+"""
+
+from __future__ import annotations
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+__all__ = ["run_full_qc"]
+
+Verdict = Dict[str, object]
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="qc-ai")
+
+
+def _skipped() -> Verdict:
+    return {"__PASS__": False}
+
+
+def run_full_qc(
+    text: str,
+    *,
+    det: Callable[[str], Verdict],
+    ai: Callable[..., Verdict],
+    needs_ai: Callable[[Verdict], bool] = lambda d: bool(d["__PASS__"]),
+) -> Verdict:
+    """
+    Run *det* and *ai* on *text* concurrently and merge the verdicts.
+
+    Parameters
+    ----------
+    det :
+        Deterministic checker, run in the calling thread.
+    ai :
+        AI checker; called as `ai(text, cancel=threading.Event)` and
+        expected to raise `CancelledError` once the event is set.
+    needs_ai :
+        Whether the AI verdict still matters given the deterministic one
+        (default: only when every deterministic rule passed).
+    """
+    cancel = threading.Event()
+    future = _POOL.submit(ai, text, cancel=cancel)
+    try:
+        det_result = det(text)
+    except BaseException:
+        cancel.set()
+        future.cancel()
+        raise
+
+    if needs_ai(det_result):
+        ai_result = future.result()
+    else:                                # rigid fail → Auto-Fix; drop the LLM call
+        cancel.set()
+        future.cancel()
+        ai_result = _skipped()
+
+    combined = {**det_result, **ai_result}
+    combined["__PASS__"] = bool(det_result["__PASS__"]) and bool(ai_result["__PASS__"])
+    return combined
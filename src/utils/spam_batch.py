@@ -0,0 +1,200 @@
+"""
+utils.spam_batch
+================
+Batch spam scanning for analysis corpora (`interspire_data`,
+`mailwizz_data`, …) – the bulk counterpart of `scripts.spam_check.find_spam`.
+
+`find_spam_many(texts)` takes a pandas Series, a list or a *streamed*
+iterator of bodies, scans them in chunks across worker processes (each
+worker loads the same prebuilt lexicon) and returns a `SpamBatch`:
+
+    matrix       sparse document × lexicon-term count matrix (CSR)
+    terms        column labels (canonical lexicon terms)
+    counts       spam hits per document
+    word_counts  words per document
+    densities    counts / word_counts
+
+Usage
+-----
+>>> from src.utils.spam_batch import find_spam_many
+>>> batch = find_spam_many(df["email"], strip_html=True)
+>>> df["spam_density"] = batch.densities
+>>> batch.matrix.shape                       # (len(df), len(batch.terms))
+"""
+
+from __future__ import annotations
+import html, os, re
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import spam_lexicon
+from .spam_matcher import SpamMatcher
+
+__all__ = ["SpamBatch", "find_spam_many"]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+_Chunk = Tuple[array, ...]      # indices, data | per row: nnz, hits, words
+
+
+class SpamBatch:
+    """Sparse hit matrix + per-document aggregates for one batch scan."""
+
+    def __init__(self, terms: Tuple[str, ...], indptr: np.ndarray,
+                 indices: np.ndarray, data: np.ndarray, counts: np.ndarray,
+                 word_counts: np.ndarray, index=None):
+        self.terms = terms
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.counts = counts
+        self.word_counts = word_counts
+        self.index = index                   # row labels (Series index) or None
+
+    def __len__(self) -> int:
+        return len(self.word_counts)
+
+    @property
+    def densities(self) -> np.ndarray:
+        return self.counts / np.maximum(self.word_counts, 1)
+
+    @property
+    def matrix(self):
+        """`scipy.sparse.csr_matrix` of shape (documents, terms)."""
+        from scipy.sparse import csr_matrix    # optional – analysis extras only
+        return csr_matrix((self.data, self.indices, self.indptr),
+                          shape=(len(self), len(self.terms)))
+
+    def doc_frequency(self) -> np.ndarray:
+        """Number of documents containing each term (column support)."""
+        return np.bincount(self.indices, minlength=len(self.terms))
+
+    def to_frame(self, prefix: str = "spam_"):
+        """Per-document aggregates as a DataFrame aligned with the input."""
+        import pandas as pd
+        return pd.DataFrame({f"{prefix}count": self.counts,
+                             f"{prefix}words": self.word_counts,
+                             f"{prefix}density": self.densities},
+                            index=self.index)
+
+
+# -------------------------------------------------------------------- #
+# Worker side                                                          #
+# -------------------------------------------------------------------- #
+_COLUMNS: Dict[Tuple[str, ...], Tuple[SpamMatcher, Dict[str, int]]] = {}
+
+
+def _columns(lists: Tuple[str, ...]) -> Tuple[SpamMatcher, Dict[str, int]]:
+    lex = spam_lexicon.load()
+    cached = _COLUMNS.get(lists)
+    if cached is None or cached[0] is not lex.matcher(*lists):
+        cached = (lex.matcher(*lists),
+                  {t: i for i, t in enumerate(lex.words(*lists))})
+        _COLUMNS[lists] = cached
+    return cached
+
+
+def _plain(text, strip_html: bool) -> str:
+    if not isinstance(text, str):
+        return ""                            # NaN / None rows
+    return html.unescape(_TAG_RE.sub(" ", text)) if strip_html else text
+
+
+def _scan_chunk(texts: List[str], lists: Tuple[str, ...],
+                exceptions: frozenset, strip_html: bool) -> _Chunk:
+    matcher, columns = _columns(lists)
+    out: _Chunk = tuple(array("i") for _ in range(5))
+    indices, data, nnz, hits, words = out
+    for raw in texts:
+        text = _plain(raw, strip_html)
+        per = Counter(h.term for h in matcher.spans(text) if h.term not in exceptions)
+        for col, n in sorted((columns[t], n) for t, n in per.items()):
+            indices.append(col)
+            data.append(n)
+        nnz.append(len(per))
+        hits.append(sum(per.values()))
+        words.append(len(_WORD_RE.findall(text)))
+    return out
+
+
+# -------------------------------------------------------------------- #
+# Public API                                                           #
+# -------------------------------------------------------------------- #
+def _chunks(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(texts)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def find_spam_many(
+    texts: Iterable[str],
+    *,
+    lists: Sequence[str] = ("spam",),
+    exceptions: Iterable[str] | None = None,
+    strip_html: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+) -> SpamBatch:
+    """
+    Scan many bodies at once and return a `SpamBatch`.
+
+    Parameters
+    ----------
+    texts :
+        pandas Series, list or any (lazy) iterator of strings; NaN / None
+        rows count as empty.  A Series index is kept on the result.
+    lists :
+        Lexicon lists that form the matrix columns (default "spam").
+    exceptions :
+        Terms to ignore (case-insensitive), as in `find_spam`.
+    strip_html :
+        Drop tags and unescape entities first (campaign bodies are HTML).
+    workers :
+        Worker processes (default: CPU count).  Inputs that fit in one
+        chunk, or `workers=1`, are scanned in-process.
+    chunk_size :
+        Bodies per task; at most `2 × workers` chunks are in flight, so
+        streamed iterators are never materialised whole.
+    """
+    lists = tuple(lists)
+    exc = frozenset(w.lower() for w in (exceptions or ()))
+    index = None
+    if hasattr(texts, "tolist"):             # pandas Series / numpy array
+        index = getattr(texts, "index", None)
+        texts = texts.tolist()
+    workers = workers or os.cpu_count() or 1
+    if isinstance(texts, (list, tuple)) and len(texts) <= chunk_size:
+        workers = 1
+
+    parts: List[_Chunk] = []
+    if workers <= 1:
+        parts = [_scan_chunk(c, lists, exc, strip_html)
+                 for c in _chunks(texts, chunk_size)]
+    else:
+        spam_lexicon.load()                  # build the artifact once, up front
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: deque = deque()
+            for chunk in _chunks(texts, chunk_size):
+                pending.append(pool.submit(_scan_chunk, chunk, lists, exc, strip_html))
+                if len(pending) >= 2 * workers:
+                    parts.append(pending.popleft().result())
+            parts.extend(f.result() for f in pending)
+
+    merged: _Chunk = tuple(array("i") for _ in range(5))
+    for part in parts:
+        for acc, arr in zip(merged, part):
+            acc.extend(arr)
+    indices, data, nnz, hits, words = (np.asarray(a, dtype=np.int64) for a in merged)
+    indptr = np.zeros(len(nnz) + 1, dtype=np.int64)
+    np.cumsum(nnz, out=indptr[1:])
+    return SpamBatch(terms=spam_lexicon.words(*lists), indptr=indptr,
+                     indices=indices.astype(np.int32), data=data, counts=hits,
+                     word_counts=words, index=index)
@@ -0,0 +1,313 @@
+"""
+utils.spam_lexicon
+==================
+Prebuilt, lazily loaded spam lexicon shared by every spam checker.
+
+Sources
+-------
+• `lexicon/spam_words.txt`        master spam / buzz list     → list "spam"
+• `lexicon/subject_keywords.txt`  subject-line keywords       → list "subject"
+• `lexicon/hype_words.txt`        hype adjectives (P-2)       → list "hype"
+• `lexicon/hard_sell.txt`         hard-sell verbs (P-5)       → list "hard_sell"
+• `quality_check_rules.EXTRA_SPAM_WORDS`                      → list "extra"
+• `quality_check_rules.REPLACEMENTS` keys (regex → words)     → list "replacements"
+• optional `$SPAM_WORD_PATH` (CSV / JSON / TXT)               → list "spam"
+• `lexicon/synonyms.txt` + REPLACEMENTS values                → `rewrites`
+
+`build()` normalises every term (lower-case, stripped, single-spaced),
+compiles ONE `SpamMatcher` over the union and writes a versioned binary
+artifact `lexicon/spam_lexicon.bin`.  `load()` unpickles that artifact
+once on first use (no text parsing, no trie build) and keeps a single
+process-wide copy – no module has to parse a giant list literal at import
+time any more.  It is rebuilt when a source file or `$SPAM_WORD_PATH`
+changes; the sources are stat'ed at most every `SPAM_LEXICON_RECHECK`
+seconds (default 5), or right away with `load(reload=True)`, so the scans
+that call `load()` per draft do no file-system I/O in between.
+
+Usage
+-----
+>>> from utils import spam_lexicon
+>>> spam_lexicon.words("spam")[:3]
+('100 more please', '100%', '100% effective')
+>>> spam_lexicon.matcher("spam", "extra").find("Amazing pioneering work")
+{'amazing', 'pioneering'}
+
+CLI
+---
+    python -m utils.spam_lexicon        # (from src/) force a rebuild
+"""
+
+from __future__ import annotations
+import ast, csv, json, os, pickle, struct, threading, time
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .spam_matcher import SpamMatcher, normalize, register
+
+__all__ = ["Lexicon", "build", "load", "words", "matcher", "FORMAT_VERSION"]
+
+FORMAT_VERSION = 2
+_MAGIC = b"SPLX"
+_HEAD = struct.Struct("<4sHI")            # magic, format version, header bytes
+
+LEXICON_DIR = Path(__file__).resolve().parent / "lexicon"
+ARTIFACT_PATH = LEXICON_DIR / "spam_lexicon.bin"
+QC_RULES_PATH = Path(__file__).resolve().parents[2] / "quality_check_rules.py"
+SYNONYMS_PATH = LEXICON_DIR / "synonyms.txt"
+
+_TEXT_SOURCES = {
+    "spam": LEXICON_DIR / "spam_words.txt",
+    "subject": LEXICON_DIR / "subject_keywords.txt",
+    "hype": LEXICON_DIR / "hype_words.txt",
+    "hard_sell": LEXICON_DIR / "hard_sell.txt",
+}
+# Union order decides the canonical spelling when lists overlap.
+LIST_ORDER = ("spam", "extra", "replacements", "subject", "hype", "hard_sell")
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 1) In-memory lexicon
+# ════════════════════════════════════════════════════════════════════════
+class Lexicon:
+    """
+    Normalised word lists + one compiled matcher over their union, plus the
+    local `rewrites` table (term → replacement, "" = delete).
+    """
+
+    def __init__(self, lists: Dict[str, Tuple[str, ...]],
+                 compiled: SpamMatcher, fingerprint: tuple = (),
+                 rewrites: Optional[Dict[str, str]] = None):
+        self.lists = lists
+        self.compiled = compiled
+        self.fingerprint = fingerprint
+        self.rewrites = rewrites or {}
+        self._views: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], SpamMatcher]] = {}
+        self._members: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+
+    def _view(self, names: Tuple[str, ...]) -> Tuple[Tuple[str, ...], SpamMatcher]:
+        view = self._views.get(names)
+        if view is None:
+            with self._lock:
+                seen: Dict[str, None] = {}
+                for name in names:
+                    seen.update(dict.fromkeys(self.lists[name]))
+                terms = tuple(seen)
+                view = (terms, self.compiled.restrict(terms))
+                register(terms, view[1])      # get_matcher(terms) → same view
+                self._views[names] = view
+        return view
+
+    def words(self, *names: str) -> Tuple[str, ...]:
+        """Return the de-duplicated terms of one or more lists."""
+        return self._view(names or ("spam",))[0]
+
+    def matcher(self, *names: str) -> SpamMatcher:
+        """Return the shared matcher restricted to one or more lists."""
+        return self._view(names or ("spam",))[1]
+
+    def members(self, name: str) -> FrozenSet[str]:
+        """Frozen set of one list's terms (O(1) membership tests)."""
+        found = self._members.get(name)
+        if found is None:
+            found = self._members[name] = frozenset(self.lists[name])
+        return found
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 2) Source readers
+# ════════════════════════════════════════════════════════════════════════
+def _read_text_list(path: Path) -> List[str]:
+    with open(path, encoding="utf-8") as fh:
+        return [ln for ln in (l.strip() for l in fh) if ln and not ln.startswith("#")]
+
+
+def _read_external(path: Path) -> List[str]:
+    """$SPAM_WORD_PATH: JSON list/dict, or CSV/TXT with the term in column 1."""
+    if path.suffix.lower() == ".json":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        return [str(w) for w in (data.keys() if isinstance(data, dict) else data)]
+    with open(path, encoding="utf-8", newline="") as fh:
+        return [row[0] for row in csv.reader(fh)
+                if row and row[0].strip() and not row[0].startswith("#")]
+
+
+def _expand_regex_key(key: str) -> List[str]:
+    r"""`\bplatforms?\b` → ['platform', 'platforms'];  `feel\s+free` → ['feel free']"""
+    plain = key.replace(r"\b", "").replace(r"\s+", " ")
+    if plain.endswith("s?"):
+        return [plain[:-2], plain[:-1]]
+    return [plain]
+
+
+def _read_synonyms(path: Path) -> Dict[str, str]:
+    """`term => replacement` lines; an empty right-hand side deletes."""
+    out: Dict[str, str] = {}
+    if path.exists():
+        for line in _read_text_list(path):
+            term, sep, repl = line.partition("=>")
+            if sep and normalize(term):
+                out[normalize(term)] = repl.strip()
+    return out
+
+
+def _read_qc_rules(path: Path) -> Tuple[List[str], List[str], Dict[str, str]]:
+    """
+    Pull EXTRA_SPAM_WORDS and REPLACEMENTS (keys expanded to words) out of
+    quality_check_rules.py *without importing it* (it imports this module).
+    """
+    if not path.exists():
+        return [], [], {}
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    found: Dict[str, object] = {}
+    for node in tree.body:
+        target = (node.targets[0] if isinstance(node, ast.Assign)
+                  else node.target if isinstance(node, ast.AnnAssign) else None)
+        if getattr(target, "id", None) in ("EXTRA_SPAM_WORDS", "REPLACEMENTS"):
+            found[target.id] = ast.literal_eval(node.value)
+    extra = list(found.get("EXTRA_SPAM_WORDS", []))
+    table = {w: v for k, v in found.get("REPLACEMENTS", {}).items()
+             for w in _expand_regex_key(k)}
+    return extra, list(table), table
+
+
+def _external_path() -> Optional[Path]:
+    raw = os.getenv("SPAM_WORD_PATH")
+    return Path(raw).expanduser() if raw else None
+
+
+def _fingerprint() -> tuple:
+    """(path, mtime_ns, size) of every source – cheap staleness check."""
+    paths = [*_TEXT_SOURCES.values(), QC_RULES_PATH, SYNONYMS_PATH]
+    ext = _external_path()
+    if ext is not None:
+        paths.append(ext)
+    out = []
+    for p in paths:
+        try:
+            st = p.stat()
+            out.append((str(p), st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((str(p), 0, 0))
+    return tuple(out)
+
+
+def _normalised(terms: Iterable[str]) -> Tuple[str, ...]:
+    seen: Dict[str, None] = {}
+    for t in terms:
+        n = normalize(t)
+        if n:
+            seen[n] = None
+    return tuple(seen)
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 3) Build / read the artifact
+# ════════════════════════════════════════════════════════════════════════
+def build(path: Optional[Path] = None) -> Lexicon:
+    """Compile all sources and (re)write the binary artifact at *path*."""
+    path = Path(path or ARTIFACT_PATH)
+    fingerprint = _fingerprint()
+
+    spam = _read_text_list(_TEXT_SOURCES["spam"])
+    ext = _external_path()
+    if ext is not None and ext.exists():
+        spam += _read_external(ext)
+    extra, repl, repl_table = _read_qc_rules(QC_RULES_PATH)
+    lists = {
+        "spam": _normalised(spam),
+        "extra": _normalised(extra),
+        "replacements": _normalised(repl),
+        "subject": _normalised(_read_text_list(_TEXT_SOURCES["subject"])),
+        "hype": _normalised(_read_text_list(_TEXT_SOURCES["hype"])),
+        "hard_sell": _normalised(_read_text_list(_TEXT_SOURCES["hard_sell"])),
+    }
+    compiled = SpamMatcher(t for name in LIST_ORDER for t in lists[name])
+    rewrites = _read_synonyms(SYNONYMS_PATH)
+    rewrites.update((normalize(k), v) for k, v in repl_table.items())
+    lex = Lexicon(lists, compiled, fingerprint, rewrites)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "counts": {k: len(v) for k, v in lists.items()},
+    }).encode("utf-8")
+    # plain builtins only – the artifact must load under `utils.` and `src.utils.`
+    payload = pickle.dumps({"lists": lists, "terms": compiled.terms,
+                            "trie": compiled.trie, "rewrites": rewrites},
+                           protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(_HEAD.pack(_MAGIC, FORMAT_VERSION, len(header)))
+            fh.write(header)
+            fh.write(payload)
+        os.replace(tmp, path)
+    except OSError:
+        pass                                   # read-only checkout → memory only
+    return lex
+
+
+def _read_artifact(path: Path, fingerprint: tuple) -> Optional[Lexicon]:
+    """Read *path*; return None if missing, corrupt, old or stale."""
+    try:
+        with open(path, "rb") as fh:
+            magic, version, hlen = _HEAD.unpack(fh.read(_HEAD.size))
+            if magic != _MAGIC or version != FORMAT_VERSION:
+                return None
+            header = json.loads(fh.read(hlen))
+            if tuple(map(tuple, header["fingerprint"])) != fingerprint:
+                return None                    # stale: don't read the payload
+            data = pickle.loads(fh.read())
+    except (OSError, ValueError, struct.error, pickle.UnpicklingError, KeyError, EOFError):
+        return None
+    compiled = SpamMatcher.from_trie(data["terms"], data["trie"])
+    return Lexicon(data["lists"], compiled, fingerprint, data["rewrites"])
+
+
+# ════════════════════════════════════════════════════════════════════════
+# 4) Process-wide singleton
+# ════════════════════════════════════════════════════════════════════════
+_LEXICON: Optional[Lexicon] = None
+_LOAD_LOCK = threading.Lock()
+RECHECK_SECONDS = float(os.getenv("SPAM_LEXICON_RECHECK", 5.0))
+_CHECKED_AT = 0.0                          # monotonic time of the last source stat
+_CHECKED_EXT: Optional[str] = None         # $SPAM_WORD_PATH at that check
+
+
+def load(reload: bool = False) -> Lexicon:
+    """
+    Return the shared lexicon, (re)loading it if any source changed.
+    Sources are stat'ed at most every `RECHECK_SECONDS`; *reload* or a new
+    `$SPAM_WORD_PATH` checks them now.
+    """
+    global _LEXICON, _CHECKED_AT, _CHECKED_EXT
+    lex, ext, now = _LEXICON, os.getenv("SPAM_WORD_PATH"), time.monotonic()
+    if (lex is not None and not reload and ext == _CHECKED_EXT
+            and now - _CHECKED_AT < RECHECK_SECONDS):
+        return lex
+    fingerprint = _fingerprint()
+    with _LOAD_LOCK:
+        if _LEXICON is None or _LEXICON.fingerprint != fingerprint:
+            _LEXICON = _read_artifact(ARTIFACT_PATH, fingerprint) or build()
+        _CHECKED_AT, _CHECKED_EXT = now, ext
+        return _LEXICON
+
+
+def words(*names: str) -> Tuple[str, ...]:
+    """Shortcut for `load().words(*names)` (default list: "spam")."""
+    return load().words(*names)
+
+
+def matcher(*names: str) -> SpamMatcher:
+    """Shortcut for `load().matcher(*names)` (default list: "spam")."""
+    return load().matcher(*names)
+
+
+if __name__ == "__main__":
+    lex = build()
+    print(f"Wrote {ARTIFACT_PATH}  (format v{FORMAT_VERSION})")
+    for name, terms in lex.lists.items():
+        print(f"  {name:<13}{len(terms):>6} terms")
@@ -0,0 +1,232 @@
+"""
+utils.spam_matcher
+==================
+Single-pass, multi-pattern matcher for the spam / buzz-word lexicon.
+
+The old checkers compiled and ran one regex per lexicon entry (~2,600 of
+them), i.e. thousands of full-text passes per draft.  `SpamMatcher`
+compiles the whole lexicon into a token trie once and walks the draft a
+single time.
+
+Matching rules
+--------------
+• Case-insensitive; curly apostrophes are folded to `'`.
+• Whole-word only – the text is tokenised into `\\w+` runs and single
+  punctuation marks, so “research!” still matches “research” but
+  “researcher” does not.
+• Multi-word phrases match across any run of whitespace (including line
+  breaks); punctuation inside a phrase must match exactly
+  (“age-defying”, “all natural/new”, “50% off”).
+
+Usage
+-----
+>>> m = get_matcher(["amazing", "act now", "50% off"])
+>>> m.find("Act  now – AMAZING 50% off!")
+{'act now', 'amazing', '50% off'}
+>>> m.spans("Act now!")
+[Hit(start=0, end=7, term='act now')]
+"""
+
+from __future__ import annotations
+import re
+from typing import (Callable, Dict, FrozenSet, Iterable, Iterator, List,
+                    NamedTuple, Set, Tuple)
+
+__all__ = ["Hit", "SpamMatcher", "get_matcher", "longest", "normalize", "register"]
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_FOLD = str.maketrans({"’": "'", "‘": "'"})
+_END = ""                     # trie key that stores the terminal term index
+
+
+class Hit(NamedTuple):
+    """One lexicon hit: half-open character span + canonical term."""
+    start: int
+    end: int
+    term: str
+
+
+def _fold(text: str) -> str:
+    """Lower-case + apostrophe-fold *without* changing string length."""
+    low = text.lower()
+    if len(low) != len(text):                 # e.g. 'İ' → 'i̇' (2 chars)
+        low = "".join(ch.lower()[:1] for ch in text)
+    return low.translate(_FOLD)
+
+
+def normalize(term: str) -> str:
+    """Canonical lexicon spelling: folded, stripped, single-spaced."""
+    return " ".join(_fold(term).split())
+
+
+def _tokens(low: str) -> Tuple[List[str], List[str], List[int], List[int]]:
+    """
+    Return (bare, keyed, starts, ends) for folded text.
+
+    `keyed[i]` is the token prefixed with a single space when whitespace
+    separates it from the previous token – that is how phrase tokens are
+    stored in the trie, so “act now” ≠ “actnow” but “act\\n now” == “act now”.
+    """
+    bare: List[str] = []
+    keyed: List[str] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    prev_end = 0
+    for m in _TOKEN_RE.finditer(low):
+        s, e = m.span()
+        tok = m.group()
+        bare.append(tok)
+        keyed.append(" " + tok if s != prev_end else tok)
+        starts.append(s)
+        ends.append(e)
+        prev_end = e
+    return bare, keyed, starts, ends
+
+
+class SpamMatcher:
+    """
+    Compiled token trie over a spam lexicon.
+
+    Parameters
+    ----------
+    terms :
+        Lexicon entries.  The *first* spelling of each normalised entry is
+        kept as its canonical form and returned by `find()` / `spans()`.
+    """
+
+    __slots__ = ("terms", "_root", "_mask")
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Tuple[str, ...] = ()
+        self._root: Dict[str, dict] = {}
+        self._mask: FrozenSet[int] | None = None
+        canon: List[str] = []
+        for term in terms:
+            if not term or not term.strip():
+                continue
+            _, keyed, _, _ = _tokens(_fold(term.strip()))
+            node = self._root
+            for key in keyed:
+                node = node.setdefault(key, {})
+            if _END not in node:
+                node[_END] = len(canon)
+                canon.append(term.strip())
+        self.terms = tuple(canon)
+
+    @classmethod
+    def from_trie(cls, terms: Tuple[str, ...], trie: Dict[str, dict],
+                  mask: FrozenSet[int] | None = None) -> "SpamMatcher":
+        """Rebuild a matcher from `terms` + `trie` (e.g. a serialised artifact)."""
+        obj = cls.__new__(cls)
+        obj.terms, obj._root, obj._mask = terms, trie, mask
+        return obj
+
+    @property
+    def trie(self) -> Dict[str, dict]:
+        """Nested-dict trie (plain builtins – safe to pickle / marshal)."""
+        return self._root
+
+    def restrict(self, terms: Iterable[str]) -> "SpamMatcher":
+        """
+        Return a view that only reports *terms* (canonical spellings).
+
+        The view shares this trie, so one compiled lexicon can serve every
+        sub-list.  Longer phrases outside the view never shadow shorter
+        phrases inside it.
+        """
+        index = {t: i for i, t in enumerate(self.terms)}
+        mask = frozenset(index[t] for t in terms if t in index)
+        return SpamMatcher.from_trie(self.terms, self._root, mask)
+
+    # ------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return len(self.terms) if self._mask is None else len(self._mask)
+
+    def finditer(self, text: str) -> Iterator[Hit]:
+        """Yield *every* hit, including overlapping ones (“act”, “act now”)."""
+        if not text:
+            return
+        bare, keyed, starts, ends = _tokens(_fold(text))
+        root, terms, mask, n = self._root, self.terms, self._mask, len(bare)
+        for i in range(n):
+            node = root.get(bare[i])
+            j = i
+            while node is not None:
+                idx = node.get(_END)
+                if idx is not None and (mask is None or idx in mask):
+                    yield Hit(starts[i], ends[j], terms[idx])
+                j += 1
+                if j >= n:
+                    break
+                node = node.get(keyed[j])
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of canonical terms present in *text*."""
+        return {h.term for h in self.finditer(text)}
+
+    def spans(self, text: str) -> List[Hit]:
+        """
+        Leftmost-longest, non-overlapping hits – the right shape for
+        highlighting and per-occurrence counting.
+        """
+        return longest(self.finditer(text))
+
+    def sub(self, text: str, repl: Callable[[str], str]) -> str:
+        """Replace every non-overlapping hit with `repl(original_slice)`."""
+        parts: List[str] = []
+        pos = 0
+        for h in self.spans(text):
+            parts.append(text[pos:h.start])
+            parts.append(repl(text[h.start:h.end]))
+            pos = h.end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+
+def longest(hits: Iterable[Hit]) -> List[Hit]:
+    """
+    Reduce `finditer()`-ordered hits (by start, then end) to leftmost-longest,
+    non-overlapping ones.  Works on any filtered subsequence of those hits, so
+    a single scan can serve several sub-lists.
+    """
+    out: List[Hit] = []
+    cursor = 0
+    best: Hit | None = None
+    for hit in hits:
+        if hit.start < cursor:
+            continue
+        if best is not None and hit.start != best.start:
+            out.append(best)
+            cursor = best.end
+            best = None
+            if hit.start < cursor:
+                continue
+        if best is None or hit.end > best.end:
+            best = hit
+    if best is not None:
+        out.append(best)
+    return out
+
+
+# -------------------------------------------------------------------- #
+# Shared compiled instances                                            #
+# -------------------------------------------------------------------- #
+_CACHE: Dict[Tuple[str, ...], SpamMatcher] = {}
+_CACHE_MAX = 16
+
+
+def register(terms: Tuple[str, ...], matcher: SpamMatcher) -> None:
+    """Seed the cache so `get_matcher(terms)` reuses an existing matcher."""
+    if len(_CACHE) >= _CACHE_MAX:
+        _CACHE.pop(next(iter(_CACHE)))
+    _CACHE[terms] = matcher
+
+
+def get_matcher(terms: Iterable[str]) -> SpamMatcher:
+    """Return a memoised `SpamMatcher` for *terms* (compiled once per list)."""
+    key = tuple(terms)
+    matcher = _CACHE.get(key)
+    if matcher is None:
+        matcher = SpamMatcher(key)
+        register(key, matcher)
+    return matcher
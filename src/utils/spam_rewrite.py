@@ -0,0 +1,277 @@
+"""
+utils.spam_rewrite
+==================
+Deterministic, local spam-word replacement.  The LLM remover only ever sees
+the sentences this engine could not clean.
+
+`rewrite_spam(text)`:
+
+1. takes the draft's `scan()` hits (spam, hype and hard-sell),
+2. skips hits inside protected regions – URLs, e-mail addresses, the
+   signature block, “All types welcome” and any `keep` strings the caller
+   passes (journal name, short name, ISSN …),
+3. swaps every hit that has a lexicon `rewrites` entry
+   (`quality_check_rules.REPLACEMENTS` ∪ `lexicon/synonyms.txt`), keeping
+   capitalisation, fixing “a / an” and tidying the gap a deletion leaves,
+4. re-scans the result – whatever is still flagged is *residue*.
+
+Only the residue sentences go to the LLM (`llm_prompt()` → `merge_llm()`),
+and `stats()` reports how many drafts never needed it.
+
+Usage
+-----
+>>> res = rewrite_spam(draft, keep=[journal_title, issn])
+>>> if res.needs_llm:
+...     cleaned = res.merge_llm(call_llm(res.llm_prompt()))
+... else:
+...     cleaned = res.text
+"""
+
+from __future__ import annotations
+import re, threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import spam_lexicon
+from .spam_scan import CATEGORIES, ScanHit, scan
+
+__all__ = ["RewriteResult", "rewrite_spam", "stats", "STATS"]
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+", re.I)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_SIGNATURE_RE = re.compile(r"^[ \t]*(?:(?:warm|kind|best)\s+regards|sincerely)\b",
+                           re.I | re.M)
+_ALWAYS_KEEP = ("all types welcome",)
+_ARTICLE_RE = re.compile(r"\b(an?|An?)([ \t]+)$")
+_CAP_NEXT_RE = re.compile(r"[ \t]*(?!https?:|www\.)([a-z])")
+_BOUNDARY_RE = re.compile(r"(?<=[.!?])[ \t]+|\n")
+_LLM_LINE_RE = re.compile(r"^[ \t]*\[(\d+)\][ \t]?(.*)$", re.M)
+
+Span = Tuple[int, int]
+
+
+# -------------------------------------------------------------------- #
+# Helpers                                                              #
+# -------------------------------------------------------------------- #
+def _protected(text: str, keep: Iterable[str]) -> List[Span]:
+    regions = [m.span() for m in _URL_RE.finditer(text)]
+    regions += [m.span() for m in _EMAIL_RE.finditer(text)]
+    sig = _SIGNATURE_RE.search(text)
+    if sig:
+        regions.append((sig.start(), len(text)))
+    low = text.lower()
+    for phrase in (*_ALWAYS_KEEP, *keep):
+        phrase = (phrase or "").strip().lower()
+        start = low.find(phrase) if phrase else -1
+        while start != -1:
+            regions.append((start, start + len(phrase)))
+            start = low.find(phrase, start + 1)
+    return regions
+
+
+def _inside(hit: ScanHit, regions: List[Span]) -> bool:
+    return any(hit.start < end and start < hit.end for start, end in regions)
+
+
+def _match_case(original: str, repl: str) -> str:
+    if len(original) > 1 and original.isupper():
+        return repl.upper()
+    if original[:1].isupper():
+        return repl[:1].upper() + repl[1:]
+    return repl
+
+
+def _fix_article(prefix: str, repl: str) -> str:
+    """“an opportunity” → “a window”: re-pick a/an for the new word."""
+    m = _ARTICLE_RE.search(prefix)
+    if not m:
+        return prefix
+    article = "an" if repl[:1].lower() in "aeiou" else "a"
+    if m.group(1)[0].isupper():
+        article = article.capitalize()
+    return prefix[:m.start()] + article + m.group(2)
+
+
+def _sentences(text: str) -> List[Span]:
+    spans, start = [], 0
+    for m in _BOUNDARY_RE.finditer(text):
+        if m.start() > start:
+            spans.append((start, m.start()))
+        start = m.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+# -------------------------------------------------------------------- #
+# Result                                                               #
+# -------------------------------------------------------------------- #
+class RewriteResult:
+    """Locally rewritten draft + whatever still needs the LLM."""
+
+    __slots__ = ("original", "text", "replaced", "residue")
+
+    def __init__(self, original: str, text: str,
+                 replaced: List[Tuple[str, str]], residue: List[ScanHit]):
+        self.original = original
+        self.text = text
+        self.replaced = replaced          # [(original slice, replacement)]
+        self.residue = residue            # hits in `text` coordinates
+
+    @property
+    def needs_llm(self) -> bool:
+        return bool(self.residue)
+
+    def residue_sentences(self) -> List[Tuple[Span, List[str]]]:
+        """Sentence spans of `text` that still hold hits, with their terms."""
+        out: List[Tuple[Span, List[str]]] = []
+        hits = iter(self.residue)
+        hit = next(hits, None)
+        for start, end in _sentences(self.text):
+            terms: List[str] = []
+            while hit is not None and hit.start < end:
+                if hit.start >= start and hit.term not in terms:
+                    terms.append(hit.term)
+                hit = next(hits, None)
+            if terms:
+                out.append(((start, end), terms))
+        return out
+
+    def llm_prompt(self) -> str:
+        """Prompt covering only the residue sentences (numbered)."""
+        lines = []
+        for n, ((start, end), terms) in enumerate(self.residue_sentences(), 1):
+            lines.append(f"[{n}] {self.text[start:end]}")
+            lines.append(f"    words: {', '.join(terms)}")
+        body = "\n".join(lines)
+        return f"""
+Rewrite ONLY the numbered sentences below so that none of the listed words remain.
+Replace each word with a context-appropriate synonym (or drop it if it adds nothing).
+Keep meaning, numbers, names, URLs and punctuation; change nothing else.
+If a word truly cannot be replaced, leave it unchanged.
+
+Return one line per sentence, in the same order, formatted exactly as
+[n] rewritten sentence
+and nothing else – no commentary, no blank lines, no JSON.
+
+{body}
+""".strip()
+
+    def merge_llm(self, raw: str) -> str:
+        """Splice the LLM's `[n] …` lines back into `text`."""
+        answers: Dict[int, str] = {int(m.group(1)): m.group(2).strip()
+                                   for m in _LLM_LINE_RE.finditer(raw or "")}
+        text = self.text
+        spans = [span for span, _ in self.residue_sentences()]
+        for n, (start, end) in reversed(list(enumerate(spans, 1))):
+            new = answers.get(n)
+            if new:                       # missing / empty → keep sentence
+                text = text[:start] + new + text[end:]
+        return text
+
+
+# -------------------------------------------------------------------- #
+# Engine                                                               #
+# -------------------------------------------------------------------- #
+STATS: Counter = Counter()     # drafts, llm_skipped, local_hits, residue_hits
+_STATS_LOCK = threading.Lock()
+
+
+def stats() -> Dict[str, float]:
+    """Process-wide counters, incl. the share of drafts that skipped the LLM."""
+    with _STATS_LOCK:
+        out: Dict[str, float] = dict(STATS)
+    drafts = out.get("drafts", 0)
+    out["llm_skip_rate"] = out.get("llm_skipped", 0) / drafts if drafts else 0.0
+    return out
+
+
+def _residue(text: str, keep: Iterable[str],
+             exceptions: Optional[Iterable[str]]) -> List[ScanHit]:
+    regions = _protected(text, keep)
+    return [h for h in scan(text, exceptions=exceptions).spans(*CATEGORIES)
+            if not _inside(h, regions)]
+
+
+def rewrite_spam(
+    text: str,
+    *,
+    keep: Iterable[str] = (),
+    exceptions: Iterable[str] | None = None,
+) -> RewriteResult:
+    """
+    Replace every resolvable spam / hype / hard-sell hit locally.
+
+    Parameters
+    ----------
+    text :
+        Draft (plain text or light Markdown).
+    keep :
+        Literal strings that must stay untouched (journal metadata …).
+    exceptions :
+        Terms that are not treated as hits at all (as in `find_spam`).
+    """
+    keep = tuple(keep)
+    rewrites = spam_lexicon.load().rewrites
+    regions = _protected(text, keep)
+    out: List[str] = []
+    replaced: List[Tuple[str, str]] = []
+    cap_next = False
+    pos = 0
+
+    def emit(chunk: str) -> None:
+        nonlocal cap_next
+        if cap_next and chunk.strip():
+            m = _CAP_NEXT_RE.match(chunk)
+            if m:
+                i = m.start(1)
+                chunk = chunk[:i] + chunk[i].upper() + chunk[i + 1:]
+            cap_next = False
+        out.append(chunk)
+
+    def last_char() -> str:
+        for part in reversed(out):
+            if part:
+                return part[-1]
+        return ""
+
+    for hit in scan(text, exceptions=exceptions).spans(*CATEGORIES):
+        repl = rewrites.get(hit.term)
+        if repl is None or hit.start < pos or _inside(hit, regions):
+            continue
+        original = text[hit.start:hit.end]
+        segment = text[pos:hit.start]
+        replaced.append((original, repl))
+        if repl:
+            emit(_fix_article(segment, repl))
+            emit(_match_case(original, repl))
+            pos = hit.end
+            continue
+        # deletion: drop the word and the blank run after it
+        emit(segment.rstrip(" \t"))
+        j = hit.end
+        while j < len(text) and text[j] in " \t":
+            j += 1
+        prev = last_char()
+        at_start = prev in ("", "\n") or prev in ".!?:"
+        if at_start:
+            if j < len(text) and text[j] in ",;":
+                j += 1
+                while j < len(text) and text[j] in " \t":
+                    j += 1
+            cap_next = cap_next or original[:1].isupper()
+        if j < len(text) and prev not in ("", "\n") and not prev.isspace() \
+                and text[j] not in ",.;:!?)\n":
+            emit(" ")
+        pos = j
+    emit(text[pos:])
+
+    new_text = "".join(out)
+    result = RewriteResult(text, new_text, replaced,
+                           _residue(new_text, keep, exceptions))
+    with _STATS_LOCK:
+        STATS["drafts"] += 1
+        STATS["llm_skipped"] += not result.needs_llm
+        STATS["local_hits"] += len(replaced)
+        STATS["residue_hits"] += len(result.residue)
+    return result
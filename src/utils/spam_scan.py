@@ -0,0 +1,264 @@
+"""
+utils.spam_scan
+===============
+One scan per draft, shared by every spam-related consumer.
+
+`scan(text)` walks the prebuilt lexicon trie once and keeps *every* hit
+(overlaps included) together with a category:
+
+    hard_sell  →  `lexicon/hard_sell.txt`            (P-5 tone pillar)
+    hype       →  `lexicon/hype_words.txt`           (P-2 hype cap)
+    spam       →  master list, EXTRA_SPAM_WORDS, REPLACEMENTS keys
+
+A term listed in several files gets the first category above.  Highlighting,
+density, checklist lines and the remover prompt are all derived from the
+returned `SpamScan`; leftmost-longest spans are recomputed per sub-list
+from the stored hits, so narrowing to "spam" never re-reads the text.
+
+For drafts edited in place (Streamlit text areas) `IncrementalScanner`
+keeps a paragraph-hash → hits memo and only rescans changed paragraphs.
+
+Usage
+-----
+>>> from utils.spam_scan import scan
+>>> sc = scan("Act now – amazing results!")
+>>> sc.terms("hard_sell"), sc.count("hype")
+({'act now'}, 1)
+>>> sc.render(lambda frag, hit: f"<mark>{frag}</mark>")
+'<mark>Act now</mark> – <mark>amazing</mark> <mark>results</mark>!'
+"""
+
+from __future__ import annotations
+import hashlib, html, re, threading
+from collections import OrderedDict
+from typing import (Callable, Dict, FrozenSet, Iterable, List, NamedTuple,
+                    Optional, Set, Tuple)
+
+from . import spam_lexicon
+from .spam_matcher import longest
+
+__all__ = ["ALLOWED_SPAM_EXCEPTIONS", "CATEGORIES", "SCAN_LISTS", "IncrementalScanner",
+           "ScanHit", "SpamScan", "scan"]
+
+# Category priority: the first category whose list holds the term wins.
+CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "hard_sell": ("hard_sell",),
+    "hype": ("hype",),
+    "spam": ("spam", "extra", "replacements"),
+}
+SCAN_LISTS = ("spam", "extra", "replacements", "hype", "hard_sell")
+
+# Master-list terms every CFP needs; never counted against a draft.
+ALLOWED_SPAM_EXCEPTIONS = frozenset({"deadline", "submission"})
+
+
+class ScanHit(NamedTuple):
+    """One hit: half-open character span, canonical term and category."""
+    start: int
+    end: int
+    term: str
+    category: str
+
+
+class SpamScan:
+    """
+    Result of one lexicon pass over a draft.
+
+    `hits` holds every hit in `finditer()` order (overlaps included).  The
+    list-name arguments below are lexicon lists ("spam", "extra", "hype",
+    …) or category names; they default to "spam".
+    """
+
+    __slots__ = ("text", "hits", "_lex", "_spans")
+
+    def __init__(self, text: str, hits: Tuple[ScanHit, ...],
+                 lexicon: spam_lexicon.Lexicon):
+        self.text = text
+        self.hits = hits
+        self._lex = lexicon
+        self._spans: Dict[Tuple[str, ...], List[ScanHit]] = {}
+
+    def _lists(self, names: Tuple[str, ...]) -> Tuple[str, ...]:
+        out: List[str] = []
+        for name in names or ("spam",):
+            out.extend(CATEGORIES.get(name, (name,)))
+        return tuple(out)
+
+    def spans(self, *names: str) -> List[ScanHit]:
+        """Leftmost-longest, non-overlapping hits whose term is in *names*."""
+        key = self._lists(names)
+        found = self._spans.get(key)
+        if found is None:
+            sets: List[FrozenSet[str]] = [self._lex.members(n) for n in key]
+            found = longest(h for h in self.hits
+                            if any(h.term in s for s in sets))
+            self._spans[key] = found
+        return found
+
+    def count(self, *names: str) -> int:
+        """Number of (non-overlapping) occurrences."""
+        return len(self.spans(*names))
+
+    def terms(self, *names: str) -> Set[str]:
+        """Unique canonical terms present."""
+        return {h.term for h in self.spans(*names)}
+
+    def density(self, word_count: int, *names: str) -> float:
+        """Occurrences per word (0 for an empty draft)."""
+        return self.count(*names) / max(1, word_count)
+
+    def render(self, wrap: Callable[[str, ScanHit], str], *names: str,
+               escape: Optional[Callable[[str], str]] = html.escape) -> str:
+        """
+        Rebuild the text with every span replaced by `wrap(fragment, hit)`.
+        Fragments and the text between them go through *escape* first
+        (pass `escape=None` for Markdown / plain output).
+        """
+        esc = escape or (lambda s: s)
+        text, parts, pos = self.text, [], 0
+        for hit in self.spans(*names):
+            parts.append(esc(text[pos:hit.start]))
+            parts.append(wrap(esc(text[hit.start:hit.end]), hit))
+            pos = hit.end
+        parts.append(esc(text[pos:]))
+        return "".join(parts)
+
+    def remover_terms(self, *names: str) -> List[str]:
+        """
+        Sorted unique terms for the LLM remover; defaults to every category.
+        Non-spam hits are tagged, e.g. `act now (hard_sell)`.
+        """
+        chosen = self.spans(*(names or tuple(CATEGORIES)))
+        tagged = {h.term if h.category == "spam" else f"{h.term} ({h.category})"
+                  for h in chosen}
+        return sorted(tagged)
+
+    def without(self, terms: Iterable[str]) -> "SpamScan":
+        """This scan minus *terms* – same as `scan(text, exceptions=terms)`."""
+        drop = frozenset(t.lower() for t in terms)
+        return SpamScan(self.text,
+                        tuple(h for h in self.hits if h.term not in drop),
+                        self._lex)
+
+    def within(self, start: int, end: int) -> "SpamScan":
+        """
+        Hits lying wholly inside `text[start:end]`.  Spans keep full-text
+        offsets; the terms equal a scan of that slice (or of its lines
+        re-joined with spaces), so a body view never re-reads the text.
+        """
+        return SpamScan(self.text,
+                        tuple(h for h in self.hits
+                              if start <= h.start and h.end <= end),
+                        self._lex)
+
+
+# -------------------------------------------------------------------- #
+# Scanning + per-draft memo                                            #
+# -------------------------------------------------------------------- #
+_MEMO: "OrderedDict[Tuple[str, FrozenSet[str]], SpamScan]" = OrderedDict()
+_MEMO_MAX = 8
+_MEMO_LEX: Optional[spam_lexicon.Lexicon] = None
+_MEMO_LOCK = threading.Lock()
+
+
+def _category_of(lex: spam_lexicon.Lexicon, term: str) -> str:
+    for category, lists in CATEGORIES.items():
+        if any(term in lex.members(n) for n in lists):
+            return category
+    return "spam"
+
+
+def _hits(lex: spam_lexicon.Lexicon, text: str,
+          exc: FrozenSet[str]) -> List[ScanHit]:
+    categories: Dict[str, str] = {}
+    hits: List[ScanHit] = []
+    for h in lex.matcher(*SCAN_LISTS).finditer(text):
+        if h.term in exc:
+            continue
+        cat = categories.get(h.term)
+        if cat is None:
+            cat = categories[h.term] = _category_of(lex, h.term)
+        hits.append(ScanHit(h.start, h.end, h.term, cat))
+    return hits
+
+
+def scan(text: str, *, exceptions: Iterable[str] | None = None) -> SpamScan:
+    """
+    Scan *text* once against every list in `SCAN_LISTS`.
+
+    *exceptions* (case-insensitive) are dropped from the result entirely.
+    The last few scans are memoised, so every check on the same draft –
+    highlight, density, checklist, remover prompt – reuses one pass.
+    """
+    global _MEMO_LEX
+    lex = spam_lexicon.load()
+    exc = frozenset(w.lower() for w in (exceptions or ()))
+    key = (text, exc)
+    with _MEMO_LOCK:
+        if lex is not _MEMO_LEX:              # lexicon reloaded → drop memo
+            _MEMO.clear()
+            _MEMO_LEX = lex
+        found = _MEMO.get(key)
+        if found is not None:
+            _MEMO.move_to_end(key)
+            return found
+
+    found = SpamScan(text, tuple(_hits(lex, text, exc)), lex)   # scan outside the lock
+    with _MEMO_LOCK:
+        if lex is _MEMO_LEX:
+            _MEMO[key] = found
+            _MEMO.move_to_end(key)
+            while len(_MEMO) > _MEMO_MAX:
+                _MEMO.popitem(last=False)
+    return found
+
+
+# -------------------------------------------------------------------- #
+# Incremental (per-paragraph) scanning                                 #
+# -------------------------------------------------------------------- #
+_PARAGRAPH_RE = re.compile(r"\n[ \t]*\n")
+
+
+class IncrementalScanner:
+    """
+    Scanner for a draft that is edited in place.
+
+    Paragraphs (blank-line separated) are hashed; hits are memoised per
+    hash with paragraph-relative offsets, so a rerun only rescans the
+    paragraphs whose text changed.  Phrases never span a blank line here,
+    unlike `scan()`.  Keep one instance per editor (e.g. in
+    `st.session_state`).
+    """
+
+    __slots__ = ("exceptions", "cache", "rescanned", "_lex")
+
+    def __init__(self, *, exceptions: Iterable[str] | None = None):
+        self.exceptions = frozenset(w.lower() for w in (exceptions or ()))
+        self.cache: Dict[bytes, Tuple[ScanHit, ...]] = {}
+        self.rescanned = 0                   # paragraphs rescanned last call
+        self._lex: Optional[spam_lexicon.Lexicon] = None
+
+    def scan(self, text: str) -> SpamScan:
+        lex = spam_lexicon.load()
+        if lex is not self._lex:             # lexicon reloaded → drop memo
+            self.cache.clear()
+            self._lex = lex
+        hits: List[ScanHit] = []
+        fresh: Dict[bytes, Tuple[ScanHit, ...]] = {}
+        self.rescanned = 0
+        start = 0
+        for end in [m.start() for m in _PARAGRAPH_RE.finditer(text)] + [len(text)]:
+            para = text[start:end]
+            key = hashlib.blake2b(para.encode("utf-8"), digest_size=16).digest()
+            rel = fresh.get(key)
+            if rel is None:
+                rel = self.cache.get(key)     # a clean paragraph caches as ()
+            if rel is None:
+                rel = tuple(_hits(lex, para, self.exceptions))
+                self.rescanned += 1
+            fresh[key] = rel
+            hits.extend(h._replace(start=h.start + start, end=h.end + start)
+                        for h in rel)
+            start = end
+        self.cache = fresh                   # forget paragraphs no longer present
+        return SpamScan(text, tuple(hits), lex)
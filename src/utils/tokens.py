@@ -1,22 +1,153 @@
 """
 utils.tokens
 ============
-Lightweight helper that estimates token length for any text
-without forcing every caller to import `tiktoken` directly.
+The one token counter every prompt builder uses, so no caller imports
+`tiktoken` directly.
+
+* lazy      – the `cl100k_base` encoding is loaded on the first exact
+              count, not at import (Streamlit reruns, tests and scripts
+              that never count pay nothing);
+* memoised  – counts are kept in an LRU keyed by a content hash, so the
+              same prompt / row fragment is tokenized once per process;
+* batched   – `count_many` encodes all cache misses in one
+              `encode_ordinary_batch` call (metrics packing);
+* estimate  – `n_tokens(text, estimate=True)` / `estimate_tokens` is the
+              chars / 4 rule for live UI previews; it is also what exact
+              counts fall back to when *tiktoken* is not installed.
+
+    TOKENS_ENCODING    encoding name            (default: cl100k_base)
+    TOKENS_CACHE_SIZE  memoised counts, LRU     (default: 4096)
+
+Usage
+-----
+>>> from utils.tokens import count_many, n_tokens
+>>> n_tokens(prompt), n_tokens(prompt, estimate=True)
+>>> count_many(fragments)
 """
 
 from __future__ import annotations
+import hashlib, os, threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+__all__ = ["TokenCounter", "count_many", "estimate_tokens", "get_counter", "n_tokens"]
+
+_UNLOADED = object()
+
+
+def estimate_tokens(text: str) -> int:
+    """Coarse token estimate: 1 token per ~4 chars."""
+    return max(1, len(text) // 4)
+
+
+def _key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class TokenCounter:
+    """Lazily loaded encoding + LRU of counts by content hash (thread-safe)."""
+
+    def __init__(self, encoding: str = "cl100k_base", maxsize: int = 4096) -> None:
+        self.encoding_name = encoding
+        self.maxsize = maxsize
+        self._enc: Any = _UNLOADED
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    # ------------------------------------------------------------------ #
+    @property
+    def encoding(self) -> Optional[Any]:
+        """The tiktoken encoding, loaded on first use; None without tiktoken."""
+        if self._enc is _UNLOADED:
+            with self._lock:
+                if self._enc is _UNLOADED:
+                    try:
+                        import tiktoken                            # type: ignore
+                        self._enc = tiktoken.get_encoding(self.encoding_name)
+                    except Exception:                              # not installed / no BPE file
+                        self._enc = None
+        return self._enc
+
+    def _get(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            n = self._cache.get(key)
+            if n is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return n
+
+    def _put(self, key: bytes, n: int) -> None:
+        with self._lock:
+            self._cache[key] = n
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------ #
+    def count(self, text: str, estimate: bool = False) -> int:
+        if estimate:
+            return estimate_tokens(text)
+        key = _key(text)
+        n = self._get(key)
+        if n is None:
+            enc = self.encoding
+            n = len(enc.encode_ordinary(text)) if enc is not None else estimate_tokens(text)
+            self._put(key, n)
+        return n
+
+    def count_many(self, texts: Iterable[str], estimate: bool = False) -> List[int]:
+        texts = list(texts)
+        if estimate:
+            return [estimate_tokens(t) for t in texts]
+        keys = [_key(t) for t in texts]
+        out: List[Optional[int]] = [self._get(k) for k in keys]
+        todo: Dict[bytes, List[int]] = {}
+        for i, n in enumerate(out):
+            if n is None:
+                todo.setdefault(keys[i], []).append(i)
+        if todo:
+            first = [idxs[0] for idxs in todo.values()]
+            enc = self.encoding
+            counts = ([len(ids) for ids in enc.encode_ordinary_batch([texts[i] for i in first])]
+                      if enc is not None else [estimate_tokens(texts[i]) for i in first])
+            for (key, idxs), n in zip(todo.items(), counts):
+                self._put(key, n)
+                for i in idxs:
+                    out[i] = n
+        return out                                                # type: ignore[return-value]
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._cache), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+
+_COUNTER: Optional[TokenCounter] = None
+_COUNTER_LOCK = threading.Lock()
+
+
+def get_counter() -> TokenCounter:
+    global _COUNTER
+    if _COUNTER is None:
+        with _COUNTER_LOCK:
+            if _COUNTER is None:
+                _COUNTER = TokenCounter(os.getenv("TOKENS_ENCODING", "cl100k_base"),
+                                        int(os.getenv("TOKENS_CACHE_SIZE", "4096")))
+    return _COUNTER
+
 
-try:
-    import tiktoken                                      # type: ignore
-    _enc = tiktoken.get_encoding("cl100k_base")
+def n_tokens(text: str, estimate: bool = False) -> int:
+    """Token count of *text* (cl100k_base); *estimate* = chars / 4, no tokenizer."""
+    return get_counter().count(text, estimate)
 
-    def n_tokens(text: str) -> int:                      # noqa: D401
-        """Return approximate token count using cl100k_base."""
-        return len(_enc.encode(text))
 
-except (ImportError, Exception):
-    # Fallback: 1 token per ~4 chars (coarse but safe)
-    def n_tokens(text: str) -> int:                      # type: ignore[override]
-        """Coarse token estimator used when *tiktoken* unavailable."""
-        return max(1, len(text) // 4)
+def count_many(texts: Iterable[str], estimate: bool = False) -> List[int]:
+    """`n_tokens` for several texts, cache misses encoded in one batch."""
+    return get_counter().count_many(texts, estimate)